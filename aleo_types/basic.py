@@ -37,6 +37,29 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
             raise OverflowError(f"value {value} out of range for {cls.__name__}")
         return int.__new__(cls, value)
 
+    # Arithmetic results go through these instead of the constructor: _checked validates the range
+    # without the Decimal handling, _unchecked is only for results that are in range by construction.
+
+    @classmethod
+    def _checked(cls, value: int) -> Self:
+        if not cls.min <= value <= cls.max:
+            raise OverflowError(f"value {value} out of range for {cls.__name__}")
+        return int.__new__(cls, value)
+
+    @classmethod
+    def _unchecked(cls, value: int) -> Self:
+        return int.__new__(cls, value)
+
+    @staticmethod
+    def _trunc_div(a: int, b: int) -> int:
+        a, b = int(a), int(b)
+        if b == 0:
+            raise ZeroDivisionError("division by zero")
+        q = abs(a) // abs(b)
+        if (a < 0) != (b < 0):
+            return -q
+        return q
+
     @classmethod
     def loads(cls, value: str):
         value = value.replace(cls.__name__, "")
@@ -47,10 +70,10 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
 
     def __add__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__add__(self, other))
+            return self._checked(int.__add__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for +: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__add__(self, other))
+        return self._checked(int.__add__(self, other))
 
     @classmethod
     def wrap_value(cls, value: int):
@@ -68,34 +91,34 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         if isinstance(other, Int):
             other = int(other)
         value = int(self) + other
-        return self.__class__(self.wrap_value(value))
+        return self._unchecked(self.wrap_value(value))
 
 
     def __sub__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__sub__(self, other))
+            return self._checked(int.__sub__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for -: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__sub__(self, other))
+        return self._checked(int.__sub__(self, other))
 
     def sub_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
         value = int(self) - other
-        return self.__class__(self.wrap_value(value))
+        return self._unchecked(self.wrap_value(value))
 
     def __mul__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__mul__(self, other))
+            return self._checked(int.__mul__(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for *: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__mul__(self, other))
+        return self._checked(int.__mul__(self, other))
 
     def mul_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
         value = int(self) * other
-        return self.__class__(self.wrap_value(value))
+        return self._unchecked(self.wrap_value(value))
 
     def __eq__(self, other: object):
         if type(other) is int:
@@ -109,77 +132,84 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
 
     def __invert__(self):
         if self.min == 0:
-            return self.__class__(~int(self) & self.max)
-        return self.__class__(~int(self))
+            return self._unchecked(~int(self) & self.max)
+        return self._unchecked(~int(self))
 
     # we are deviating from python's insane behavior here
     # this is actually __truncdiv__
     def __floordiv__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int(Decimal(int(self)) // Decimal(other)))
+            return self._checked(self._trunc_div(self, other))
         if type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for //: '{}' and '{}'".format(type(self), type(other)))
-        if other == 0:
-            raise ZeroDivisionError("division by zero")
-        return self.__class__(int(Decimal(int(self)) // Decimal(other)))
+        # only MIN // -1 can leave the range
+        return self._checked(self._trunc_div(self, other))
 
     def div_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
         value = int(int(self) / other)
-        return self.__class__(self.wrap_value(value))
+        return self._unchecked(self.wrap_value(value))
 
     def __lshift__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__lshift__(self, other))
+            return self._checked(int.__lshift__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for <<: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__lshift__(self, other))
+        return self._checked(int.__lshift__(self, other))
 
     def shl_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
-        return self.__class__(self.wrap_value(int.__lshift__(self, other)))
+        return self._unchecked(self.wrap_value(int.__lshift__(self, other)))
 
     def __rshift__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__rshift__(self, other))
+            return self._unchecked(int.__rshift__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for >>: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__rshift__(self, other))
+        return self._unchecked(int.__rshift__(self, other))
 
     def shr_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
-        return self.__class__(self.wrap_value(int.__rshift__(self, other)))
+        return self._unchecked(self.wrap_value(int.__rshift__(self, other)))
 
     def __and__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__and__(self, other))
+            return self._checked(int.__and__(self, other))
+        if type(other) is type(self):
+            return self._unchecked(int.__and__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for &: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__and__(self, other))
+        return self._checked(int.__and__(self, other))
 
     def __or__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__or__(self, other))
+            return self._checked(int.__or__(self, other))
+        if type(other) is type(self):
+            return self._unchecked(int.__or__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for |: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__or__(self, other))
+        return self._checked(int.__or__(self, other))
 
     def __xor__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__xor__(self, other))
+            return self._checked(int.__xor__(self, other))
+        if type(other) is type(self):
+            return self._unchecked(int.__xor__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for ^: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__xor__(self, other))
+        return self._checked(int.__xor__(self, other))
 
     def __mod__(self, other: int | Self):
         if type(other) is int:
-            return self.__class__(int.__mod__(self, other))
+            return self._checked(int.__mod__(self, other))
+        if type(other) is type(self):
+            return self._unchecked(int.__mod__(self, other))
         if not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for %: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__mod__(self, other))
+        return self._checked(int.__mod__(self, other))
 
     def rem_wrapped(self, other: int | Self):
         return self.__mod__(other)
@@ -200,7 +230,7 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         res_digits = math.log10(abs(self)) * power
         if res_digits > max_digits:
             raise OverflowError(f"value *too large* is out of range for {self.__class__.__name__}")
-        return self.__class__(int.__pow__(self, power))
+        return self._checked(int.__pow__(self, power))
 
     def pow_wrapped(self, other: int | Self):
         if isinstance(other, Int):
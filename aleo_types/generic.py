@@ -1,3 +1,4 @@
+import copyreg
 import functools
 import sys
 from types import GenericAlias
@@ -20,14 +21,63 @@ TP = TypeVarTuple('TP')
 L = TypeVar('L', bound=Int | FixedSize)
 I_co = TypeVar('I_co', bound=Int, covariant=True)
 
+
+class _Subscript:
+    # stands in for a class made by __class_getitem__, which pickle can't find by name: unpickling subscripts the
+    # original class with the same key again, and gets the alias of the class
+    def __init__(self, cls: Any, key: Any):
+        self.cls = cls
+        self.key = key
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _subscript, (self.cls, _pickle_key(self.key))
+
+
+# one per class made by __class_getitem__, so pickle memoizes it instead of writing it for every instance
+_subscripts: dict[type, _Subscript] = {}
+
+
+def _subscript(cls: Any, key: Any) -> GenericAlias:
+    return cls[key]
+
+
+def _pickle_key(key: Any) -> Any:
+    if isinstance(key, tuple):
+        return tuple(_pickle_key(k) for k in cast(tuple[Any, ...], key))
+    if isinstance(key, GenericAlias) and key.__origin__ in _subscripts:
+        return _subscripts[key.__origin__]
+    return key
+
+
+def _new_subscripted(alias: GenericAlias, *args: Any) -> Any:
+    cls = alias.__origin__
+    return cls.__new__(cls, *args)
+
+
+def _reduce_subscripted(obj: Any) -> tuple[Any, ...]:
+    # the default reduce of the instance, with the class replaced by a _Subscript, and in the state as well:
+    # instances made by calling the alias keep it in __orig_class__
+    _, (cls, *args), state, *items = obj.__reduce_ex__(2)
+    if isinstance(state, dict):
+        state = {name: _pickle_key(value) for name, value in cast(dict[str, Any], state).items()}
+    return _new_subscripted, (_subscripts[cls], *args), state, *items
+
+
 # from cpython 3.11.6
 def tp_cache(func: Optional[Callable[..., Any]] = None, /, *, typed: bool = False):
     """Internal wrapper caching __getitem__ of generic types.
 
     For non-hashable arguments, the original function is used as a fallback.
+    The classes made are registered with copyreg, so their instances can be pickled.
     """
     def decorator(func: Callable[..., Any]):
-        cached = functools.lru_cache(maxsize=None, typed=typed)(func)
+        def subscript(cls: Any, key: Any) -> GenericAlias:
+            alias = func(cls, key)
+            _subscripts[alias.__origin__] = _Subscript(cls, key)
+            copyreg.pickle(alias.__origin__, _reduce_subscripted)
+            return alias
+
+        cached = functools.lru_cache(maxsize=None, typed=typed)(subscript)
 
         @functools.wraps(func)
         def inner(*args: Hashable, **kwds: Hashable):
@@ -35,7 +85,7 @@ def tp_cache(func: Optional[Callable[..., Any]] = None, /, *, typed: bool = Fals
                 return cached(*args, **kwds)
             except TypeError:
                 pass  # All real errors (not unhashable args) are raised below.
-            return func(*args, **kwds)
+            return subscript(*args, **kwds)
         return inner
 
     if func is not None:
@@ -50,6 +100,7 @@ def is_serializable(t: Any) -> TypeGuard[TType[Serializable]]:
 
 class Tuple(tuple[*TP], Serializable, JSONSerialize):
     types: tuple[TType[Serializable], ...]
+    _loaders: tuple[Callable[[BytesIO], Serializable], ...]
 
     def __new__(cls, value: tuple[*TP]):
         return tuple.__new__(cls, value)
@@ -64,7 +115,11 @@ class Tuple(tuple[*TP], Serializable, JSONSerialize):
         param_type = type(
             f"Tuple[{', '.join(cast(TType[Serializable], t).__name__ for t in key)}]",
             (Tuple,),
-            {"types": key},
+            {
+                "types": key,
+                # resolved once here so load doesn't go through the aliases for every element
+                "_loaders": tuple(cast(TType[Serializable], t).load for t in key),
+            },
         )
         return GenericAlias(param_type, key)
 
@@ -73,10 +128,7 @@ class Tuple(tuple[*TP], Serializable, JSONSerialize):
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
-        value: list[Serializable] = []
-        for t in cls.types:
-            value.append(t.load(data))
-        return cls(tuple(value)) # type: ignore
+        return tuple.__new__(cls, [load(data) for load in cls._loaders])
 
     def json(self, compatible: bool = False) -> JSONType:
         res: list[JSONType] = []
@@ -89,15 +141,17 @@ class Tuple(tuple[*TP], Serializable, JSONSerialize):
 
 class Vec(list[T], Serializable, JSONSerialize, Generic[T, L]):
     types: tuple[TType[T], TType[L]]
+    _type: TType[T]
+    _size: Int | FixedSize
+    _size_type: TType[Int]
+    _load_item: Callable[[BytesIO], T]
+    _fixed: bool
 
     # noinspection PyMissingConstructor
     def __init__(self, value: list[T]):
-        list[T].__init__(self, value)
-        self._type = self.types[0]
-        if isinstance(self.types[1], FixedSize):
-            self._size = self.types[1]
-        else:
-            self._size_type = self.types[1]
+        list.__init__(self, value)
+        # fixed size Vecs get _size from the class
+        if not self._fixed:
             self._size = self._size_type(len(value))
 
     @tp_cache
@@ -115,10 +169,20 @@ class Vec(list[T], Serializable, JSONSerialize, Generic[T, L]):
             class_name = f"Vec[{var_type.__name__}, {size_type}]"
         else:
             class_name = f"Vec[{var_type.__name__}, {size_type.__name__}]"
+        attrs: dict[str, Any] = {
+            "types": key,
+            "_type": var_type,
+            "_load_item": var_type.load,
+            "_fixed": isinstance(size_type, FixedSize),
+        }
+        if attrs["_fixed"]:
+            attrs["_size"] = size_type
+        else:
+            attrs["_size_type"] = size_type
         param_type = type(
             class_name,
             (Vec,),
-            {"types": key},
+            attrs,
         )
         return GenericAlias(param_type, key)
 
@@ -132,12 +196,12 @@ class Vec(list[T], Serializable, JSONSerialize, Generic[T, L]):
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
-        value_type, size_type = cls.types
-        if isinstance(size_type, FixedSize):
-            size = size_type
+        if cls._fixed:
+            size = cls._size
         else:
-            size = cast(Int, size_type).load(data)
-        return cls(list(value_type.load(data) for _ in range(size)))
+            size = cls._size_type.load(data)
+        load_item = cls._load_item
+        return cls([load_item(data) for _ in range(size)])
 
     def json(self, compatible: bool = False) -> JSONType:
         if isinstance(self._type, GenericAlias) and issubclass(self._type.__origin__, Tuple):
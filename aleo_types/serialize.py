@@ -1,8 +1,9 @@
 import inspect
 import re
 from enum import IntEnum
+from functools import lru_cache, partial
 from io import BytesIO
-from typing import TYPE_CHECKING, Protocol, Self, runtime_checkable, Any, cast
+from typing import TYPE_CHECKING, Protocol, Self, runtime_checkable, Any, Callable, cast
 
 if TYPE_CHECKING:
     pass
@@ -28,6 +29,7 @@ JSONType = dict[str, Any] | list[Any] | tuple[Any] | str | int | float | bool |
 name_convert_pattern = re.compile(r'(?<!^)(?<![A-Z])(?=[A-Z])')
 
 
+@lru_cache(maxsize=None)
 def enum_name_convert(name: str) -> str:
     return name_convert_pattern.sub('_', name).lower()
 
@@ -37,48 +39,7 @@ class JSONSerialize(Protocol):
 
     def __default_json(self, compatible: bool = False) -> JSONType:
         """Return a JSON-serializable object."""
-        res: dict[str, Any] = {}
-        for k, v in self.__dict__.items():
-            if not k.startswith("_"):
-                if isinstance(v, JSONSerialize):
-                    if compatible:
-                        res[k] = v.json_compatible()
-                    else:
-                        res[k] = v.json(compatible)
-                elif isinstance(v, dict):
-                    v = cast(dict[Any, Any], v)
-                    dict_sub = {}
-                    for k1, v1 in v.items():
-                        if isinstance(v1, IntEnum):
-                            dict_sub[str(k1)] = enum_name_convert(v1.name)
-                        elif not isinstance(v1, JSONSerialize):
-                            raise TypeError(f"cannot serialize {v1.__class__.__name__}")
-                        else:
-                            if compatible:
-                                dict_sub[str(k1)] = v1.json_compatible()
-                            else:
-                                dict_sub[str(k1)] = v1.json(compatible)
-                    res[k] = dict_sub
-                elif isinstance(v, (list, tuple)):
-                    v = cast(list[Any], v)
-                    list_sub: list[JSONType] = []
-                    for item in v:
-                        if not isinstance(item, JSONSerialize):
-                            raise TypeError(f"cannot serialize {item.__class__.__name__}")
-                        if compatible:
-                            list_sub.append(item.json_compatible())
-                        else:
-                            list_sub.append(item.json(compatible))
-                    res[k] = list_sub
-                elif isinstance(v, IntEnum):
-                    res[k] = enum_name_convert(v.name)
-                else:
-                    raise TypeError(f"cannot serialize {v.__class__.__name__}")
-        for k, v in self.__class__.__dict__.items():
-            if not k.startswith("_") and not inspect.isfunction(v):
-                if isinstance(v, IntEnum):
-                    res[k] = enum_name_convert(v.name)
-        return res
+        return _object_serializer(self.__class__, compatible)(self)
 
     def json(self, compatible: bool = False) -> JSONType:
         if compatible and self.__class__.json_compatible is not JSONSerialize.json_compatible:
@@ -88,4 +49,137 @@ class JSONSerialize(Protocol):
     def json_compatible(self) -> JSONType:
         if self.__class__.json is not JSONSerialize.json:
             return self.json(compatible=True)
-        return self.__default_json(compatible=True)
\ No newline at end of file
+        return self.__default_json(compatible=True)
+
+
+# Serializers are resolved once per (class, compatible) pair and reused for every instance, so the
+# default JSON conversion doesn't need to inspect the class or re-dispatch on value types each call.
+
+JSONEncoder = Callable[[Any], JSONType]
+
+_value_encoders: dict[tuple[type, bool], JSONEncoder] = {}
+_field_encoders: dict[tuple[type, bool], JSONEncoder] = {}
+_object_serializers: dict[tuple[type, bool], JSONEncoder] = {}
+
+
+def _unsupported_encoder(tp: type) -> JSONEncoder:
+    def encode(_: Any) -> JSONType:
+        raise TypeError(f"cannot serialize {tp.__name__}")
+    return encode
+
+
+def _serializable_encoder(tp: type, compatible: bool) -> JSONEncoder:
+    # mirrors calling v.json_compatible() or v.json(compatible) on a nested value
+    json_func = cast(Any, tp).json
+    json_compatible_func = cast(Any, tp).json_compatible
+    if compatible:
+        if json_compatible_func is not JSONSerialize.json_compatible:
+            return json_compatible_func
+        if json_func is not JSONSerialize.json:
+            return partial(json_func, compatible=True)
+        return _object_serializer(tp, True)
+    if json_func is not JSONSerialize.json:
+        return lambda v: json_func(v, False)
+    return _object_serializer(tp, False)
+
+
+def _item_encoder(tp: type, compatible: bool) -> JSONEncoder:
+    key = (tp, compatible)
+    try:
+        return _value_encoders[key]
+    except KeyError:
+        pass
+    if issubclass(tp, JSONSerialize):
+        encoder = _serializable_encoder(tp, compatible)
+    else:
+        encoder = _unsupported_encoder(tp)
+    _value_encoders[key] = encoder
+    return encoder
+
+
+def _encode_dict(value: dict[Any, Any], compatible: bool) -> JSONType:
+    res: dict[str, Any] = {}
+    for k, v in value.items():
+        if isinstance(v, IntEnum):
+            res[str(k)] = enum_name_convert(v.name)
+        else:
+            res[str(k)] = _item_encoder(v.__class__, compatible)(v)
+    return res
+
+
+def _encode_list(value: list[Any] | tuple[Any, ...], compatible: bool) -> JSONType:
+    return [_item_encoder(item.__class__, compatible)(item) for item in value]
+
+
+def _encode_enum(value: IntEnum) -> JSONType:
+    return enum_name_convert(value.name)
+
+
+def _field_encoder(tp: type, compatible: bool) -> JSONEncoder:
+    key = (tp, compatible)
+    try:
+        return _field_encoders[key]
+    except KeyError:
+        pass
+    if issubclass(tp, JSONSerialize):
+        encoder = _serializable_encoder(tp, compatible)
+    elif issubclass(tp, dict):
+        encoder = partial(_encode_dict, compatible=compatible)
+    elif issubclass(tp, (list, tuple)):
+        encoder = partial(_encode_list, compatible=compatible)
+    elif issubclass(tp, IntEnum):
+        encoder = _encode_enum
+    else:
+        encoder = _unsupported_encoder(tp)
+    _field_encoders[key] = encoder
+    return encoder
+
+
+def _reflect_json(obj: Any, compatible: bool) -> JSONType:
+    res: dict[str, Any] = {}
+    for k, v in obj.__dict__.items():
+        if not k.startswith("_"):
+            res[k] = _field_encoder(v.__class__, compatible)(v)
+    for k, v in obj.__class__.__dict__.items():
+        if not k.startswith("_") and not inspect.isfunction(v):
+            if isinstance(v, IntEnum):
+                res[k] = enum_name_convert(v.name)
+    return res
+
+
+def _object_serializer(cls: type, compatible: bool) -> JSONEncoder:
+    key = (cls, compatible)
+    try:
+        return _object_serializers[key]
+    except KeyError:
+        pass
+
+    class_fields = tuple(
+        (k, enum_name_convert(v.name)) for k, v in cls.__dict__.items()
+        if not k.startswith("_") and not inspect.isfunction(v) and isinstance(v, IntEnum)
+    )
+    # the field list is learned from the first instance; instances with a different layout take the slow path
+    layout: list[tuple[str, ...]] = []
+    public_fields: list[str] = []
+
+    def serialize(obj: Any) -> JSONType:
+        values = obj.__dict__
+        if not layout:
+            layout.append(tuple(values))
+            public_fields.extend(k for k in values if not k.startswith("_"))
+        elif tuple(values) != layout[0]:
+            return _reflect_json(obj, compatible)
+        res: dict[str, Any] = {}
+        for k in public_fields:
+            v = values[k]
+            try:
+                encoder = _field_encoders[(v.__class__, compatible)]
+            except KeyError:
+                encoder = _field_encoder(v.__class__, compatible)
+            res[k] = encoder(v)
+        for k, v in class_fields:
+            res[k] = v
+        return res
+
+    _object_serializers[key] = serialize
+    return serialize
\ No newline at end of file
@@ -143,6 +143,11 @@ class Field(Serializable, JSONSerialize, Double, Sub, Square, Div, Sqrt, Compare
     # Fr, Fp256
     # Just store as a large integer now
     # Hopefully this will not be used later...
+
+    # BLS12-377 scalar field; arithmetic on canonical elements is done with python ints to avoid
+    # the serialization round trip through aleo_explorer_rust
+    modulus = 8444461749428370424248824938781546531375899335154063827935233455917409239041
+
     def __init__(self, data: int):
         self.data = data
 
@@ -158,6 +163,17 @@ class Field(Serializable, JSONSerialize, Double, Sub, Square, Div, Sqrt, Compare
     def loads(cls, data: str):
         return cls(int(data.removesuffix("field")))
 
+    @classmethod
+    def _from_ops(cls, data: bytes):
+        return cls(int.from_bytes(data[:32], "little"))
+
+    def _is_canonical(self, other: Any = None) -> bool:
+        if not 0 <= self.data < self.modulus:
+            return False
+        if other is None:
+            return True
+        return isinstance(other, Field) and 0 <= other.data < self.modulus
+
     def json(self, compatible: bool = False) -> JSONType:
         return str(self)
 
@@ -176,46 +192,73 @@ class Field(Serializable, JSONSerialize, Double, Sub, Square, Div, Sqrt, Compare
         return hash(self.data)
 
     def __add__(self, other: Self):
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "add")))
+        if self._is_canonical(other):
+            return Field((self.data + other.data) % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, other, "add"))
 
     def double(self) -> Field:
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, self, "double")))
+        if self._is_canonical():
+            return Field((self.data << 1) % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, self, "double"))
 
     def __sub__(self, other: Self):
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "sub")))
+        if self._is_canonical(other):
+            return Field((self.data - other.data) % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, other, "sub"))
 
     def __mul__(self, other: Self):
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "mul")))
+        if self._is_canonical(other):
+            return Field(self.data * other.data % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, other, "mul"))
 
     def square(self) -> Field:
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, self, "square")))
+        if self._is_canonical():
+            return Field(self.data * self.data % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, self, "square"))
 
     def sqrt(self) -> Field:
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, self, "sqrt")))
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, self, "sqrt"))
 
     def __floordiv__(self, other: Self):
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "div")))
+        # division by zero is left to the rust side so it fails the same way
+        if self._is_canonical(other) and other.data != 0:
+            return Field(self.data * pow(other.data, -1, self.modulus) % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, other, "div"))
 
     def __gt__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data > other.data
         return bool_.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "gt"))).value
 
     def __lt__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data < other.data
         return bool_.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "lt"))).value
 
     def __ge__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data >= other.data
         return bool_.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "gte"))).value
 
     def __le__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data <= other.data
         return bool_.load(BytesIO(aleo_explorer_rust.field_ops(self, other, "lte"))).value
 
     def __pow__(self, power: Self, mod: None = None):
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, power, "pow")))
+        if self._is_canonical(power):
+            return Field(pow(self.data, power.data, self.modulus))
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, power, "pow"))
 
     def inv(self) -> Field:
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, self, "inv")))
+        if self._is_canonical() and self.data != 0:
+            return Field(pow(self.data, -1, self.modulus))
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, self, "inv"))
 
     def __neg__(self) -> Field:
-        return Field.load(BytesIO(aleo_explorer_rust.field_ops(self, self, "neg")))
+        if self._is_canonical():
+            return Field(-self.data % self.modulus)
+        return Field._from_ops(aleo_explorer_rust.field_ops(self, self, "neg"))
 
     def cast(self, destination_type: Any, *, lossy: bool) -> Any:
         from .vm_instruction import LiteralType
@@ -241,6 +284,10 @@ class Group(Serializable, JSONSerialize, Add, Sub, Mul, Neg, Cast):
     def loads(cls, data: str):
         return cls(int(data.removesuffix("group")))
 
+    @classmethod
+    def _from_ops(cls, data: bytes):
+        return cls(int.from_bytes(data[:32], "little"))
+
     def json(self, compatible: bool = False) -> JSONType:
         return str(self)
 
@@ -251,19 +298,19 @@ class Group(Serializable, JSONSerialize, Add, Sub, Mul, Neg, Cast):
         return f"{self.__class__.__name__}({self.data})"
 
     def __add__(self, other: Self):
-        return Group.load(BytesIO(aleo_explorer_rust.group_ops(self, other, "add")))
+        return Group._from_ops(aleo_explorer_rust.group_ops(self, other, "add"))
 
     def double(self) -> Group:
-        return Group.load(BytesIO(aleo_explorer_rust.group_ops(self, self, "double")))
+        return Group._from_ops(aleo_explorer_rust.group_ops(self, self, "double"))
 
     def __sub__(self, other: Self):
-        return Group.load(BytesIO(aleo_explorer_rust.group_ops(self, other, "sub")))
+        return Group._from_ops(aleo_explorer_rust.group_ops(self, other, "sub"))
 
     def __mul__(self, other: Scalar):
-        return Group.load(BytesIO(aleo_explorer_rust.group_ops(self, other, "mul")))
+        return Group._from_ops(aleo_explorer_rust.group_ops(self, other, "mul"))
 
     def __neg__(self) -> Group:
-        return Group.load(BytesIO(aleo_explorer_rust.group_ops(self, self, "neg")))
+        return Group._from_ops(aleo_explorer_rust.group_ops(self, self, "neg"))
 
     def cast(self, destination_type: Any, *, lossy: bool) -> Any:
         from .vm_instruction import LiteralType
@@ -282,6 +329,10 @@ class Group(Serializable, JSONSerialize, Add, Sub, Mul, Neg, Cast):
 
 class Scalar(Serializable, JSONSerialize, Add, Sub, Mul, Compare, Cast):
     # Could be wrong as well
+
+    # Edwards BLS12 scalar field, see Field
+    modulus = 2111115437357092606062206234695386632838870926408408195193685246394721360383
+
     def __init__(self, data: int):
         self.data = data
 
@@ -297,6 +348,13 @@ class Scalar(Serializable, JSONSerialize, Add, Sub, Mul, Compare, Cast):
     def loads(cls, data: str):
         return cls(int(data.removesuffix("scalar")))
 
+    @classmethod
+    def _from_ops(cls, data: bytes):
+        return cls(int.from_bytes(data[:32], "little"))
+
+    def _is_canonical(self, other: Any) -> bool:
+        return isinstance(other, Scalar) and 0 <= self.data < self.modulus and 0 <= other.data < self.modulus
+
     def json(self, compatible: bool = False) -> JSONType:
         return str(self)
 
@@ -307,24 +365,36 @@ class Scalar(Serializable, JSONSerialize, Add, Sub, Mul, Compare, Cast):
         return f"{self.__class__.__name__}({self.data})"
 
     def __add__(self, other: Self):
-        return Scalar.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "add")))
+        if self._is_canonical(other):
+            return Scalar((self.data + other.data) % self.modulus)
+        return Scalar._from_ops(aleo_explorer_rust.scalar_ops(self, other, "add"))
 
     def __sub__(self, other: Self):
-        return Scalar.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "sub")))
+        if self._is_canonical(other):
+            return Scalar((self.data - other.data) % self.modulus)
+        return Scalar._from_ops(aleo_explorer_rust.scalar_ops(self, other, "sub"))
 
     def __mul__(self, other: Group):  # pyright: ignore [reportIncompatibleMethodOverride]
-        return Group.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "mul")))
+        return Group._from_ops(aleo_explorer_rust.scalar_ops(self, other, "mul"))
 
     def __gt__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data > other.data
         return bool_.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "gt"))).value
 
     def __lt__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data < other.data
         return bool_.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "lt"))).value
 
     def __ge__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data >= other.data
         return bool_.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "gte"))).value
 
     def __le__(self, other: Self):
+        if self._is_canonical(other):
+            return self.data <= other.data
         return bool_.load(BytesIO(aleo_explorer_rust.scalar_ops(self, other, "lte"))).value
 
     def __eq__(self, other: object):
@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import multiprocessing
 import os
 import time
 from typing import Any
@@ -19,8 +18,8 @@ from middleware.api_filter import APIFilterMiddleware
 from middleware.api_quota import APIQuotaMiddleware
 from middleware.asgi_logger import AccessLoggerMiddleware
 from middleware.server_timing import ServerTimingMiddleware
-from util.cache import Cache
 from util.set_proc_title import set_proc_title
+from util.web_server import UvicornServer, get_worker_count
 from .address_routes import address_staking_route, address_delegated_route, address_program_id_route
 from .execute_routes import preview_finalize_route
 from .mapping_routes import mapping_route, mapping_list_route, mapping_value_list_route, mapping_key_count_route
@@ -28,19 +27,6 @@ from .solution_routes import solution_by_id_route
 from .utils import get_remote_height
 
 
-class UvicornServer(multiprocessing.Process):
-
-    def __init__(self, config: uvicorn.Config):
-        super().__init__()
-        self.server = uvicorn.Server(config=config)
-        self.config = config
-
-    def stop(self):
-        self.terminate()
-
-    def run(self, *args: Any, **kwargs: Any):
-        self.server.run()
-
 async def status_route(request: Request):
     session = request.app.state.session
     db: Database = request.app.state.db
@@ -88,10 +74,10 @@ async def startup():
                   redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
                   redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
                   redis_password=os.environ.get("REDIS_PASS"),
+                  block_store_path=os.environ.get("BLOCK_STORE_PATH"),
                   message_callback=noop)
     await db.connect()
     app.state.db = db
-    app.state.program_cache = Cache()
     app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
     set_proc_title("aleo-explorer: api")
 
@@ -115,11 +101,11 @@ async def run():
     host = os.environ.get("API_HOST", "127.0.0.1")
     port = int(os.environ.get("API_PORT", 8001))
     config = uvicorn.Config(
-        "api:app", reload=True, log_level="info", host=host, port=port,
+        "api:app", log_level="info", host=host, port=port,
         forwarded_allow_ips=["127.0.0.1", "::1", "10.0.4.1", "10.0.5.1"]
     )
     logging.getLogger("uvicorn.access").handlers = []
-    server = UvicornServer(config=config)
+    server = UvicornServer(config=config, workers=get_worker_count("API_WORKERS"), name="api")
 
     server.start()
     while True:
@@ -0,0 +1,147 @@
+# Cost of keeping address_index consistent on revert_to_last_backup over millions of addresses: finding the reward
+# addresses that are new since the backup and trimming the ones without a source, against rebuilding address_index from
+# address_transition, program and the reward hashes.
+# The tables are generated in a scratch schema of the database configured in .env, next to DB_SCHEMA whose tables it
+# copies, and the reward hashes under scratch keys of the configured redis; both are removed afterwards.
+# python -m benchmarks.address_index [--addresses N] [--new N] [--scratch-schema NAME] [--keep]
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+from psycopg import sql
+
+from benchmarks.common import connect_database, report
+
+tables = ("address_index", "address_transition", "program")
+
+
+async def generate_addresses(conn: Any, schema: str, scratch: str, addresses: int):
+    await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(scratch)))
+    await conn.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(scratch)))
+    for table in tables:
+        await conn.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING ALL)").format(
+            sql.Identifier(scratch, table), sql.Identifier(schema, table)
+        ))
+    await conn.execute(
+        "INSERT INTO address_index (address) SELECT 'aleo1address' || i FROM generate_series(0, %s - 1) i",
+        (addresses,)
+    )
+    # most addresses come from transitions, a few of them several times
+    await conn.execute(
+        "INSERT INTO address_transition (address, transition_id) "
+        "SELECT 'aleo1address' || (i %% (%(addresses)s * 4 / 5)), i FROM generate_series(0, %(addresses)s - 1) i",
+        {"addresses": addresses}
+    )
+    await conn.execute(
+        "INSERT INTO program (id, program_id, raw_data, feature_hash, owner, address) "
+        "SELECT i, 'program' || i || '.aleo', '', '', 'aleo1address' || (%(addresses)s - 1 - i), 'aleo1program' || i "
+        "FROM generate_series(0, %(addresses)s / 100 - 1) i",
+        {"addresses": addresses}
+    )
+    await conn.execute(
+        "INSERT INTO address_index (address) SELECT address FROM program ON CONFLICT DO NOTHING"
+    )
+    for table in tables:
+        await conn.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+
+async def fill_hash(redis: Any, key: str, fields: range, prefix: str):
+    for start in range(0, len(fields), 10000):
+        await redis.hset(key, mapping={f"{prefix}{i}": 1 for i in fields[start:start + 10000]})
+
+
+async def rebuild(cur: Any, redis: Any, reward_keys: list[str]):
+    # how migrate_16_add_address_index builds the index
+    await cur.execute("TRUNCATE TABLE address_index")
+    await cur.execute(
+        "INSERT INTO address_index (address) "
+        "SELECT address FROM address_transition "
+        "UNION SELECT owner FROM program WHERE owner IS NOT NULL "
+        "UNION SELECT address FROM program "
+        "ON CONFLICT DO NOTHING"
+    )
+    for key in reward_keys:
+        addresses: list[str] = []
+        async for address, _ in redis.hscan_iter(key, count=10000):
+            addresses.append(address)
+            if len(addresses) >= 10000:
+                await cur.execute(
+                    "INSERT INTO address_index (address) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING", (addresses,)
+                )
+                addresses = []
+        if addresses:
+            await cur.execute(
+                "INSERT INTO address_index (address) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING", (addresses,)
+            )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--addresses", type=int, default=3_000_000)
+    parser.add_argument("--new", type=int, default=1000, help="reward addresses added after the backup")
+    parser.add_argument("--scratch-schema", default="address_index_benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    import explorer # type: ignore
+    from db.util import DatabaseUtil
+
+    db = connect_database(args.scratch_schema)
+    await db.connect()
+    reward_keys = [f"{args.scratch_schema}:{key}" for key in DatabaseUtil.address_index_reward_keys]
+    DatabaseUtil.address_index_reward_keys = reward_keys
+    try:
+        async with db.pool.connection() as conn:
+            started = time.perf_counter()
+            await generate_addresses(conn, os.environ["DB_SCHEMA"], args.scratch_schema, args.addresses)
+            # every address past the transition ones earns puzzle rewards, a tenth of all addresses stake
+            await fill_hash(db.redis, reward_keys[0], range(args.addresses * 4 // 5, args.addresses), "aleo1address")
+            await fill_hash(db.redis, reward_keys[1], range(0, args.addresses, 10), "aleo1address")
+            for key in reward_keys:
+                await db.redis.copy(key, f"{key}:backup", replace=True)
+            # the reverted blocks paid new reward addresses, half of them known from elsewhere
+            await fill_hash(db.redis, reward_keys[0], range(args.new), "aleo1new")
+            await fill_hash(db.redis, reward_keys[1], range(args.addresses - args.new // 2, args.addresses), "aleo1address")
+            await conn.execute(
+                "INSERT INTO address_index (address) SELECT 'aleo1new' || i FROM generate_series(0, %s - 1) i",
+                (args.new,)
+            )
+            print(f"generated {args.addresses} addresses in {time.perf_counter() - started:.1f} s")
+
+            async with conn.cursor() as cur:
+                async with conn.transaction(force_rollback=True):
+                    started = time.perf_counter()
+                    await rebuild(cur, db.redis, reward_keys)
+                    baseline = time.perf_counter() - started
+                    report("rebuild address_index", baseline)
+
+                async with conn.transaction(force_rollback=True):
+                    started = time.perf_counter()
+                    candidates: set[str] = set()
+                    for key in reward_keys:
+                        candidates.update(await DatabaseUtil._get_new_hash_fields(db.redis, key, f"{key}:backup"))
+                    report(f"find {len(candidates)} new reward addresses", time.perf_counter() - started, baseline)
+                    for key in reward_keys:
+                        await db.redis.rename(key, f"{key}:reverted")
+                        await db.redis.copy(f"{key}:backup", key)
+                    trim_started = time.perf_counter()
+                    await DatabaseUtil._trim_address_index(cur, db.redis, candidates)
+                    report(f"trim address_index ({cur.rowcount} removed)", time.perf_counter() - trim_started, baseline)
+                    report("find and trim", time.perf_counter() - started, baseline)
+                    await cur.execute("SELECT count(*) FROM address_index")
+                    if (await cur.fetchone())["count"] != args.addresses + args.addresses // 100:
+                        raise AssertionError("trimmed address_index has the wrong size")
+    finally:
+        for key in reward_keys:
+            await db.redis.delete(key, f"{key}:backup", f"{key}:reverted")
+        if not args.keep:
+            async with db.pool.connection() as conn:
+                await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(args.scratch_schema)))
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+# Address label resolution for a validators page payload of the database configured in .env: UIAddress.resolve_many
+# with a cold and a warm label cache, against resolving every address on its own like UIAddress.resolve did before
+# (ANS primary name, tag and validator link each awaited per address).
+# python -m benchmarks.address_labels [--page N]
+
+import argparse
+import asyncio
+from typing import Any
+
+from benchmarks.common import connect_database, count_queries, measure_async, report
+
+
+async def resolve_one_by_one(db: Any, addresses: list[str]) -> list[dict[str, Any]]:
+    from util import arc0137
+    labels: list[dict[str, Any]] = []
+    for address in addresses:
+        name = await arc0137.get_primary_name_from_address(db, address)
+        tag = await db.get_address_tag(address)
+        link, logo = await db.get_validator_link_and_logo(address)
+        labels.append({"name": name, "tag": tag, "link": link, "logo": logo})
+    return labels
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", type=int, default=1, help="validators page to resolve, 50 validators each")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    from webui.classes import UIAddress
+    try:
+        latest_height = await db.get_latest_height()
+        if latest_height is None:
+            print("no blocks in the database")
+            return
+        start = 50 * (args.page - 1)
+        validators = await db.get_validators_range_at_height(latest_height, start, start + 50)
+        addresses = [v["address"] for v in validators]
+        if not addresses:
+            print(f"no validators on page {args.page}")
+            return
+        print(f"{len(addresses)} validators at height {latest_height}")
+
+        async def resolve_cold():
+            UIAddress._label_cache.clear()
+            return await UIAddress.resolve_many([UIAddress(a) for a in addresses], db)
+
+        async def resolve_warm():
+            return await UIAddress.resolve_many([UIAddress(a) for a in addresses], db)
+
+        with count_queries() as queries:
+            expected = await resolve_one_by_one(db, addresses)
+        baseline = await measure_async(lambda: resolve_one_by_one(db, addresses))
+        report(f"one by one ({queries[0]} queries)", baseline)
+        with count_queries() as queries:
+            resolved = await resolve_cold()
+        if [x.to_partial_json() for x in resolved] != expected:
+            raise AssertionError("resolve_many returns different labels")
+        report(f"resolve_many cold cache ({queries[0]} queries)", await measure_async(resolve_cold), baseline)
+        with count_queries() as queries:
+            await resolve_warm()
+        report(f"resolve_many warm cache ({queries[0]} queries)", await measure_async(resolve_warm), baseline)
+    finally:
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+# Latency and query count of get_address_profile against the sequential awaits the address routes made before it, for
+# a validator, a prover and a plain address of the database configured in .env. The addresses are picked from the
+# latest committee, the solution_minute buckets and address_transition unless given.
+# With --concurrency N, N profiles of each address are loaded at the same time, like a burst of address page requests.
+# python -m benchmarks.address_profile [--validator ADDR] [--prover ADDR] [--plain ADDR] [--concurrency N]
+
+import argparse
+import asyncio
+import time
+from typing import Any, Optional
+
+from benchmarks.common import connect_database, count_queries, measure_async, report
+
+
+async def sequential_profile(db: Any, address: str) -> dict[str, Any]:
+    # what webapi address_route awaited one after another before get_address_profile
+    from aleo_types import Address, Literal, LiteralPlaintext
+    from aleo_types.cached import cached_get_key_id
+    result: dict[str, Any] = {
+        "solutions": await db.get_recent_solutions_by_address(address),
+        "programs": await db.get_recent_programs_by_address(address),
+        "transitions": await db.get_address_recent_transitions(address),
+    }
+    address_key_bytes = LiteralPlaintext(
+        literal=Literal(type_=Literal.Type.Address, primitive=Address.loads(address))
+    ).dump()
+    for mapping in ["account", "bonded", "unbonding", "committee", "delegated"]:
+        result[mapping] = await db.get_mapping_value(
+            "credits.aleo", mapping, cached_get_key_id("credits.aleo", mapping, address_key_bytes)
+        )
+    result["address_stake_reward"] = await db.get_address_stake_reward(address)
+    result["address_transfer_in"] = await db.get_address_transfer_in(address)
+    result["address_transfer_out"] = await db.get_address_transfer_out(address)
+    result["address_fee"] = await db.get_address_total_fee(address)
+    result["program_name"] = await db.get_program_name_from_address(address)
+    if result["solutions"]:
+        result["solution_count"] = await db.get_solution_count_by_address(address)
+        result["address_puzzle_reward"] = await db.get_puzzle_reward_by_address(address)
+        result["speed"], result["interval"] = await db.get_address_speed(address)
+    result["program_count"] = await db.get_program_count_by_address(address)
+    for program in result["programs"]:
+        await db.get_deploy_info_by_program_id(program)
+    if result["bonded"] is not None:
+        result["withdraw"] = await db.get_mapping_value(
+            "credits.aleo", "withdraw", cached_get_key_id("credits.aleo", "withdraw", address_key_bytes)
+        )
+    for transition in result["transitions"]:
+        await db.get_transition(transition["transition_id"])
+    return result
+
+
+async def pick_addresses(db: Any) -> dict[str, Optional[str]]:
+    async with db.pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT address FROM committee_history_member "
+                "WHERE committee_id = (SELECT max(committee_id) FROM committee_history_member) "
+                "ORDER BY stake DESC LIMIT 1"
+            )
+            validator = await cur.fetchone()
+            await cur.execute(
+                "SELECT address FROM solution_minute GROUP BY address ORDER BY sum(solution_count) DESC LIMIT 1"
+            )
+            prover = await cur.fetchone()
+            await cur.execute(
+                "SELECT at.address FROM address_transition at "
+                "WHERE NOT EXISTS (SELECT 1 FROM solution_minute sm WHERE sm.address = at.address) "
+                "AND NOT EXISTS (SELECT 1 FROM committee_history_member c WHERE c.address = at.address) "
+                "ORDER BY at.transition_id DESC LIMIT 1"
+            )
+            plain = await cur.fetchone()
+    return {
+        "validator": validator and validator["address"],
+        "prover": prover and prover["address"],
+        "plain": plain and plain["address"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--validator", help="validator address to use")
+    parser.add_argument("--prover", help="prover address to use")
+    parser.add_argument("--plain", help="address without solutions or a committee seat to use")
+    parser.add_argument("--concurrency", type=int, default=0, help="also load this many profiles of each at once")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    try:
+        addresses = await pick_addresses(db)
+        for kind in addresses:
+            if getattr(args, kind) is not None:
+                addresses[kind] = getattr(args, kind)
+        for kind, address in addresses.items():
+            if address is None:
+                print(f"no {kind} address in the database, skipped")
+                continue
+            with count_queries() as queries:
+                await sequential_profile(db, address)
+            baseline = await measure_async(lambda: sequential_profile(db, address))
+            report(f"{kind} sequential awaits ({queries[0]} queries)", baseline)
+            with count_queries() as queries:
+                await db.get_address_profile(address)
+            report(f"{kind} get_address_profile ({queries[0]} queries)",
+                   await measure_async(lambda: db.get_address_profile(address)), baseline)
+
+            if args.concurrency:
+                loaders = (("sequential awaits", lambda: sequential_profile(db, address)),
+                           ("get_address_profile", lambda: db.get_address_profile(address)))
+                for name, loader in loaders:
+                    started = time.perf_counter()
+                    await asyncio.gather(*(loader() for _ in range(args.concurrency)))
+                    elapsed = time.perf_counter() - started
+                    print(f"{kind} {name} x{args.concurrency}: {args.concurrency / elapsed:.1f} profiles/s")
+    finally:
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+# ANS primary name resolution for thousands of addresses: util.arc0137 on the ans_name index against the hash walk over
+# the registry mappings from an earlier revision of util/arc0137.py (by default the one before the index).
+# The names are generated in a scratch schema of the database configured in .env, next to DB_SCHEMA whose tables it
+# copies, with the hashing of the reference revision, and dropped afterwards.
+# python -m benchmarks.ans_names [--addresses N] [--names N] [--reference d992a09^] [--scratch-schema NAME] [--keep]
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+from typing import Any
+
+from psycopg import sql
+
+from benchmarks.common import connect_database, count_queries, measure_async, report
+
+tables = ("mapping", "mapping_value", "ans_name", "ans_primary_name", "ans_nft_owner")
+
+
+def load_reference_arc0137_module(revision: str) -> types.ModuleType:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source = subprocess.check_output(["git", "show", f"{revision}:util/arc0137.py"], cwd=root)
+    name = "util._reference_arc0137"
+    module = types.ModuleType(name)
+    module.__package__ = "util"
+    sys.modules[name] = module
+    exec(compile(source, f"{revision}:util/arc0137.py", "exec"), module.__dict__)
+    return module
+
+
+async def generate_names(conn: Any, schema: str, scratch: str, reference: types.ModuleType, names: int,
+                         addresses: list[Any], rng: random.Random):
+    from aleo_types import Field, Literal, LiteralPlaintext, PlaintextValue
+    from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
+    from node import Network
+
+    await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(scratch)))
+    await conn.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(scratch)))
+    for table in tables:
+        await conn.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING ALL)").format(
+            sql.Identifier(scratch, table), sql.Identifier(schema, table)
+        ))
+    mapping_ids: dict[str, int] = {}
+    # ids are given explicitly, the copied defaults would draw from the sequences of the real tables
+    for i, mapping in enumerate(("names", "primary_names", "nft_owners")):
+        await conn.execute(
+            "INSERT INTO mapping (id, mapping_id, program_id, mapping) VALUES (%s, %s, %s, %s)",
+            (i, cached_get_mapping_id(Network.ans_registry, mapping), Network.ans_registry, mapping)
+        )
+        mapping_ids[mapping] = i
+
+    def field_key(value: Field) -> LiteralPlaintext:
+        return LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=value))
+
+    # a third of the names are subnames, up to three levels deep
+    rows: list[tuple[int, str, bytes, bytes]] = []
+    name_hashes: list[tuple[Field, int]] = []
+    for i in range(names):
+        if name_hashes and rng.random() < 1 / 3 and (parent := rng.choice(name_hashes))[1] < 3:
+            parent_hash, depth = parent[0], parent[1] + 1
+        else:
+            parent_hash, depth = Field(data=0), 0
+        name_st = reference._get_name_st(f"name{i}", parent_hash)
+        name_hash = reference._get_name_hash(name_st)
+        name_hashes.append((name_hash, depth))
+        key = field_key(name_hash).dump()
+        rows.append((mapping_ids["names"], cached_get_key_id(Network.ans_registry, "names", key), key,
+                     PlaintextValue(plaintext=name_st).dump()))
+    # most addresses have a primary name, deep ones included
+    for address in addresses:
+        if rng.random() < 0.8:
+            key = LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=address)).dump()
+            rows.append((mapping_ids["primary_names"], cached_get_key_id(Network.ans_registry, "primary_names", key),
+                         key, PlaintextValue(plaintext=field_key(rng.choice(name_hashes)[0])).dump()))
+    async with conn.cursor() as cur:
+        async with cur.copy("COPY mapping_value (id, mapping_id, key_id, value_id, key, value) FROM STDIN") as copy:
+            for i, (mapping_id, key_id, key, value) in enumerate(rows):
+                await copy.write_row((i, mapping_id, key_id, key_id, key, value))
+        from db.mapping import DatabaseMapping
+        await DatabaseMapping._rebuild_ans_index(cur)
+    for table in tables:
+        await conn.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--addresses", type=int, default=5000, help="addresses to resolve at once")
+    parser.add_argument("--names", type=int, default=20000, help="names in the registry")
+    parser.add_argument("--reference", default="d992a09^", help="git revision whose util/arc0137.py is the baseline")
+    parser.add_argument("--scratch-schema", default="ans_names_benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    import explorer # type: ignore
+    from aleo_types import Address
+    from util import arc0137
+    reference = load_reference_arc0137_module(args.reference)
+    rng = random.Random(1)
+    addresses = [Address(rng.randbytes(32)) for _ in range(args.addresses)]
+    address_strs = [str(x) for x in addresses]
+
+    db = connect_database(args.scratch_schema)
+    await db.connect()
+    try:
+        async with db.pool.connection() as conn:
+            started = time.perf_counter()
+            await generate_names(conn, os.environ["DB_SCHEMA"], args.scratch_schema, reference, args.names,
+                                 addresses, rng)
+            print(f"generated {args.names} names in {time.perf_counter() - started:.1f} s")
+
+        with count_queries() as queries:
+            expected = await reference.get_primary_names_from_addresses(db, address_strs)
+        baseline = await measure_async(lambda: reference.get_primary_names_from_addresses(db, address_strs), repeat=3)
+        report(f"{len(addresses)} addresses {args.reference} hash walk ({queries[0]} queries)", baseline)
+        with count_queries() as queries:
+            names = await arc0137.get_primary_names_from_addresses(db, address_strs)
+        if names != expected:
+            raise AssertionError("the index resolves different names")
+        report(f"{len(addresses)} addresses ans_name index ({queries[0]} queries)",
+               await measure_async(lambda: arc0137.get_primary_names_from_addresses(db, address_strs), repeat=3),
+               baseline)
+    finally:
+        if not args.keep:
+            async with db.pool.connection() as conn:
+                await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(args.scratch_schema)))
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+# Overhead of APIQuotaMiddleware per request, as the time over the app alone: requests to an empty app are sent through
+# the middleware in process, with every call started and ended in redis (local_lease_seconds = 0) and with local leases.
+# Leases only help a client's sequential calls on one worker, so the leased runs are shown for one client and for a
+# new client on every request. Uses the redis configured in .env, under scratch keys removed afterwards.
+# python -m benchmarks.api_quota [--requests N] [--concurrency N]
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from starlette.types import ASGIApp, Message
+
+from benchmarks.common import connect_database, report
+
+key_prefix = "api_quota_benchmark"
+
+
+async def empty_app(scope: Any, receive: Any, send: Any):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def run(app: ASGIApp, state: Any, ips: Callable[[int], str], requests: int, concurrency: int) -> float:
+    # seconds per request, with `concurrency` clients sending their requests one after the other
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"request returned {message['status']}")
+
+    async def client(offset: int):
+        for i in range(offset, requests, concurrency):
+            await app({"type": "http", "client": (ips(i), 1234), "app": state}, receive, send)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return (time.perf_counter() - started) / requests
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=1, help="clients sending requests at the same time")
+    args = parser.parse_args()
+
+    from middleware.api_quota import APIQuotaMiddleware
+
+    db = connect_database()
+    await db.connect()
+    state = SimpleNamespace(state=SimpleNamespace(db=db))
+    try:
+        baseline = await run(empty_app, state, lambda i: "10.0.0.1", args.requests, args.concurrency)
+        report("app alone", baseline)
+        # a generous tier, so nothing is rejected and every request reaches the app
+        cases = (
+            ("redis start and end", 0.0, lambda i: f"10.0.0.{i % args.concurrency}"),
+            ("local lease, same client", APIQuotaMiddleware.local_lease_seconds, lambda i: f"10.0.0.{i % args.concurrency}"),
+            ("local lease, new client", APIQuotaMiddleware.local_lease_seconds, lambda i: f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"),
+        )
+        for name, lease_seconds, ips in cases:
+            middleware = APIQuotaMiddleware(empty_app, max_call_time=1e9, recover_rate=1, max_concurrency=1000)
+            middleware.key_prefix = key_prefix
+            middleware.local_lease_seconds = lease_seconds
+            round_trips = [0]
+            start_call, end_call = middleware.start_call, middleware.end_call
+
+            async def counting_start_call(*a: Any, start_call: Any = start_call):
+                round_trips[0] += 1
+                return await start_call(*a)
+
+            async def counting_end_call(*a: Any, end_call: Any = end_call):
+                round_trips[0] += 1
+                return await end_call(*a)
+
+            middleware.start_call = counting_start_call # type: ignore[method-assign]
+            middleware.end_call = counting_end_call # type: ignore[method-assign]
+            seconds = await run(middleware, state, ips, args.requests, args.concurrency)
+            # the leases still held end on their own, their round trips count too
+            await asyncio.sleep(lease_seconds)
+            await asyncio.gather(*middleware.ending_leases)
+            report(f"{name}, {round_trips[0] / args.requests:.3f} redis round trips", seconds - baseline)
+    finally:
+        async for key in db.redis.scan_iter(f"{key_prefix}:*", count=10000):
+            await db.redis.delete(key)
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
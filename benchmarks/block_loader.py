@@ -0,0 +1,64 @@
+# Query count and latency of the full block loader on the largest stored blocks. With --reference, the loader from that
+# revision of db/block.py is run on the same rows for comparison, e.g. the per row loader before the set-based one:
+# python -m benchmarks.block_loader [--blocks N] [--reference 917a7a8^]
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import types
+from typing import Any, Callable, Awaitable
+
+from benchmarks.common import connect_database, count_queries, largest_block_heights, measure_async, report
+
+
+def load_reference_block_module(revision: str) -> types.ModuleType:
+    # executed as a sibling of db.block so its relative imports resolve against the current db package
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source = subprocess.check_output(["git", "show", f"{revision}:db/block.py"], cwd=root)
+    name = "db._reference_block"
+    module = types.ModuleType(name)
+    module.__package__ = "db"
+    sys.modules[name] = module
+    exec(compile(source, f"{revision}:db/block.py", "exec"), module.__dict__)
+    return module
+
+
+async def run_loader(name: str, loader: Callable[[dict[str, Any], Any], Awaitable[Any]], row: dict[str, Any],
+                     conn: Any, baseline: float | None = None) -> tuple[Any, float]:
+    with count_queries() as queries:
+        block = await loader(row, conn)
+    seconds = await measure_async(lambda: loader(row, conn))
+    report(f"{name} ({queries[0]} queries)", seconds, baseline)
+    return block, seconds
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=5, help="number of blocks to use, by transaction count")
+    parser.add_argument("--reference", help="git revision whose db/block.py loader is used as the baseline")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    from db.block import DatabaseBlock
+    reference = load_reference_block_module(args.reference).DatabaseBlock if args.reference else None
+
+    for height in await largest_block_heights(db, args.blocks):
+        async with db.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT * FROM block WHERE height = %s", (height,))
+                row = await cur.fetchone()
+            name = f"block {height} ({row['transaction_count']} transactions)"
+            baseline = None
+            expected = None
+            if reference is not None:
+                expected, baseline = await run_loader(f"{name} {args.reference}", reference._get_full_block, row, conn)
+            block, _ = await run_loader(f"{name} current", DatabaseBlock._get_full_block, row, conn, baseline)
+            if expected is not None and block.dump() != expected.dump():
+                raise AssertionError(f"{name}: loaders return different blocks")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+# Full block fetches from the block store against the relational loader, on the largest stored blocks.
+# Needs the database and BLOCK_STORE_PATH configured in .env, with the blocks present in the store.
+# python -m benchmarks.block_store [--blocks N]
+
+import argparse
+import asyncio
+
+from benchmarks.common import connect_database, count_queries, largest_block_heights, measure, measure_async, report
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=5, help="number of blocks to use, by transaction count")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    store = db.block_store
+    if store is None:
+        raise RuntimeError("BLOCK_STORE_PATH is not configured")
+    from db.block import DatabaseBlock
+
+    for height in await largest_block_heights(db, args.blocks):
+        stored = store.get_block(height)
+        if stored is None:
+            print(f"block {height} is not in the block store, skipping")
+            continue
+        async with db.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT * FROM block WHERE height = %s", (height,))
+                row = await cur.fetchone()
+            with count_queries() as queries:
+                block = await DatabaseBlock._get_full_block(row, conn)
+            if block.dump() != stored.dump():
+                raise AssertionError(f"block {height}: block store and database differ")
+            name = f"block {height} ({row['transaction_count']} transactions)"
+            baseline = await measure_async(lambda: DatabaseBlock._get_full_block(row, conn))
+            report(f"{name} relational ({queries[0]} queries)", baseline)
+            report(f"{name} block store", measure(lambda: store.get_block(height)), baseline)
+        report(f"{name} get_block_by_height", await measure_async(lambda: db.get_block_by_height(height)), baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
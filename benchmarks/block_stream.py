@@ -0,0 +1,168 @@
+# Load test of the webapi block stream: a local swarm of clients stays connected to /block/stream while new blocks
+# are announced, and the CPU time of the server processes is reported per connected client, next to the same number of
+# clients polling /block/recent like before the stream.
+# The webapi runs in a UvicornServer on the database configured in .env. Blocks are announced on its latest block
+# channel; the database itself doesn't move, so every announcement is built as a new height. The clients are left out
+# of the access log.
+# python -m benchmarks.block_stream [--clients N,N] [--workers N] [--seconds S] [--block-time S] [--poll-interval S]
+
+import argparse
+import asyncio
+import itertools
+import os
+import resource
+import time
+from typing import Any
+
+import aiohttp
+
+from benchmarks.common import connect_database, start_webapi, wait_for_server, webapi_headers
+
+clock_ticks = os.sysconf("SC_CLK_TCK")
+
+
+def process_tree_cpu(pid: int) -> float:
+    # user and system CPU seconds of the process and all of its descendants, from /proc
+    cpu: dict[int, float] = {}
+    parents: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        parents[int(entry)] = int(fields[1])
+        cpu[int(entry)] = (int(fields[11]) + int(fields[12])) / clock_ticks
+    total = 0.0
+    for process in cpu:
+        ancestor = process
+        while ancestor not in (pid, 0, 1) and ancestor in parents:
+            ancestor = parents[ancestor]
+        if ancestor == pid:
+            total += cpu[process]
+    return total
+
+
+async def stream_client(session: aiohttp.ClientSession, url: str, received: list[int]):
+    async with session.get(url) as response:
+        async for line in response.content:
+            if line.startswith(b"event: block"):
+                received[0] += 1
+
+
+async def polling_client(session: aiohttp.ClientSession, url: str, interval: float, received: list[int]):
+    while True:
+        started = time.monotonic()
+        async with session.get(url) as response:
+            await response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{url} returned {response.status}")
+        received[0] += 1
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+async def swarm(args: argparse.Namespace, server_pid: int):
+    db = connect_database()
+    await db.connect()
+    base = f"http://127.0.0.1:{args.port}"
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), headers=webapi_headers(),
+                                    timeout=aiohttp.ClientTimeout(total=None))
+    height = await db.get_latest_height() or 0
+    try:
+        await wait_for_server(session, f"{base}/")
+        for clients in args.clients:
+            received = [0]
+            tasks = [asyncio.create_task(stream_client(session, f"{base}/block/stream", received))
+                     for _ in range(clients)]
+            # every client gets the current block on connect
+            while received[0] < clients:
+                if done := [task for task in tasks if task.done()]:
+                    await done[0]
+                    raise RuntimeError("stream closed")
+                await asyncio.sleep(0.1)
+
+            cpu = process_tree_cpu(server_pid)
+            await asyncio.sleep(args.seconds)
+            idle = process_tree_cpu(server_pid) - cpu
+
+            received[0] = 0
+            cpu = process_tree_cpu(server_pid)
+            started = time.monotonic()
+            blocks = 0
+            while time.monotonic() - started < args.seconds:
+                height += 1
+                blocks += 1
+                await db.redis.publish(db.latest_block_channel, height)
+                await asyncio.sleep(args.block_time)
+            # the last block is still being sent
+            await asyncio.sleep(min(args.block_time, 1))
+            busy = process_tree_cpu(server_pid) - cpu
+            elapsed = time.monotonic() - started
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            print(f"{clients:6d} stream clients   every {args.block_time:g} s "
+                  f"{busy / elapsed / clients * 1e6:9.1f} us/s per client  "
+                  f"({busy / blocks / clients * 1e6:.1f} us per block, idle {idle / args.seconds / clients * 1e6:.1f} "
+                  f"us/s, {received[0]} of {blocks * clients} events received)")
+
+            received[0] = 0
+            tasks = [asyncio.create_task(polling_client(session, f"{base}/block/recent", args.poll_interval, received))
+                     for _ in range(clients)]
+            # the first round connects every client
+            await asyncio.sleep(args.poll_interval)
+            cpu = process_tree_cpu(server_pid)
+            await asyncio.sleep(args.seconds)
+            busy = process_tree_cpu(server_pid) - cpu
+            for task in tasks:
+                if task.done():
+                    await task
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            print(f"{clients:6d} polling clients  every {args.poll_interval:g} s "
+                  f"{busy / args.seconds / clients * 1e6:9.1f} us/s per client  ({received[0]} requests)")
+    finally:
+        await session.close()
+        await db.pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=lambda s: [int(x) for x in s.split(",")], default=[100, 1000, 5000],
+                        help="comma separated swarm sizes")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each measurement")
+    parser.add_argument("--block-time", type=float, default=3, help="seconds between announced blocks")
+    parser.add_argument("--poll-interval", type=float, default=5, help="seconds between requests of a polling client")
+    parser.add_argument("--port", type=int, default=8102)
+    args = parser.parse_args()
+
+    # one socket per client on both ends
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    import explorer # type: ignore
+    from webapi.chain_routes import block_broadcaster
+
+    # builds only happen on announcements, and each one is a new height
+    build = block_broadcaster.build
+    builds = itertools.count()
+
+    async def build_new_height(db: Any) -> tuple[int, bytes]:
+        height, message = await build(db)
+        return height + next(builds), message
+
+    block_broadcaster.build = build_new_height
+    block_broadcaster.poll_interval = 3600
+    server = start_webapi(args.port, args.workers, backlog=max(args.clients) + 128)
+    try:
+        asyncio.run(swarm(args, server.pid))
+    finally:
+        server.stop()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
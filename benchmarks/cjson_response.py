@@ -0,0 +1,77 @@
+# CJSONResponse encoding of real webapi payloads: the C encoder path against the pure python CustomEncoder.
+# Needs the database configured in .env.
+# python -m benchmarks.cjson_response [--height H]
+
+import argparse
+import asyncio
+import json
+from typing import Any
+
+from starlette.datastructures import State
+from starlette.requests import Request
+
+from benchmarks.common import connect_database, largest_block_heights, measure, report
+
+
+class _App:
+    def __init__(self, db: Any):
+        self.state = State()
+        self.state.db = db
+
+
+async def capture_payload(route: Any, app: _App, path: str, path_params: dict[str, str]) -> Any:
+    # runs the route and returns the content it handed to CJSONResponse
+    from webapi.utils import CJSONResponse
+    captured: list[Any] = []
+    render = CJSONResponse.render
+
+    def capture(self: CJSONResponse, content: Any):
+        captured.append(content)
+        return render(self, content)
+
+    CJSONResponse.render = capture
+    try:
+        response = await route(Request({
+            "type": "http", "method": "GET", "scheme": "http", "server": ("benchmark", 80), "root_path": "",
+            "path": path, "query_string": b"", "headers": [], "path_params": path_params, "app": app,
+        }))
+    finally:
+        CJSONResponse.render = render
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {captured[-1]}")
+    return captured[-1]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--height", type=int, help="block to use, defaults to the one with the most transactions")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    from webapi.address_routes import address_route
+    from webapi.chain_routes import block_route, validators_route
+    from webapi.utils import CustomEncoder, cjson_dumps
+
+    app = _App(db)
+    height = args.height if args.height is not None else (await largest_block_heights(db, 1))[0]
+    validators = await capture_payload(validators_route, app, "/validators", {})
+    address = validators["validators"][0]["address"]
+    payloads = {
+        f"/block/{height}": await capture_payload(block_route, app, f"/block/{height}", {"height": str(height)}),
+        "/validators": validators,
+        f"/address/{address}": await capture_payload(address_route, app, f"/address/{address}", {"address": address}),
+    }
+
+    for path, content in payloads.items():
+        encoded = cjson_dumps(content)
+        if encoded != json.dumps(content, cls=CustomEncoder).encode("utf-8"):
+            raise AssertionError(f"{path}: output differs from CustomEncoder")
+        name = f"{path[:40]} ({len(encoded)} bytes)"
+        baseline = measure(lambda: json.dumps(content, cls=CustomEncoder).encode("utf-8"))
+        report(f"{name} CustomEncoder", baseline)
+        report(f"{name} cjson_dumps", measure(lambda: cjson_dumps(content)), baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import os
+import time
+import timeit
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from aleo_types import Block
+
+load_dotenv()
+
+genesis_networks = ("mainnet", "testnet", "canary")
+
+
+def add_db_argument(parser: argparse.ArgumentParser):
+    parser.add_argument("--db", action="store_true",
+                        help="use the largest blocks from the database configured in .env instead of the genesis blocks")
+    parser.add_argument("--blocks", type=int, default=5, help="number of database blocks to use")
+
+
+def measure(func: Callable[[], Any], *, repeat: int = 5, min_time: float = 0.2) -> float:
+    # best of `repeat` runs, each long enough to be above timer noise, in seconds per call
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]], *, repeat: int = 5) -> float:
+    # best of `repeat` awaited calls, in seconds; database calls are long enough that one call is above timer noise
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@contextmanager
+def count_queries() -> Iterator[list[int]]:
+    # counts every statement sent through a psycopg cursor, conn.execute included, while active
+    import psycopg
+    counter = [0]
+    execute = psycopg.AsyncCursor.execute
+
+    async def counting_execute(self: Any, *args: Any, **kwargs: Any):
+        counter[0] += 1
+        return await execute(self, *args, **kwargs)
+
+    psycopg.AsyncCursor.execute = counting_execute # type: ignore
+    try:
+        yield counter
+    finally:
+        psycopg.AsyncCursor.execute = execute # type: ignore
+
+
+def report(name: str, seconds: float, baseline: Optional[float] = None):
+    line = f"{name:<60} {seconds * 1000:10.3f} ms"
+    if baseline is not None and seconds > 0:
+        line += f"  ({baseline / seconds:.2f}x)"
+    print(line)
+
+
+def genesis_blocks() -> list[tuple[str, Block]]:
+    blocks: list[tuple[str, Block]] = []
+    node_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "node")
+    for network in genesis_networks:
+        with open(os.path.join(node_dir, network, "block.genesis"), "rb") as f:
+            blocks.append((f"{network} genesis", Block.load(BytesIO(f.read()))))
+    return blocks
+
+
+async def ignore_message(msg: Any):
+    pass
+
+
+def connect_database(schema: Optional[str] = None):
+    # imported here so the benchmarks that only need aleo_types don't require a configured network,
+    # and through explorer like main.py does, as importing db first is circular
+    import explorer # type: ignore
+    from db import Database
+    return Database(server=os.environ["DB_HOST"], user=os.environ["DB_USER"], password=os.environ["DB_PASS"],
+                    database=os.environ["DB_DATABASE"], schema=schema or os.environ["DB_SCHEMA"],
+                    redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
+                    redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
+                    redis_password=os.environ.get("REDIS_PASS"),
+                    block_store_path=os.environ.get("BLOCK_STORE_PATH"),
+                    message_callback=ignore_message)
+
+
+async def largest_block_heights(db: Any, count: int) -> list[int]:
+    async with db.pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT height FROM block ORDER BY transaction_count DESC, height DESC LIMIT %s", (count,)
+            )
+            return [row["height"] for row in await cur.fetchall()]
+
+
+async def largest_blocks(db: Any, count: int) -> list[tuple[str, Block]]:
+    blocks: list[tuple[str, Block]] = []
+    for height in await largest_block_heights(db, count):
+        if (block := await db.get_block_by_height(height)) is not None:
+            blocks.append((f"block {height}", block))
+    return blocks
+
+
+def start_webapi(port: int, workers: int, backlog: int = 2048):
+    # the webapi app in a UvicornServer on 127.0.0.1, without the benchmark clients in its access log
+    import explorer # type: ignore
+    import uvicorn
+    from util.web_server import UvicornServer
+    from webapi.webapi import app
+    os.environ["ACCESS_LOG_UA_EXCLUDE_PATTERN"] = "aiohttp/"
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=backlog)
+    server = UvicornServer(config=config, workers=workers, name="webapi benchmark")
+    server.start()
+    return server
+
+
+def webapi_headers() -> dict[str, str]:
+    return {"Authorization": f"Token {os.environ.get('WEBAPI_TOKEN', '')}"}
+
+
+async def wait_for_server(session: Any, url: str):
+    import aiohttp
+    for _ in range(100):
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"{url} returned {response.status}")
+                return
+        except aiohttp.ClientConnectionError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} didn't come up")
@@ -0,0 +1,94 @@
+# A finalize block made of field arithmetic, run through the interpreter with the python field ops against the
+# same commands forced through the aleo_explorer_rust round trip.
+# python -m benchmarks.field_finalize [--steps N]
+
+import argparse
+from io import BytesIO
+from typing import Any
+
+import aleo_explorer_rust
+
+from aleo_types import Field, Literal, LiteralPlaintext, PlaintextValue, Program, InstructionCommand, Identifier
+from benchmarks.common import measure, report
+from interpreter.environment import Registers
+from interpreter.instruction import execute_instruction
+from interpreter.utils import FinalizeState
+from node import Network
+
+# (instruction, operand count, result is a field)
+field_ops = [
+    ("add", 2, True), ("mul", 2, True), ("sub", 2, True), ("square", 1, True), ("gte", 2, False),
+    ("double", 1, True), ("div", 2, True), ("neg", 1, True), ("inv", 1, True), ("lt", 2, False),
+]
+
+
+def program_source(steps: int) -> str:
+    lines = [
+        "program field_bench.aleo;",
+        "",
+        "function run:",
+        "    input r0 as field.public;",
+        "    input r1 as field.public;",
+        "    async run r0 r1 into r2;",
+        "    output r2 as field_bench.aleo/run.future;",
+        "",
+        "finalize run:",
+        "    input r0 as field.public;",
+        "    input r1 as field.public;",
+    ]
+    fields = [0, 1]
+    register = 2
+    for step in range(steps):
+        op, operands, is_field = field_ops[step % len(field_ops)]
+        args = " ".join(f"r{r}" for r in fields[-operands:])
+        lines.append(f"    {op} {args} into r{register};")
+        if is_field:
+            fields.append(register)
+        register += 1
+    return "\n".join(lines) + "\n"
+
+
+def field_value(value: int) -> PlaintextValue:
+    return PlaintextValue(plaintext=LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=Field(value))))
+
+
+def run_finalize(program: Program, inputs: list[PlaintextValue], finalize_state: FinalizeState) -> dict[int, Any]:
+    finalize = program.functions[Identifier(value="run")].finalize.value
+    if finalize is None:
+        raise RuntimeError("missing finalize")
+    registers = Registers()
+    for index, value in enumerate(inputs):
+        registers[index] = value
+    for command in finalize.commands:
+        if isinstance(command, InstructionCommand):
+            execute_instruction(command.instruction, program, registers, finalize_state)
+    return dict(registers._registers) # type: ignore[reportPrivateUsage]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=500, help="number of instructions in the finalize block")
+    args = parser.parse_args()
+
+    program = Program.load(BytesIO(aleo_explorer_rust.parse_program(program_source(args.steps))))
+    inputs = [field_value(0x1234567890abcdef), field_value(0xfedcba0987654321)]
+    finalize_state = FinalizeState(Network.genesis_block)
+
+    python_result = run_finalize(program, inputs, finalize_state)
+    is_canonical = Field._is_canonical
+    # every op takes the aleo_explorer_rust path, as before the python fast path
+    Field._is_canonical = lambda self, other=None: False # type: ignore
+    try:
+        rust_result = run_finalize(program, inputs, finalize_state)
+        if rust_result != python_result:
+            raise AssertionError("register values differ between the python and rust field ops")
+        baseline = measure(lambda: run_finalize(program, inputs, finalize_state))
+    finally:
+        Field._is_canonical = is_canonical
+    name = f"finalize with {args.steps} field instructions"
+    report(f"{name} rust round trip", baseline)
+    report(f"{name} python ints", measure(lambda: run_finalize(program, inputs, finalize_state)), baseline)
+
+
+if __name__ == "__main__":
+    main()
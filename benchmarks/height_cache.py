@@ -0,0 +1,96 @@
+# Load test of the height_cache routes: concurrent clients call the webapi routes in process for a fixed time, with
+# the route behind HeightCache and without it (straight to the database), and report requests per second.
+# New blocks are simulated by moving the cache to a new height every --block-time seconds, so misses are included.
+# HTTP handling isn't included, the routes are awaited directly. Needs the database configured in .env.
+# python -m benchmarks.height_cache [--clients N] [--seconds S] [--block-time S]
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Coroutine
+
+from starlette.datastructures import State
+from starlette.requests import Request
+
+from benchmarks.common import connect_database
+
+
+class _App:
+    def __init__(self, db: Any):
+        self.state = State()
+        self.state.db = db
+
+
+def make_request(app: _App, path: str, query: bytes) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "scheme": "http", "server": ("benchmark", 80), "root_path": "",
+        "path": path, "query_string": query, "headers": [], "path_params": {}, "app": app,
+    })
+
+
+async def load(route: Callable[[Request], Coroutine[Any, Any, Any]], app: _App, path: str, query: bytes,
+               clients: int, seconds: float) -> tuple[int, float]:
+    # every client sends its next request as soon as the previous one is answered
+    deadline = time.perf_counter() + seconds
+    completed = 0
+
+    async def client():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            response = await route(make_request(app, path, query))
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+            completed += 1
+            # a cache hit never suspends, give the other clients their turn like the network would
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return completed, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each run")
+    parser.add_argument("--block-time", type=float, default=3, help="seconds between simulated new blocks")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    from webapi.chain_routes import blocks_route, recent_blocks_route, validators_route
+    from webapi.utils import height_cache_instance
+
+    async def new_blocks():
+        # the next request sees a different height and drops every entry, like after a real block
+        while True:
+            await asyncio.sleep(args.block_time)
+            height_cache_instance.height = None
+            height_cache_instance.entries.clear()
+
+    app = _App(db)
+    blocks = asyncio.create_task(new_blocks())
+    try:
+        for route, path, query in ((recent_blocks_route, "/block/recent", b""), (blocks_route, "/blocks", b"p=1"),
+                                   (validators_route, "/validators", b"p=1")):
+            # public_cache_seconds(height_cache(route)), unwrapped down to the route itself
+            cached = route.__wrapped__ # type: ignore[attr-defined]
+            uncached = cached.__wrapped__
+            baseline = 0.0
+            for name, func in (("database", uncached), ("height_cache", cached)):
+                misses = height_cache_instance.misses
+                completed, elapsed = await load(func, app, path, query, args.clients, args.seconds)
+                rate = completed / elapsed
+                line = f"{path}?{query.decode()} {name:<14} {rate:10.1f} requests/s"
+                if name == "height_cache":
+                    line += f"  ({rate / baseline:.2f}x, {height_cache_instance.misses - misses} misses)"
+                else:
+                    baseline = rate
+                print(line)
+    finally:
+        blocks.cancel()
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+# Block.json() through the cached per-class serializers against the reflective serializer they replaced.
+# python -m benchmarks.json_serialize [--db] [--blocks N]
+
+import argparse
+import asyncio
+import inspect
+import json
+from enum import IntEnum
+from typing import Any
+
+from aleo_types import Block
+from aleo_types.serialize import JSONSerialize, JSONType, enum_name_convert
+from benchmarks.common import add_db_argument, connect_database, genesis_blocks, largest_blocks, measure, report
+
+
+def reference_json(obj: Any, compatible: bool = False) -> JSONType:
+    # JSONSerialize.json / json_compatible / __default_json as they were before the serializers were cached
+    cls = obj.__class__
+    if compatible:
+        if cls.json_compatible is not JSONSerialize.json_compatible:
+            return obj.json_compatible()
+        if cls.json is not JSONSerialize.json:
+            return obj.json(compatible=True)
+    elif cls.json is not JSONSerialize.json:
+        return obj.json(compatible)
+    res: dict[str, Any] = {}
+    for k, v in obj.__dict__.items():
+        if not k.startswith("_"):
+            if isinstance(v, JSONSerialize):
+                res[k] = reference_json(v, compatible)
+            elif isinstance(v, dict):
+                dict_sub = {}
+                for k1, v1 in v.items():
+                    if isinstance(v1, IntEnum):
+                        dict_sub[str(k1)] = enum_name_convert(v1.name)
+                    elif not isinstance(v1, JSONSerialize):
+                        raise TypeError(f"cannot serialize {v1.__class__.__name__}")
+                    else:
+                        dict_sub[str(k1)] = reference_json(v1, compatible)
+                res[k] = dict_sub
+            elif isinstance(v, (list, tuple)):
+                list_sub: list[JSONType] = []
+                for item in v:
+                    if not isinstance(item, JSONSerialize):
+                        raise TypeError(f"cannot serialize {item.__class__.__name__}")
+                    list_sub.append(reference_json(item, compatible))
+                res[k] = list_sub
+            elif isinstance(v, IntEnum):
+                res[k] = enum_name_convert(v.name)
+            else:
+                raise TypeError(f"cannot serialize {v.__class__.__name__}")
+    for k, v in obj.__class__.__dict__.items():
+        if not k.startswith("_") and not inspect.isfunction(v):
+            if isinstance(v, IntEnum):
+                res[k] = enum_name_convert(v.name)
+    return res
+
+
+def run(blocks: list[tuple[str, Block]]):
+    for label, block in blocks:
+        name = f"{label} ({len(block.transactions.transactions)} transactions)"
+        for compatible in (False, True):
+            new = json.dumps(block.json(compatible))
+            old = json.dumps(reference_json(block, compatible))
+            if new != old:
+                raise AssertionError(f"{name}: output differs from the reference serializer (compatible={compatible})")
+            mode = "compatible" if compatible else "json"
+            baseline = measure(lambda: reference_json(block, compatible))
+            report(f"{name} {mode} reference", baseline)
+            report(f"{name} {mode} cached", measure(lambda: block.json(compatible)), baseline)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    add_db_argument(parser)
+    args = parser.parse_args()
+    if args.db:
+        db = connect_database()
+        await db.connect()
+        blocks = await largest_blocks(db, args.blocks)
+    else:
+        blocks = genesis_blocks()
+    run(blocks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
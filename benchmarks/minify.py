@@ -0,0 +1,87 @@
+# HTML minification of representative webui pages: minifying every response, as MinifyMiddleware did before its cache,
+# against the cache hit path (hashing the body and looking it up). The pages are rendered in process from the database
+# configured in .env, behind HtmxMiddleware only.
+# python -m benchmarks.minify [--height H]
+
+import argparse
+import asyncio
+import hashlib
+from typing import Any
+
+import aiohttp
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.types import Message
+
+from benchmarks.common import connect_database, largest_block_heights, measure, report
+
+
+async def render(app: Starlette, path: str, query: str) -> tuple[int, bytes]:
+    messages: list[Message] = []
+
+    requested = False
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client stays connected, streamed responses listen for a disconnect until they are done
+        await asyncio.Future()
+        raise AssertionError("unreachable")
+
+    async def send(message: Message):
+        messages.append(message)
+
+    await app({
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "server": ("benchmark", 80), "client": ("127.0.0.1", 0), "root_path": "", "path": path,
+        "raw_path": path.encode(), "query_string": query.encode(), "headers": [(b"host", b"benchmark")],
+    }, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    return status, b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--height", type=int, help="block page to use, defaults to the one with the most transactions")
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    from middleware.htmx import HtmxMiddleware
+    from middleware.minify import MinifyMiddleware, _minify
+    from webui.webui import exc_handlers, routes
+
+    app = Starlette(routes=routes, exception_handlers=exc_handlers, middleware=[Middleware(HtmxMiddleware)])
+    app.state.db = db
+    app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
+    try:
+        height = args.height if args.height is not None else (await largest_block_heights(db, 1))[0]
+        latest_height = await db.get_latest_height()
+        validators: list[dict[str, Any]] = await db.get_validators_range_at_height(latest_height, 0, 1)
+        pages = [("/", ""), ("/blocks", ""), ("/validators", ""), ("/block", f"h={height}"), ("/programs", ""),
+                 ("/program", "id=credits.aleo"), ("/faq", "")]
+        if validators:
+            pages.append(("/address", f"a={validators[0]['address']}"))
+
+        middleware = MinifyMiddleware(app)
+        for path, query in pages:
+            name = f"{path}?{query}" if query else path
+            status, body = await render(app, path, query)
+            if status != 200:
+                print(f"{name} returned {status}, skipped")
+                continue
+            minified = await middleware.minify(body)
+            print(f"{name}: {len(body)} -> {len(minified)} bytes")
+            baseline = measure(lambda: _minify(body))
+            report(f"{name} minify", baseline)
+            report(f"{name} cache hit",
+                   measure(lambda: middleware.cache.get(hashlib.blake2b(body, digest_size=16).digest())), baseline)
+    finally:
+        await app.state.session.close()
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
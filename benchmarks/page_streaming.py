@@ -0,0 +1,141 @@
+# Time to first byte, total time and peak RSS growth of the pages htmx_template can stream (block, transaction and
+# program), rendered whole before sending (as before streaming), always streamed, and streamed only past
+# stream_threshold (the default). The pages are requested in process through HtmxMiddleware and MinifyMiddleware, with
+# an empty minify cache, from the database configured in .env. Peak RSS is read from /proc, so this needs Linux.
+# python -m benchmarks.page_streaming [--height H] [--transaction ID] [--program ID] [--repeat N]
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+from typing import Any
+
+import aiohttp
+from starlette.applications import Starlette
+from starlette.types import ASGIApp, Message
+
+from benchmarks.common import connect_database, largest_block_heights
+
+
+def reset_peak_rss():
+    # resets VmHWM to the current RSS
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def rss_kib(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+async def fetch(app: ASGIApp, path: str, query: str) -> tuple[int, float, float, int, str]:
+    # status, time to first body byte, total time, body size and Cache-Control of one request
+    status = 0
+    cache_control = ""
+    first_byte: float | None = None
+    size = 0
+
+    requested = False
+
+    async def receive() -> Message:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client stays connected, streamed responses listen for a disconnect until they are done
+        await asyncio.Future()
+        raise AssertionError("unreachable")
+
+    async def send(message: Message):
+        nonlocal status, cache_control, first_byte, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            cache_control = dict(message["headers"]).get(b"cache-control", b"").decode()
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            size += len(message["body"])
+
+    started = time.perf_counter()
+    await app({
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "server": ("benchmark", 80), "client": ("127.0.0.1", 0), "root_path": "", "path": path,
+        "raw_path": path.encode(), "query_string": query.encode(), "headers": [(b"host", b"benchmark")],
+    }, receive, send)
+    total = time.perf_counter() - started
+    return status, total if first_byte is None else first_byte, total, size, cache_control
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--height", type=int, help="block page to use, defaults to the one with the most transactions")
+    parser.add_argument("--transaction", help="transaction page to use, defaults to the first one of the block")
+    parser.add_argument("--program", default="credits.aleo", help="program page to use")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = connect_database()
+    await db.connect()
+    import webui.template
+    from middleware.htmx import HtmxMiddleware
+    from middleware.minify import MinifyCache, MinifyMiddleware
+    from webui.webui import exc_handlers, routes
+
+    app = Starlette(routes=routes, exception_handlers=exc_handlers)
+    app.state.db = db
+    app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
+    minify = MinifyMiddleware(app)
+    stack = HtmxMiddleware(minify)
+    default_threshold = webui.template.stream_threshold
+    try:
+        height = args.height if args.height is not None else (await largest_block_heights(db, 1))[0]
+        transaction_id = args.transaction
+        if transaction_id is None:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        "SELECT t.transaction_id FROM transaction t "
+                        "JOIN confirmed_transaction ct ON ct.id = t.confirmed_transaction_id "
+                        "JOIN block b ON b.id = ct.block_id "
+                        "WHERE b.height = %s ORDER BY ct.index LIMIT 1",
+                        (height,)
+                    )
+                    row: dict[str, Any] | None = await cur.fetchone()
+                    transaction_id = row["transaction_id"] if row else None
+        pages = [("/block", f"h={height}"), ("/program", f"id={args.program}")]
+        if transaction_id is not None:
+            pages.append(("/transaction", f"id={transaction_id}"))
+
+        modes = (("buffered", sys.maxsize), ("streamed", 0), ("threshold", default_threshold))
+        for path, query in pages:
+            for mode, threshold in modes:
+                webui.template.stream_threshold = threshold
+                ttfb = total = float("inf")
+                peak = 0
+                # the first request compiles the templates and warms the database caches
+                for i in range(args.repeat + 1):
+                    minify.cache = MinifyCache()
+                    gc.collect()
+                    reset_peak_rss()
+                    before = rss_kib("VmRSS")
+                    status, first_byte, elapsed, size, cache_control = await fetch(stack, path, query)
+                    if status != 200:
+                        raise RuntimeError(f"{path}?{query} returned {status}")
+                    if i:
+                        ttfb = min(ttfb, first_byte)
+                        total = min(total, elapsed)
+                        peak = max(peak, rss_kib("VmHWM") - before)
+                print(f"{path}?{query} {mode:<9} ttfb {ttfb * 1000:9.3f} ms  total {total * 1000:9.3f} ms  "
+                      f"peak rss +{peak:7d} KiB  {size:9d} bytes  Cache-Control: {cache_control}")
+    finally:
+        webui.template.stream_threshold = default_threshold
+        await app.state.session.close()
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# Worst case prefix searches: one to three characters after ab1/at1/au1, each matching a large share of millions of
+# generated ids. The bounded search methods (and DatabaseSearch.search, which only takes three characters or more) are
+# timed against the unbounded queries they replaced, which fetched every match.
+# The ids are generated in a scratch schema of the database configured in .env, next to DB_SCHEMA whose tables it
+# copies, and dropped afterwards.
+# python -m benchmarks.search [--rows N] [--scratch-schema NAME] [--keep]
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+from psycopg import sql
+
+from benchmarks.common import connect_database, measure_async, report
+
+tables = ("block", "transaction", "transition")
+
+# the bech32 alphabet, so every character after the prefix splits the ids evenly
+random_id = ("'{prefix}' || translate(md5(({n})::text) || md5(({n} + 0.5)::text), "
+             "'0123456789abcdef', 'qpzry9x8gf2tvdw0')")
+
+# query as it was before the search was bounded, and the search method replacing it
+reference_queries = {
+    "ab1": ("SELECT block_hash FROM block WHERE block_hash LIKE %s", "search_block_hash"),
+    "at1": ("SELECT transaction_id FROM transaction WHERE transaction_id LIKE %s OR original_transaction_id LIKE %s",
+            "search_transaction_id"),
+    "au1": ("SELECT transition_id FROM transition WHERE transition_id LIKE %s", "search_transition_id"),
+}
+
+
+async def generate_ids(conn: Any, schema: str, scratch: str, rows: int):
+    await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(scratch)))
+    await conn.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(scratch)))
+    for table in tables:
+        await conn.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING ALL)").format(
+            sql.Identifier(scratch, table), sql.Identifier(schema, table)
+        ))
+    # ids are given explicitly, the copied defaults would draw from the sequences of the real tables
+    await conn.execute(
+        "INSERT INTO block (id, height, block_hash, previous_hash, previous_state_root, transactions_root, "
+        "finalize_root, ratifications_root, solutions_root, subdag_root, round, cumulative_weight, "
+        "cumulative_proof_target, coinbase_target, proof_target, last_coinbase_target, last_coinbase_timestamp, "
+        "timestamp, block_reward, coinbase_reward, total_supply, confirm_timestamp) "
+        f"SELECT i, i, {random_id.format(prefix='ab1', n='i')}, '', '', '', '', '', '', '', i, 0, 0, 0, 0, 0, 0, i, "
+        "0, 0, 0, i "
+        "FROM generate_series(0, %s - 1) i",
+        (rows,)
+    )
+    # a few rejected transactions keep their original id
+    await conn.execute(
+        "INSERT INTO transaction (id, transaction_id, type, original_transaction_id) "
+        f"SELECT i, {random_id.format(prefix='at1', n='i')}, 'Execute', "
+        f"CASE WHEN i %% 100 = 0 THEN {random_id.format(prefix='at1', n='-i')} END "
+        "FROM generate_series(0, %s - 1) i",
+        (rows,)
+    )
+    await conn.execute(
+        "INSERT INTO transition (id, transition_id, program_id, function_name, tpk, tcm, index, scm) "
+        f"SELECT i, {random_id.format(prefix='au1', n='i')}, 'credits.aleo', 'transfer_public', '', '', 0, '' "
+        "FROM generate_series(0, %s - 1) i",
+        (rows,)
+    )
+    for table in tables:
+        await conn.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000, help="ids per kind")
+    parser.add_argument("--scratch-schema", default="search_benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    db = connect_database(args.scratch_schema)
+    await db.connect()
+    try:
+        async with db.pool.connection() as conn:
+            started = time.perf_counter()
+            await generate_ids(conn, os.environ["DB_SCHEMA"], args.scratch_schema, args.rows)
+            print(f"generated {args.rows} ids of each kind in {time.perf_counter() - started:.1f} s")
+
+            async with conn.cursor() as cur:
+                for prefix, (reference_query, method) in reference_queries.items():
+                    min_length = next(m for p, _, m in db.search_kinds if p == prefix)
+                    for query in (prefix + "q", prefix + "qp", prefix + "qpz"):
+                        params = (query + "%",) * reference_query.count("%s")
+
+                        async def reference():
+                            await cur.execute(reference_query, params)
+                            return await cur.fetchall()
+
+                        matches = len(await reference())
+                        baseline = await measure_async(reference, repeat=3)
+                        report(f"{query} unbounded ({matches} matches)", baseline)
+                        search = getattr(db, method)
+                        report(f"{query} {method}",
+                               await measure_async(lambda: search(query, db.search_limit + 1)), baseline)
+                        if len(query) >= min_length:
+                            report(f"{query} search", await measure_async(lambda: db.search(query)), baseline)
+    finally:
+        if not args.keep:
+            async with db.pool.connection() as conn:
+                await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(args.scratch_schema)))
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+# Prover speed and incentive statistics over a synthetic history of millions of solutions: the solution_minute
+# buckets against the solution scans they replaced.
+# The history is generated in a scratch schema of the database configured in .env, next to DB_SCHEMA whose tables it
+# copies, and dropped afterwards. It ends at the current time, as get_address_speed looks back from now.
+# Results differ slightly at the interval edges, the buckets only count whole minutes.
+# python -m benchmarks.solution_stats [--solutions N] [--provers N] [--scratch-schema NAME] [--keep]
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any
+
+from psycopg import sql
+
+from benchmarks.common import connect_database, measure_async, report
+
+tables = ("block", "puzzle_solution", "solution", "solution_minute")
+speed_intervals = [900, 1800, 3600, 14400, 43200, 86400]
+
+
+async def reference_address_speed(cur: Any, address: str, now: int) -> tuple[float, int]:
+    # get_address_speed as it was before the buckets
+    for interval in speed_intervals:
+        await cur.execute(
+            "SELECT b.height FROM solution s "
+            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+            "JOIN block b ON ps.block_id = b.id "
+            "WHERE address = %s AND timestamp > %s",
+            (address, now - interval)
+        )
+        heights = [row["height"] for row in await cur.fetchall()]
+        if len(heights) < 10:
+            continue
+        await cur.execute(
+            "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", ([h - 1 for h in set(heights)],)
+        )
+        proof_targets = {row["height"]: row["proof_target"] for row in await cur.fetchall()}
+        return sum(proof_targets[h - 1] for h in heights) / interval, interval
+    return 0, 0
+
+
+async def reference_incentive_addresses(cur: Any, start: int, end: int, limit: int) -> list[dict[str, Any]]:
+    await cur.execute(
+        "SELECT s.address, sum(s.reward) as reward FROM solution s "
+        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+        "JOIN block b ON ps.block_id = b.id "
+        "WHERE b.timestamp > %s AND b.timestamp < %s "
+        "GROUP BY s.address "
+        "ORDER BY reward DESC "
+        "LIMIT %s",
+        (start, end, limit)
+    )
+    return await cur.fetchall()
+
+
+async def reference_incentive_total(cur: Any, start: int, end: int) -> Any:
+    await cur.execute(
+        "SELECT sum(reward) FROM solution s "
+        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+        "JOIN block b ON ps.block_id = b.id "
+        "WHERE b.timestamp > %s AND b.timestamp < %s",
+        (start, end)
+    )
+    return (await cur.fetchone())["sum"]
+
+
+async def generate_history(conn: Any, schema: str, scratch: str, solutions: int, provers: int, per_block: int,
+                           block_time: int, now: int):
+    blocks = solutions // per_block
+    start = now - blocks * block_time
+    await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(scratch)))
+    await conn.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(scratch)))
+    for table in tables:
+        await conn.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING ALL)").format(
+            sql.Identifier(scratch, table), sql.Identifier(schema, table)
+        ))
+    # ids are given explicitly, the copied defaults would draw from the sequences of the real tables
+    await conn.execute(
+        "INSERT INTO block (id, height, block_hash, previous_hash, previous_state_root, transactions_root, "
+        "finalize_root, ratifications_root, solutions_root, subdag_root, round, cumulative_weight, "
+        "cumulative_proof_target, coinbase_target, proof_target, last_coinbase_target, last_coinbase_timestamp, "
+        "timestamp, block_reward, coinbase_reward, total_supply, confirm_timestamp, partial_solution_count) "
+        "SELECT h, h, 'ab' || h, 'ab' || (h - 1), '', '', '', '', '', '', h, 0, 0, 0, "
+        "(1000000 + random() * 1000000)::bigint, 0, 0, %(start)s + h * %(block_time)s, 0, 0, 0, "
+        "%(start)s + h * %(block_time)s, %(per_block)s "
+        "FROM generate_series(0, %(blocks)s - 1) h",
+        {"start": start, "block_time": block_time, "per_block": per_block, "blocks": blocks}
+    )
+    await conn.execute(
+        "INSERT INTO puzzle_solution (id, block_id, target_sum) SELECT h, h, 0 FROM generate_series(0, %s - 1) h",
+        (blocks,)
+    )
+    # a few provers find most of the solutions
+    await conn.execute(
+        "INSERT INTO solution (id, puzzle_solution_id, address, counter, target, reward, epoch_hash, solution_id) "
+        "SELECT i, i / %(per_block)s, 'aleo1prover' || floor(%(provers)s * power(random(), 3))::int, i, "
+        "(random() * 10000000)::bigint, (random() * 1000000)::int, '', 'solution' || i "
+        "FROM generate_series(0, %(solutions)s - 1) i",
+        {"per_block": per_block, "provers": provers, "solutions": blocks * per_block}
+    )
+    for table in tables:
+        await conn.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solutions", type=int, default=5_000_000)
+    parser.add_argument("--provers", type=int, default=10_000)
+    parser.add_argument("--per-block", type=int, default=20, help="solutions per block")
+    parser.add_argument("--block-time", type=int, default=4, help="seconds between blocks")
+    parser.add_argument("--scratch-schema", default="solution_stats_benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = parser.parse_args()
+
+    import explorer # type: ignore
+    from db.address import DatabaseAddress
+
+    db = connect_database(args.scratch_schema)
+    await db.connect()
+    now = int(time.time())
+    try:
+        async with db.pool.connection() as conn:
+            started = time.perf_counter()
+            await generate_history(conn, os.environ["DB_SCHEMA"], args.scratch_schema, args.solutions, args.provers,
+                                   args.per_block, args.block_time, now)
+            print(f"generated {args.solutions} solutions in {time.perf_counter() - started:.1f} s")
+            async with conn.cursor() as cur:
+                started = time.perf_counter()
+                await DatabaseAddress._rebuild_solution_minute(cur, 0)
+                print(f"built solution_minute in {time.perf_counter() - started:.1f} s")
+                await cur.execute("ANALYZE solution_minute")
+                await cur.execute(
+                    "SELECT address, count(*) FROM solution GROUP BY address ORDER BY count(*) DESC"
+                )
+                by_count = [row["address"] for row in await cur.fetchall()]
+                await cur.execute("SELECT min(minute), max(minute) FROM solution_minute")
+                res = await cur.fetchone()
+                # the middle half of the history stands in for the incentive period
+                quarter = (res["max"] - res["min"]) // 4
+                db.incentive_period = ((res["min"] + quarter) * 60 + 30, (res["max"] - quarter) * 60 + 30)
+
+                for label, address in (("busiest prover", by_count[0]), ("median prover", by_count[len(by_count) // 2]),
+                                       ("quietest prover", by_count[-1])):
+                    baseline = await measure_async(lambda: reference_address_speed(cur, address, now))
+                    report(f"get_address_speed {label} solution scan", baseline)
+                    report(f"get_address_speed {label} buckets",
+                           await measure_async(lambda: db.get_address_speed(address)), baseline)
+
+                start, end = db.incentive_period
+                baseline = await measure_async(lambda: reference_incentive_addresses(cur, start, end, 50))
+                report("get_incentive_addresses solution scan", baseline)
+                report("get_incentive_addresses buckets",
+                       await measure_async(lambda: db.get_incentive_addresses(0, 50)), baseline)
+                baseline = await measure_async(lambda: reference_incentive_total(cur, start, end))
+                report("get_incentive_total_reward solution scan", baseline)
+                report("get_incentive_total_reward buckets",
+                       await measure_async(lambda: db.get_incentive_total_reward()), baseline)
+    finally:
+        if not args.keep:
+            async with db.pool.connection() as conn:
+                await conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(args.scratch_schema)))
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+# Vec/Tuple loading with the loaders precomputed per specialization against the per call type lookups they replaced,
+# over a large synthetic Vec and whole blocks.
+# python -m benchmarks.vec_load [--db] [--blocks N] [--items N]
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Any, Callable
+
+from aleo_types import Block, FixedSize, Tuple, Vec, u32, u64, u128
+from benchmarks.common import add_db_argument, connect_database, genesis_blocks, largest_blocks, measure, report
+
+
+# Vec.__init__, Vec.load and Tuple.load as they were before the loaders were precomputed
+
+def reference_vec_init(self: Any, value: list[Any]):
+    list.__init__(self, value)
+    self._type = self.types[0]
+    if isinstance(self.types[1], FixedSize):
+        self._size = self.types[1]
+    else:
+        self._size_type = self.types[1]
+        self._size = self._size_type(len(value))
+
+
+def reference_vec_load(cls: Any, data: BytesIO) -> Any:
+    value_type, size_type = cls.types
+    if isinstance(size_type, FixedSize):
+        size = size_type
+    else:
+        size = size_type.load(data)
+    return cls(list(value_type.load(data) for _ in range(size)))
+
+
+def reference_tuple_load(cls: Any, data: BytesIO) -> Any:
+    value: list[Any] = []
+    for t in cls.types:
+        value.append(t.load(data))
+    return cls(tuple(value))
+
+
+@contextmanager
+def reference_loaders():
+    saved = Vec.__dict__["__init__"], Vec.__dict__["load"], Tuple.__dict__["load"]
+    Vec.__init__ = reference_vec_init # type: ignore
+    Vec.load = classmethod(reference_vec_load) # type: ignore
+    Tuple.load = classmethod(reference_tuple_load) # type: ignore
+    try:
+        yield
+    finally:
+        Vec.__init__, Vec.load, Tuple.load = saved # type: ignore
+
+
+def compare(name: str, load: Callable[[], Any], data: bytes):
+    if load().dump() != data:
+        raise AssertionError(f"{name}: does not round trip")
+    with reference_loaders():
+        if load().dump() != data:
+            raise AssertionError(f"{name}: reference loaders do not round trip")
+        baseline = measure(load)
+    report(f"{name} reference", baseline)
+    report(f"{name} precomputed", measure(load), baseline)
+
+
+def run(blocks: list[tuple[str, Block]], items: int):
+    pairs = Vec[Tuple[u64, u128], u32]
+    data = pairs([Tuple[u64, u128]((u64(i), u128(i * i))) for i in range(items)]).dump()
+    compare(f"Vec[Tuple[u64, u128], u32] of {items}", lambda: pairs.load(BytesIO(data)), data)
+    for label, block in blocks:
+        data = block.dump()
+        compare(f"{label} Block.load ({len(data)} bytes)", lambda: Block.load(BytesIO(data)), data)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    add_db_argument(parser)
+    parser.add_argument("--items", type=int, default=100000, help="number of items in the synthetic Vec")
+    args = parser.parse_args()
+    if args.db:
+        db = connect_database()
+        await db.connect()
+        blocks = await largest_blocks(db, args.blocks)
+    else:
+        blocks = genesis_blocks()
+    run(blocks, args.items)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
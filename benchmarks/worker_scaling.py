@@ -0,0 +1,101 @@
+# Throughput of the webapi read endpoints against the number of UvicornServer workers, to show how close to linear
+# it scales. The clients run in separate processes, each keeping --connections requests in flight over the given paths
+# in turn, so the load generator isn't the bottleneck. Scaling only shows with enough cores for the workers, the client
+# processes and the database.
+# The webapi runs on the database configured in .env.
+# python -m benchmarks.worker_scaling [--workers N,N] [--paths P,P] [--client-processes N] [--connections N] [--seconds S]
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+import aiohttp
+
+from benchmarks.common import start_webapi, wait_for_server, webapi_headers
+
+
+async def load(base: str, paths: list[str], connections: int, seconds: float) -> int:
+    completed = 0
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0), headers=webapi_headers())
+
+    async def client(offset: int):
+        nonlocal completed
+        i = offset
+        while time.monotonic() < deadline:
+            url = base + paths[i % len(paths)]
+            async with session.get(url) as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"{url} returned {response.status}")
+            completed += 1
+            i += 1
+
+    deadline = time.monotonic() + seconds
+    try:
+        await asyncio.gather(*(client(i) for i in range(connections)))
+    finally:
+        await session.close()
+    return completed
+
+
+def client_process(base: str, paths: list[str], connections: int, seconds: float, results: "multiprocessing.Queue[int]"):
+    results.put(asyncio.run(load(base, paths, connections, seconds)))
+
+
+def run_clients(base: str, paths: list[str], processes: int, connections: int, seconds: float) -> float:
+    results: multiprocessing.Queue[int] = multiprocessing.Queue()
+    clients = [multiprocessing.Process(target=client_process, args=(base, paths, connections, seconds, results))
+               for _ in range(processes)]
+    started = time.monotonic()
+    for process in clients:
+        process.start()
+    completed = sum(results.get() for _ in clients)
+    elapsed = time.monotonic() - started
+    for process in clients:
+        process.join()
+    return completed / elapsed
+
+
+async def wait_for_webapi(base: str):
+    async with aiohttp.ClientSession(headers=webapi_headers()) as session:
+        await wait_for_server(session, f"{base}/")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 2, 4],
+                        help="comma separated worker counts")
+    parser.add_argument("--paths", type=lambda s: s.split(","), default=["/block/recent", "/summary", "/blocks?p=1"],
+                        help="comma separated webapi paths")
+    parser.add_argument("--client-processes", type=int, default=4)
+    parser.add_argument("--connections", type=int, default=32, help="requests in flight per client process")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each measurement")
+    parser.add_argument("--port", type=int, default=8103)
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0))
+    if cores < max(args.workers) + args.client_processes:
+        print(f"only {cores} cores for up to {max(args.workers)} workers and {args.client_processes} client processes, "
+              f"throughput can't scale past the cores")
+    base = f"http://127.0.0.1:{args.port}"
+    baseline = 0.0
+    for workers in args.workers:
+        server = start_webapi(args.port, workers)
+        try:
+            asyncio.run(wait_for_webapi(base))
+            # fills the height caches and the connection pools of every worker
+            run_clients(base, args.paths, args.client_processes, args.connections, 2)
+            rate = run_clients(base, args.paths, args.client_processes, args.connections, args.seconds)
+        finally:
+            server.stop()
+            server.join()
+        if not baseline:
+            baseline = rate / workers
+        print(f"{workers:3d} workers {rate:10.1f} requests/s  ({rate / baseline:.2f}x, "
+              f"{rate / baseline / workers:.0%} of linear)")
+
+
+if __name__ == "__main__":
+    main()
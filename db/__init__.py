@@ -1 +1,13 @@
-from .main import Database
\ No newline at end of file
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .main import Database
+
+
+def __getattr__(name: str) -> Any:
+    # Database is only imported on first use: the db modules import explorer.types and the explorer package imports db,
+    # so the package itself has to be importable on its own for `python -m db.block_store`
+    if name == "Database":
+        from .main import Database
+        return Database
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,61 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 
+import psycopg
+from psycopg.rows import DictRow
+
 from aleo_types import *
+from aleo_types.cached import cached_get_key_id
 from explorer.types import Message as ExplorerMessage
 from .base import DatabaseBase
 
 
 class DatabaseAddress(DatabaseBase):
 
+    # incentive program period, 2024-07-01 to 2024-07-15 UTC, both ends exclusive
+    incentive_period = (1719849600, 1721059200)
+
+    def _incentive_solutions(self) -> tuple[str, tuple[int, ...]]:
+        # whole minutes come from solution_minute, the partial minutes at either end of the period
+        # (a block at exactly the start timestamp doesn't count) are read from the solutions themselves
+        start, end = self.incentive_period
+        first_minute, end_minute = start // 60 + 1, end // 60
+        return (
+            "(SELECT address, reward FROM solution_minute WHERE minute >= %s AND minute < %s "
+            "UNION ALL "
+            "SELECT s.address, s.reward FROM solution s "
+            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+            "JOIN block b ON ps.block_id = b.id "
+            "WHERE b.timestamp > %s AND b.timestamp < %s "
+            "UNION ALL "
+            "SELECT s.address, s.reward FROM solution s "
+            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+            "JOIN block b ON ps.block_id = b.id "
+            "WHERE b.timestamp >= %s AND b.timestamp < %s) i",
+            (first_minute, end_minute, start, min(first_minute * 60, end),
+             max(end_minute * 60, first_minute * 60), end)
+        )
+
+    # solution_minute holds per prover, per minute solution count / target / reward sums,
+    # proof_target_sum weights every solution with the proof target of the block before it
+    @staticmethod
+    async def _rebuild_solution_minute(cur: psycopg.AsyncCursor[DictRow], since_minute: int):
+        await cur.execute("DELETE FROM solution_minute WHERE minute >= %s", (since_minute,))
+        await cur.execute(
+            "INSERT INTO solution_minute (address, minute, solution_count, target_sum, proof_target_sum, reward) "
+            "SELECT s.address, b.timestamp / 60, count(*), sum(s.target), sum(coalesce(pb.proof_target, 0)), sum(s.reward) "
+            "FROM solution s "
+            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+            "JOIN block b ON ps.block_id = b.id "
+            "LEFT JOIN block pb ON pb.height = b.height - 1 "
+            "WHERE b.timestamp >= %s "
+            "GROUP BY s.address, b.timestamp / 60",
+            (since_minute * 60,)
+        )
+
     async def get_puzzle_reward_by_address(self, address: str) -> int:
         data = await self.redis.hget("address_puzzle_reward", address)
         if data is None:
@@ -101,6 +147,8 @@ WITH ats AS
      ORDER BY transition_id DESC
      LIMIT 30)
 SELECT DISTINCT ts.transition_id,
+                ts.program_id,
+                ts.function_name,
                 b.height,
                 b.timestamp
 FROM ats
@@ -111,6 +159,8 @@ JOIN confirmed_transaction ct ON ct.id = tx.confirmed_transaction_id
 JOIN block b ON b.id = ct.block_id
 UNION
 SELECT DISTINCT ts.transition_id,
+                ts.program_id,
+                ts.function_name,
                 b.height,
                 b.timestamp
 FROM ats
@@ -127,6 +177,8 @@ LIMIT 30
                     def transform(x: dict[str, Any]):
                         return {
                             "transition_id": x["transition_id"],
+                            "program_id": x["program_id"],
+                            "function_name": x["function_name"],
                             "height": x["height"],
                             "timestamp": x["timestamp"]
                         }
@@ -135,6 +187,109 @@ LIMIT 30
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def _get_address_solution_profile(self, address: str) -> dict[str, Any]:
+        solutions = await self.get_recent_solutions_by_address(address)
+        if not solutions:
+            return {"solutions": solutions, "solution_count": 0, "speed": 0, "interval": 0}
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute("SELECT sum(solution_count) FROM solution_minute WHERE address = %s", (address,))
+                    res = await cur.fetchone()
+                    solution_count = 0 if res is None or res["sum"] is None else int(res["sum"])
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+        speed, interval = await self.get_address_speed(address)
+        return {"solutions": solutions, "solution_count": solution_count, "speed": speed, "interval": interval}
+
+    async def _get_address_program_profile(self, address: str) -> dict[str, Any]:
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT p.program_id, b.height, b.timestamp, t.transaction_id FROM program p "
+                        "LEFT JOIN transaction_deploy td ON td.id = p.transaction_deploy_id "
+                        "LEFT JOIN transaction t ON t.id = td.transaction_id "
+                        "LEFT JOIN confirmed_transaction ct ON ct.id = t.confirmed_transaction_id "
+                        "LEFT JOIN block b ON b.id = ct.block_id "
+                        "WHERE p.owner = %s ORDER BY p.id DESC LIMIT 30",
+                        (address,)
+                    )
+                    programs = await cur.fetchall()
+                    await cur.execute(
+                        "SELECT (SELECT COUNT(*) FROM program WHERE owner = %s) AS count, "
+                        "(SELECT program_id FROM program WHERE address = %s LIMIT 1) AS program_name",
+                        (address, address)
+                    )
+                    if (res := await cur.fetchone()) is None:
+                        raise RuntimeError("failed to count programs")
+                    return {"programs": programs, "program_count": res["count"], "program_name": res["program_name"]}
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
+    async def _get_address_state_profile(self, address: str) -> dict[str, Any]:
+        address_key_bytes = LiteralPlaintext(
+            literal=Literal(
+                type_=Literal.Type.Address,
+                primitive=Address.loads(address),
+            )
+        ).dump()
+        key_ids = {
+            mapping: cached_get_key_id("credits.aleo", mapping, address_key_bytes)
+            for mapping in ["account", "bonded", "unbonding", "committee", "delegated", "withdraw"]
+        }
+        # committee, bonded and delegated live in redis, see get_mapping_value
+        redis_mappings = ["committee", "bonded", "delegated"]
+        stats = ["address_stake_reward", "address_transfer_in", "address_transfer_out", "address_fee", "address_puzzle_reward"]
+        pipe = self.redis.pipeline(transaction=False)
+        for mapping in redis_mappings:
+            pipe.hget(f"credits.aleo:{mapping}", key_ids[mapping])
+        for stat in stats:
+            pipe.hget(stat, address)
+        redis_results: list[Optional[str]] = await pipe.execute() # type: ignore
+        result: dict[str, Any] = {}
+        for mapping, data in zip(redis_mappings, redis_results):
+            result[mapping] = None if data is None else bytes.fromhex(json.loads(data)["value"])
+        for stat, data in zip(stats, redis_results[len(redis_mappings):]):
+            result[stat] = None if data is None else int(data)
+
+        db_mappings = {key_ids[m]: m for m in ["account", "unbonding", "withdraw"]}
+        for mapping in db_mappings.values():
+            result[mapping] = None
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT m.mapping, mv.key_id, mv.value FROM mapping_value mv "
+                        "JOIN mapping m on mv.mapping_id = m.id "
+                        "WHERE m.program_id = 'credits.aleo' AND m.mapping = ANY(%s) AND mv.key_id = ANY(%s)",
+                        (list(db_mappings.values()), list(db_mappings.keys()))
+                    )
+                    for res in await cur.fetchall():
+                        if db_mappings.get(res["key_id"]) == res["mapping"]:
+                            result[res["mapping"]] = res["value"]
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+        return result
+
+    async def get_address_profile(self, address: str) -> dict[str, Any]:
+        # the parts are independent, so they run concurrently on at most one pool connection each
+        solution_profile, program_profile, transitions, state_profile = await asyncio.gather(
+            self._get_address_solution_profile(address),
+            self._get_address_program_profile(address),
+            self.get_address_recent_transitions(address),
+            self._get_address_state_profile(address),
+        )
+        return {
+            **solution_profile,
+            **program_profile,
+            **state_profile,
+            "transitions": transitions,
+        }
+
     async def get_address_stake_reward(self, address: str) -> Optional[int]:
         data = await self.redis.hget("address_stake_reward", address)
         if data is None:
@@ -165,28 +320,19 @@ LIMIT 30
                 interval_list = [900, 1800, 3600, 14400, 43200, 86400]
                 now = int(time.time())
                 try:
+                    # only whole minutes inside the interval are counted
+                    await cur.execute(
+                        "SELECT minute, solution_count, proof_target_sum FROM solution_minute "
+                        "WHERE address = %s AND minute > %s",
+                        (address, (now - interval_list[-1]) // 60)
+                    )
+                    buckets = await cur.fetchall()
                     for interval in interval_list:
-                        await cur.execute(
-                            "SELECT b.height FROM solution s "
-                            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                            "JOIN block b ON ps.block_id = b.id "
-                            "WHERE address = %s AND timestamp > %s",
-                            (address, now - interval)
-                        )
-                        partial_solutions = await cur.fetchall()
-                        if len(partial_solutions) < 10:
+                        since = (now - interval) // 60
+                        in_interval = [b for b in buckets if b["minute"] > since]
+                        if sum(b["solution_count"] for b in in_interval) < 10:
                             continue
-                        heights = list(map(lambda x: x['height'], partial_solutions))
-                        ref_heights = list(map(lambda x: x - 1, set(heights)))
-                        await cur.execute(
-                            "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                        )
-                        ref_proof_targets = await cur.fetchall()
-                        ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                        total_solutions = 0
-                        for height in heights:
-                            total_solutions += ref_proof_target_dict[height - 1]
-                        return total_solutions / interval, interval
+                        return sum(b["proof_target_sum"] for b in in_interval) / interval, interval
                     return 0, 0
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
@@ -195,28 +341,11 @@ LIMIT 30
     async def get_network_speed(self) -> float:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
-                interval = 900
                 try:
-                    await cur.execute(
-                        "WITH last AS (SELECT timestamp FROM block ORDER BY height DESC LIMIT 1) "
-                        "SELECT b.height FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE timestamp > (SELECT timestamp FROM last) - %s",
-                        (interval,)
-                    )
-                    partial_solutions = await cur.fetchall()
-                    heights = list(map(lambda x: x['height'], partial_solutions))
-                    ref_heights = list(map(lambda x: x - 1, set(heights)))
-                    await cur.execute(
-                        "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                    )
-                    ref_proof_targets = await cur.fetchall()
-                    ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                    total_solutions = 0
-                    for height in heights:
-                        total_solutions += ref_proof_target_dict[height - 1]
-                    return total_solutions / interval
+                    await cur.execute("SELECT network_speed FROM network_summary ORDER BY height DESC LIMIT 1")
+                    if (res := await cur.fetchone()) is None:
+                        return 0
+                    return res["network_speed"]
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -225,10 +354,10 @@ LIMIT 30
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT COUNT(*) FROM solution")
+                    await cur.execute("SELECT total_solution_count FROM network_summary ORDER BY height DESC LIMIT 1")
                     if (res := await cur.fetchone()) is None:
                         return 0
-                    return res["count"]
+                    return res["total_solution_count"]
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -238,13 +367,13 @@ LIMIT 30
             async with conn.cursor() as cur:
                 try:
                     await cur.execute(
-                        "SELECT AVG(reward) FROM solution"
+                        "SELECT total_solution_count, total_solution_reward FROM network_summary ORDER BY height DESC LIMIT 1"
                     )
                     if (res := await cur.fetchone()) is None:
                         return 0
-                    if res["avg"] is None:
+                    if res["total_solution_count"] == 0:
                         return 0
-                    return res["avg"]
+                    return res["total_solution_reward"] / res["total_solution_count"]
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -253,12 +382,8 @@ LIMIT 30
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute(
-                        "SELECT COUNT(DISTINCT address) FROM solution "
-                        "JOIN puzzle_solution ps ON solution.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE b.timestamp > 1719849600 AND b.timestamp < 1721059200"
-                    )
+                    source, params = self._incentive_solutions()
+                    await cur.execute("SELECT COUNT(DISTINCT address) FROM " + source, params)
                     if (res := await cur.fetchone()) is None:
                         return 0
                     return res["count"]
@@ -270,15 +395,13 @@ LIMIT 30
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
+                    source, params = self._incentive_solutions()
                     await cur.execute(
-                        "SELECT s.address, sum(s.reward) as reward FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE b.timestamp > 1719849600 AND b.timestamp < 1721059200 "
-                        "GROUP BY s.address "
+                        "SELECT address, sum(reward) as reward FROM " + source + " "
+                        "GROUP BY address "
                         "ORDER BY reward DESC "
                         "LIMIT %s OFFSET %s",
-                        (end - start, start)
+                        (*params, end - start, start)
                     )
                     return await cur.fetchall()
                 except Exception as e:
@@ -289,12 +412,8 @@ LIMIT 30
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute(
-                        "SELECT sum(reward) FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE b.timestamp > 1719849600 AND b.timestamp < 1721059200"
-                    )
+                    source, params = self._incentive_solutions()
+                    await cur.execute("SELECT sum(reward) FROM " + source, params)
                     if (res := await cur.fetchone()) is None:
                         return Decimal(0)
                     return res["sum"]
@@ -333,6 +452,26 @@ LIMIT 30
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def get_address_labels(self, addresses: list[str]) -> dict[str, tuple[Optional[str], Optional[str], Optional[str]]]:
+        # (tag, validator website, validator logo) of every address that has any of them
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT a.address, t.tag, v.website, v.logo FROM unnest(%s::text[]) a(address) "
+                        "LEFT JOIN address_tag t ON t.address = a.address "
+                        "LEFT JOIN validator_info v ON v.address = a.address "
+                        "WHERE t.tag IS NOT NULL OR v.id IS NOT NULL",
+                        (addresses,)
+                    )
+                    labels: dict[str, tuple[Optional[str], Optional[str], Optional[str]]] = {}
+                    for res in await cur.fetchall():
+                        labels.setdefault(res["address"], (res["tag"], res["website"], res["logo"]))
+                    return labels
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
     async def get_address_program_id(self, address: str) -> Optional[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 from asyncio import iscoroutinefunction
 from typing import Awaitable, ParamSpec
 
@@ -11,6 +13,8 @@ from redis.asyncio import Redis
 
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
+from util.cache import Cache
+from .block_store import BlockStore
 
 try:
     from line_profiler import profile
@@ -30,9 +34,18 @@ except ImportError:
 
 class DatabaseBase:
 
+    # upper bound on how long a cached latest block is served without hearing from the explorer process
+    latest_block_max_age = 10
+    # parsed programs kept per process, see DatabaseProgram.get_parsed_program
+    program_cache_size = 1000
+    # parsed programs shared by the processes through redis, pickled under program_cache_key:<program id>
+    program_cache_key = "program_cache"
+    program_cache_epoch_key = "program_cache_epoch"
+    shared_program_cache_ttl = 3600
+
     def __init__(self, *, server: str, user: str, password: str, database: str, schema: str, redis_server: str,
                  redis_port: int, redis_db: int, redis_user: Optional[str], redis_password: Optional[str],
-                 message_callback: Callable[[ExplorerMessage], Awaitable[None]]):
+                 message_callback: Callable[[ExplorerMessage], Awaitable[None]], block_store_path: Optional[str] = None):
         self.server = server
         self.user = user
         self.password = password
@@ -44,6 +57,20 @@ class DatabaseBase:
         self.redis_db = redis_db
         self.redis_user = redis_user
         self.redis_password = redis_password
+        self.block_store = BlockStore(block_store_path) if block_store_path else None
+
+        # latest block row, dropped on every notification from the explorer process
+        self._latest_block: Optional[dict[str, Any]] = None
+        self._latest_block_time = 0.0
+        self._latest_block_generation = 0
+        self._latest_block_listening = False
+        self._latest_block_listener: Optional[asyncio.Task[None]] = None
+        # set and replaced on every notification, see wait_for_new_block
+        self._new_block_event = asyncio.Event()
+        # programs only change when blocks are reverted, which moves the announced height back
+        self._program_cache: Cache[str, Program] = Cache(max_size=self.program_cache_size)
+        self._program_cache_height = -1
+        self._program_cache_generation = 0
 
         self.pool: AsyncConnectionPool[AsyncConnection[DictRow]]
         self.redis: Redis[str]
@@ -67,3 +94,87 @@ class DatabaseBase:
             return
         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseConnected, None))
 
+
+    # pub/sub channels are shared by all redis databases
+    @property
+    def latest_block_channel(self) -> str:
+        return f"{self.redis_db}:latest_block"
+
+    def _invalidate_latest_block(self):
+        self._latest_block = None
+        self._latest_block_generation += 1
+
+    def _drop_program_cache(self):
+        self._program_cache = Cache(max_size=self.program_cache_size)
+        self._program_cache_generation += 1
+
+    def _check_program_cache(self, height: int) -> bool:
+        # the first height after subscribing can't be compared, so it drops the cache as well
+        dropped = self._program_cache_height == -1 or height < self._program_cache_height
+        if dropped:
+            self._drop_program_cache()
+        self._program_cache_height = height
+        return dropped
+
+    def _notify_new_block(self):
+        self._new_block_event.set()
+        self._new_block_event = asyncio.Event()
+
+    async def _publish_latest_block(self, height: int):
+        self._invalidate_latest_block()
+        dropped = self._check_program_cache(height)
+        try:
+            if dropped:
+                # every process ignores the shared programs written before, see DatabaseProgram.get_parsed_program
+                await self.redis.incr(self.program_cache_epoch_key)
+            await self.redis.publish(self.latest_block_channel, height)
+        except Exception as e:
+            # readers still expire their copy after latest_block_max_age
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+
+    async def _listen_latest_block(self):
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.latest_block_channel)
+                    self._latest_block_listening = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._invalidate_latest_block()
+                            self._check_program_cache(int(message["data"]))
+                            self._notify_new_block()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+            finally:
+                # notifications could be missed while not subscribed
+                self._latest_block_listening = False
+                self._invalidate_latest_block()
+                self._drop_program_cache()
+                self._program_cache_height = -1
+            await asyncio.sleep(1)
+
+    def _start_latest_block_listener(self):
+        if self._latest_block_listener is None:
+            self._latest_block_listener = asyncio.create_task(self._listen_latest_block())
+
+    async def wait_for_new_block(self):
+        # returns after the explorer process announces the next block (or a revert)
+        self._start_latest_block_listener()
+        await self._new_block_event.wait()
+
+    def _get_cached_latest_block(self) -> Optional[dict[str, Any]]:
+        self._start_latest_block_listener()
+        if not self._latest_block_listening:
+            return None
+        if time.monotonic() - self._latest_block_time > self.latest_block_max_age:
+            return None
+        return self._latest_block
+
+    def _set_cached_latest_block(self, block: dict[str, Any], generation: int):
+        # a notification arrived while the row was being fetched, it could already be outdated
+        if generation != self._latest_block_generation:
+            return
+        self._latest_block = block
+        self._latest_block_time = time.monotonic()
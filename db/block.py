@@ -10,6 +10,10 @@ from aleo_types import *
 from explorer.types import Message as ExplorerMessage
 from node import Network
 from .base import DatabaseBase, profile
+from .block_store import BlockStore
+
+# deployments can carry many keys, resolve the specialization once instead of per row
+VerifyingKeys = Vec[Tuple[Identifier, VerifyingKey, Certificate], u16]
 
 
 class DatabaseBlock(DatabaseBase):
@@ -39,51 +43,151 @@ class DatabaseBlock(DatabaseBase):
 
     @staticmethod
     @profile
-    async def _load_future(conn: psycopg.AsyncConnection[DictRow], transition_output_db_id: Optional[int],
-                           future_argument_db_id: Optional[int]) -> Optional[Future]:
+    async def _load_futures(conn: psycopg.AsyncConnection[DictRow], transition_output_future_ids: list[int]) -> dict[int, Optional[Future]]:
+        # loads every future (including nested argument futures) of the given outputs with two queries
+        if not transition_output_future_ids:
+            return {}
         async with conn.cursor() as cur:
-            if transition_output_db_id:
-                await cur.execute(
-                    "SELECT id, program_id, function_name FROM future WHERE type = 'Output' AND "
-                    "transition_output_future_id = %s",
-                    (transition_output_db_id,)
-                )
-            elif future_argument_db_id:
-                await cur.execute(
-                    "SELECT id, program_id, function_name FROM future WHERE type = 'Argument' AND "
-                    "future_argument_id = %s",
-                    (future_argument_db_id,)
-                )
-            else:
-                raise ValueError("transition_output_db_id or future_argument_db_id must be set")
-            if (res := await cur.fetchone()) is None:
-                if transition_output_db_id:
-                    return None
-                raise RuntimeError("failed to insert row into database")
-            future_db_id = res["id"]
-            program_id = res["program_id"]
-            function_name = res["function_name"]
             await cur.execute(
-                "SELECT id, type, plaintext FROM future_argument WHERE future_id = %s ORDER BY id",
-                (future_db_id,)
+                "WITH RECURSIVE f AS ("
+                "SELECT id, type, transition_output_future_id, future_argument_id, program_id, function_name "
+                "FROM future WHERE type = 'Output' AND transition_output_future_id = ANY(%s) "
+                "UNION ALL "
+                "SELECT fu.id, fu.type, fu.transition_output_future_id, fu.future_argument_id, fu.program_id, fu.function_name "
+                "FROM f "
+                "JOIN future_argument fa ON fa.future_id = f.id "
+                "JOIN future fu ON fu.type = 'Argument' AND fu.future_argument_id = fa.id"
+                ") SELECT * FROM f",
+                (transition_output_future_ids,)
             )
-            arguments: list[Argument] = []
-            for res in await cur.fetchall():
-                if res["type"] == "Plaintext":
-                    arguments.append(PlaintextArgument(
-                        plaintext=Plaintext.load(BytesIO(res["plaintext"]))
-                    ))
-                elif res["type"] == "Future":
-                    arguments.append(FutureArgument(
-                        future=await DatabaseBlock._load_future(conn, None, res["id"]) # type: ignore
+            futures = await cur.fetchall()
+            arguments: dict[int, list[dict[str, Any]]] = defaultdict(list)
+            if futures:
+                await cur.execute(
+                    "SELECT id, future_id, type, plaintext FROM future_argument WHERE future_id = ANY(%s) ORDER BY id",
+                    ([future["id"] for future in futures],)
+                )
+                for argument in await cur.fetchall():
+                    arguments[argument["future_id"]].append(argument)
+
+        argument_futures = {f["future_argument_id"]: f for f in futures if f["type"] == "Argument"}
+
+        def build(future: dict[str, Any]) -> Future:
+            args: list[Argument] = []
+            for argument in arguments[future["id"]]:
+                if argument["type"] == "Plaintext":
+                    args.append(PlaintextArgument(
+                        plaintext=Plaintext.load(BytesIO(argument["plaintext"]))
                     ))
+                elif argument["type"] == "Future":
+                    nested_future = argument_futures.get(argument["id"])
+                    if nested_future is None:
+                        raise RuntimeError("database inconsistent")
+                    args.append(FutureArgument(future=build(nested_future)))
                 else:
                     raise NotImplementedError
             return Future(
-                program_id=ProgramID.loads(program_id),
-                function_name=Identifier.loads(function_name),
-                arguments=Vec[Argument, u8](arguments)
+                program_id=ProgramID.loads(future["program_id"]),
+                function_name=Identifier.loads(future["function_name"]),
+                arguments=Vec[Argument, u8](args)
+            )
+
+        output_futures = {f["transition_output_future_id"]: f for f in futures if f["type"] == "Output"}
+        res: dict[int, Optional[Future]] = {}
+        for transition_output_future_id in transition_output_future_ids:
+            future = output_futures.get(transition_output_future_id)
+            res[transition_output_future_id] = None if future is None else build(future)
+        return res
+
+    @staticmethod
+    def _get_transition_input_from_dict(transition_input: dict[str, Any]) -> TransitionInput:
+        if transition_input["type"] == TransitionInput.Type.Public.name:
+            if transition_input["plaintext"] is None:
+                plaintext = None
+            else:
+                plaintext = Plaintext.load(BytesIO(transition_input["plaintext"]))
+            return PublicTransitionInput(
+                plaintext_hash=Field.loads(transition_input["plaintext_hash"]),
+                plaintext=Option[Plaintext](plaintext)
             )
+        elif transition_input["type"] == TransitionInput.Type.Private.name:
+            if transition_input["ciphertext"] is None:
+                ciphertext = None
+            else:
+                ciphertext = Ciphertext.loads(transition_input["ciphertext"])
+            return PrivateTransitionInput(
+                ciphertext_hash=Field.loads(transition_input["ciphertext_hash"]),
+                ciphertext=Option[Ciphertext](ciphertext)
+            )
+        elif transition_input["type"] == TransitionInput.Type.Record.name:
+            return RecordTransitionInput(
+                serial_number=Field.loads(transition_input["serial_number"]),
+                tag=Field.loads(transition_input["tag"])
+            )
+        elif transition_input["type"] == TransitionInput.Type.ExternalRecord.name:
+            return ExternalRecordTransitionInput(
+                input_commitment=Field.loads(transition_input["commitment"]),
+            )
+        else:
+            raise NotImplementedError
+
+    @staticmethod
+    def _get_transition_output_from_dict(transition_output: dict[str, Any], futures: dict[int, Optional[Future]]) -> TransitionOutput:
+        if transition_output["type"] == TransitionOutput.Type.Public.name:
+            if transition_output["plaintext"] is None:
+                plaintext = None
+            else:
+                plaintext = Plaintext.load(BytesIO(transition_output["plaintext"]))
+            return PublicTransitionOutput(
+                plaintext_hash=Field.loads(transition_output["plaintext_hash"]),
+                plaintext=Option[Plaintext](plaintext)
+            )
+        elif transition_output["type"] == TransitionOutput.Type.Private.name:
+            if transition_output["ciphertext"] is None:
+                ciphertext = None
+            else:
+                ciphertext = Ciphertext.loads(transition_output["ciphertext"])
+            return PrivateTransitionOutput(
+                ciphertext_hash=Field.loads(transition_output["ciphertext_hash"]),
+                ciphertext=Option[Ciphertext](ciphertext)
+            )
+        elif transition_output["type"] == TransitionOutput.Type.Record.name:
+            if transition_output["record_ciphertext"] is None:
+                record_ciphertext = None
+            else:
+                record_ciphertext = Record[Ciphertext].loads(transition_output["record_ciphertext"])
+            return RecordTransitionOutput(
+                commitment=Field.loads(transition_output["record_commitment"]),
+                checksum=Field.loads(transition_output["checksum"]),
+                record_ciphertext=Option[Record[Ciphertext]](record_ciphertext)
+            )
+        elif transition_output["type"] == TransitionOutput.Type.ExternalRecord.name:
+            return ExternalRecordTransitionOutput(
+                commitment=Field.loads(transition_output["external_record_commitment"]),
+            )
+        elif transition_output["type"] == TransitionOutput.Type.Future.name:
+            return FutureTransitionOutput(
+                future_hash=Field.loads(transition_output["future_hash"]),
+                future=Option[Future](futures.get(transition_output["future_id"]))
+            )
+        else:
+            raise NotImplementedError
+
+    @staticmethod
+    def _get_transition_from_rows(transition: dict[str, Any], transition_inputs: list[dict[str, Any]],
+                                  transition_outputs: list[dict[str, Any]], futures: dict[int, Optional[Future]]):
+        tis = sorted(transition_inputs, key=lambda x: x["index"])
+        tos = sorted(transition_outputs, key=lambda x: x["index"])
+        return Transition(
+            id_=TransitionID.loads(transition["transition_id"]),
+            program_id=ProgramID.loads(transition["program_id"]),
+            function_name=Identifier.loads(transition["function_name"]),
+            inputs=Vec[TransitionInput, u8]([DatabaseBlock._get_transition_input_from_dict(x) for x in tis]),
+            outputs=Vec[TransitionOutput, u8]([DatabaseBlock._get_transition_output_from_dict(x, futures) for x in tos]),
+            tpk=Group.loads(transition["tpk"]),
+            tcm=Field.loads(transition["tcm"]),
+            scm=Field.loads(transition["scm"]),
+        )
 
     @staticmethod
     @profile
@@ -91,97 +195,61 @@ class DatabaseBlock(DatabaseBase):
         async with conn.cursor() as cur:
             await cur.execute("SELECT * FROM get_transition_inputs(%s)", (transition["id"],))
             transition_inputs = await cur.fetchall()
-            tis: list[tuple[TransitionInput, int]] = []
-            for transition_input in transition_inputs:
-                if transition_input["type"] == TransitionInput.Type.Public.name:
-                    if transition_input["plaintext"] is None:
-                        plaintext = None
-                    else:
-                        plaintext = Plaintext.load(BytesIO(transition_input["plaintext"]))
-                    tis.append((PublicTransitionInput(
-                        plaintext_hash=Field.loads(transition_input["plaintext_hash"]),
-                        plaintext=Option[Plaintext](plaintext)
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.Private.name:
-                    if transition_input["ciphertext"] is None:
-                        ciphertext = None
-                    else:
-                        ciphertext = Ciphertext.loads(transition_input["ciphertext"])
-                    tis.append((PrivateTransitionInput(
-                        ciphertext_hash=Field.loads(transition_input["ciphertext_hash"]),
-                        ciphertext=Option[Ciphertext](ciphertext)
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.Record.name:
-                    tis.append((RecordTransitionInput(
-                        serial_number=Field.loads(transition_input["serial_number"]),
-                        tag=Field.loads(transition_input["tag"])
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.ExternalRecord.name:
-                    tis.append((ExternalRecordTransitionInput(
-                        input_commitment=Field.loads(transition_input["commitment"]),
-                    ), transition_input["index"]))
-                else:
-                    raise NotImplementedError
-            tis.sort(key=lambda x: x[1])
-            transition_inputs = [x[0] for x in tis]
-
             await cur.execute("SELECT * FROM get_transition_outputs(%s)", (transition["id"],))
             transition_outputs = await cur.fetchall()
-            tos: list[tuple[TransitionOutput, int]] = []
-            for transition_output in transition_outputs:
-                if transition_output["type"] == TransitionOutput.Type.Public.name:
-                    if transition_output["plaintext"] is None:
-                        plaintext = None
-                    else:
-                        plaintext = Plaintext.load(BytesIO(transition_output["plaintext"]))
-                    tos.append((PublicTransitionOutput(
-                        plaintext_hash=Field.loads(transition_output["plaintext_hash"]),
-                        plaintext=Option[Plaintext](plaintext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Private.name:
-                    if transition_output["ciphertext"] is None:
-                        ciphertext = None
-                    else:
-                        ciphertext = Ciphertext.loads(transition_output["ciphertext"])
-                    tos.append((PrivateTransitionOutput(
-                        ciphertext_hash=Field.loads(transition_output["ciphertext_hash"]),
-                        ciphertext=Option[Ciphertext](ciphertext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Record.name:
-                    if transition_output["record_ciphertext"] is None:
-                        record_ciphertext = None
-                    else:
-                        record_ciphertext = Record[Ciphertext].loads(transition_output["record_ciphertext"])
-                    tos.append((RecordTransitionOutput(
-                        commitment=Field.loads(transition_output["record_commitment"]),
-                        checksum=Field.loads(transition_output["checksum"]),
-                        record_ciphertext=Option[Record[Ciphertext]](record_ciphertext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.ExternalRecord.name:
-                    tos.append((ExternalRecordTransitionOutput(
-                        commitment=Field.loads(transition_output["external_record_commitment"]),
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Future.name:
-                    future = await DatabaseBlock._load_future(conn, transition_output["future_id"], None)
-                    tos.append((FutureTransitionOutput(
-                        future_hash=Field.loads(transition_output["future_hash"]),
-                        future=Option[Future](future)
-                    ), transition_output["index"]))
-                else:
-                    raise NotImplementedError
-            tos.sort(key=lambda x: x[1])
-            transition_outputs = [x[0] for x in tos]
-
-            return Transition(
-                id_=TransitionID.loads(transition["transition_id"]),
-                program_id=ProgramID.loads(transition["program_id"]),
-                function_name=Identifier.loads(transition["function_name"]),
-                inputs=Vec[TransitionInput, u8](transition_inputs),
-                outputs=Vec[TransitionOutput, u8](transition_outputs),
-                tpk=Group.loads(transition["tpk"]),
-                tcm=Field.loads(transition["tcm"]),
-                scm=Field.loads(transition["scm"]),
+        futures = await DatabaseBlock._load_futures(conn, [
+            x["future_id"] for x in transition_outputs if x["type"] == TransitionOutput.Type.Future.name
+        ])
+        return DatabaseBlock._get_transition_from_rows(transition, transition_inputs, transition_outputs, futures)
+
+    @staticmethod
+    @profile
+    async def _get_transitions_from_dicts(transitions: list[dict[str, Any]], conn: psycopg.AsyncConnection[DictRow]) -> list[Transition]:
+        if not transitions:
+            return []
+        transition_db_ids = [transition["id"] for transition in transitions]
+        transition_inputs: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        transition_outputs: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT ti.transition_id, ti.type, ti.index, tip.plaintext_hash, tip.plaintext, "
+                "tipr.ciphertext_hash, tipr.ciphertext, tir.serial_number, tir.tag, tier.commitment "
+                "FROM transition_input ti "
+                "LEFT JOIN transition_input_public tip ON ti.type = 'Public' AND tip.transition_input_id = ti.id "
+                "LEFT JOIN transition_input_private tipr ON ti.type = 'Private' AND tipr.transition_input_id = ti.id "
+                "LEFT JOIN transition_input_record tir ON ti.type = 'Record' AND tir.transition_input_id = ti.id "
+                "LEFT JOIN transition_input_external_record tier ON ti.type = 'ExternalRecord' AND tier.transition_input_id = ti.id "
+                "WHERE ti.transition_id = ANY(%s) ORDER BY ti.id",
+                (transition_db_ids,)
+            )
+            for transition_input in await cur.fetchall():
+                transition_inputs[transition_input["transition_id"]].append(transition_input)
+            await cur.execute(
+                "SELECT tro.transition_id, tro.type, tro.index, top.plaintext_hash, top.plaintext, "
+                "topr.ciphertext_hash, topr.ciphertext, tor.commitment AS record_commitment, tor.checksum, "
+                "tor.record_ciphertext, toer.commitment AS external_record_commitment, "
+                "tof.id AS future_id, tof.future_hash "
+                "FROM transition_output tro "
+                "LEFT JOIN transition_output_public top ON tro.type = 'Public' AND top.transition_output_id = tro.id "
+                "LEFT JOIN transition_output_private topr ON tro.type = 'Private' AND topr.transition_output_id = tro.id "
+                "LEFT JOIN transition_output_record tor ON tro.type = 'Record' AND tor.transition_output_id = tro.id "
+                "LEFT JOIN transition_output_external_record toer ON tro.type = 'ExternalRecord' AND toer.transition_output_id = tro.id "
+                "LEFT JOIN transition_output_future tof ON tro.type = 'Future' AND tof.transition_output_id = tro.id "
+                "WHERE tro.transition_id = ANY(%s) ORDER BY tro.id",
+                (transition_db_ids,)
             )
+            future_ids: list[int] = []
+            for transition_output in await cur.fetchall():
+                transition_outputs[transition_output["transition_id"]].append(transition_output)
+                if transition_output["type"] == TransitionOutput.Type.Future.name:
+                    future_ids.append(transition_output["future_id"])
+        futures = await DatabaseBlock._load_futures(conn, future_ids)
+        return [
+            DatabaseBlock._get_transition_from_rows(
+                transition, transition_inputs[transition["id"]], transition_outputs[transition["id"]], futures
+            )
+            for transition in transitions
+        ]
 
     async def get_transaction_reject_reason(self, transaction_id: TransactionID | str) -> Optional[str]:
         async with self.pool.connection() as conn:
@@ -213,7 +281,7 @@ class DatabaseBlock(DatabaseBase):
                     block = await cur.fetchone()
                     if block is None:
                         return None
-                    return await self._get_full_block(block, conn)
+                    return await self._get_block_from_row(block, conn)
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -257,7 +325,7 @@ class DatabaseBlock(DatabaseBase):
                     block = await cur.fetchone()
                     if block is None:
                         return None
-                    return await self._get_full_block(block, conn)
+                    return await self._get_block_from_row(block, conn)
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -386,7 +454,7 @@ class DatabaseBlock(DatabaseBase):
                                     functions={},
                                     identifiers={},
                                 ),
-                                verifying_keys=Vec[Tuple[Identifier, VerifyingKey, Certificate], u16].load(BytesIO(deploy["verifying_keys"])),
+                                verifying_keys=VerifyingKeys.load(BytesIO(deploy["verifying_keys"])),
                             ),
                             fee=Fee(
                                 transition=await self._get_transition_from_dict(fee_transition, conn),
@@ -418,9 +486,7 @@ class DatabaseBlock(DatabaseBase):
                             (execute["id"],)
                         )
                         transitions = await cur.fetchall()
-                        tss: list[Transition] = []
-                        for transition in transitions:
-                            tss.append(await self._get_transition_from_dict(transition, conn))
+                        tss = await self._get_transitions_from_dicts(transitions, conn)
                         await cur.execute(
                             "SELECT id, global_state_root, proof FROM fee WHERE transaction_id = %s",
                             (transaction["id"],)
@@ -542,193 +608,272 @@ class DatabaseBlock(DatabaseBase):
                     raise
 
     @staticmethod
-    async def get_confirmed_transaction_from_dict(conn: psycopg.AsyncConnection[DictRow], confirmed_transaction: dict[str, Any]) -> ConfirmedTransaction:
-        async with conn.cursor() as cur:
-            await cur.execute("SELECT * FROM get_finalize_operations(%s)", (confirmed_transaction["confirmed_transaction_id"],))
-            finalize_operations = await cur.fetchall()
-            f: list[FinalizeOperation] = []
-            for finalize_operation in finalize_operations:
-                if finalize_operation["type"] == FinalizeOperation.Type.InitializeMapping.name:
-                    f.append(InitializeMapping(mapping_id=Field.loads(finalize_operation["mapping_id"])))
-                elif finalize_operation["type"] == FinalizeOperation.Type.InsertKeyValue.name:
-                    f.append(InsertKeyValue(
-                        mapping_id=Field.loads(finalize_operation["mapping_id"]),
-                        key_id=Field.loads(finalize_operation["key_id"]),
-                        value_id=Field.loads(finalize_operation["value_id"]),
-                    ))
-                elif finalize_operation["type"] == FinalizeOperation.Type.UpdateKeyValue.name:
-                    f.append(UpdateKeyValue(
-                        mapping_id=Field.loads(finalize_operation["mapping_id"]),
-                        key_id=Field.loads(finalize_operation["key_id"]),
-                        value_id=Field.loads(finalize_operation["value_id"]),
-                    ))
-                elif finalize_operation["type"] == FinalizeOperation.Type.RemoveKeyValue.name:
-                    f.append(RemoveKeyValue(
-                        mapping_id=Field.loads(finalize_operation["mapping_id"]),
-                        key_id=Field.loads(finalize_operation["key_id"]),
-                    ))
-                elif finalize_operation["type"] == FinalizeOperation.Type.ReplaceMapping.name:
-                    f.append(ReplaceMapping(mapping_id=Field.loads(finalize_operation["mapping_id"])))
-                elif finalize_operation["type"] == FinalizeOperation.Type.RemoveMapping.name:
-                    f.append(RemoveMapping(mapping_id=Field.loads(finalize_operation["mapping_id"])))
-                else:
-                    raise NotImplementedError
+    def _get_finalize_operation_from_dict(finalize_operation: dict[str, Any]) -> FinalizeOperation:
+        if finalize_operation["type"] == FinalizeOperation.Type.InitializeMapping.name:
+            return InitializeMapping(mapping_id=Field.loads(finalize_operation["mapping_id"]))
+        elif finalize_operation["type"] == FinalizeOperation.Type.InsertKeyValue.name:
+            return InsertKeyValue(
+                mapping_id=Field.loads(finalize_operation["mapping_id"]),
+                key_id=Field.loads(finalize_operation["key_id"]),
+                value_id=Field.loads(finalize_operation["value_id"]),
+            )
+        elif finalize_operation["type"] == FinalizeOperation.Type.UpdateKeyValue.name:
+            return UpdateKeyValue(
+                mapping_id=Field.loads(finalize_operation["mapping_id"]),
+                key_id=Field.loads(finalize_operation["key_id"]),
+                value_id=Field.loads(finalize_operation["value_id"]),
+            )
+        elif finalize_operation["type"] == FinalizeOperation.Type.RemoveKeyValue.name:
+            return RemoveKeyValue(
+                mapping_id=Field.loads(finalize_operation["mapping_id"]),
+                key_id=Field.loads(finalize_operation["key_id"]),
+            )
+        elif finalize_operation["type"] == FinalizeOperation.Type.ReplaceMapping.name:
+            return ReplaceMapping(mapping_id=Field.loads(finalize_operation["mapping_id"]))
+        elif finalize_operation["type"] == FinalizeOperation.Type.RemoveMapping.name:
+            return RemoveMapping(mapping_id=Field.loads(finalize_operation["mapping_id"]))
+        else:
+            raise NotImplementedError
 
-            transaction = confirmed_transaction
-            # TODO: store full program on rejected deploy so we dont need dummy data - should we?
-            match confirmed_transaction["confirmed_transaction_type"]:
-                case ConfirmedTransaction.Type.AcceptedDeploy.name | ConfirmedTransaction.Type.RejectedDeploy.name:
-                    deploy_transaction = transaction
-                    if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
-                        await cur.execute(
-                            "SELECT raw_data, owner, signature FROM program WHERE transaction_deploy_id = %s",
-                            (deploy_transaction["transaction_deploy_id"],)
-                        )
-                        program_data = await cur.fetchone()
-                        if program_data is None:
-                            raise RuntimeError("database inconsistent")
-                        program = program_data["raw_data"]
-                        deployment = Deployment(
-                            edition=u16(deploy_transaction["edition"]),
-                            program=Program.load(BytesIO(program)),
-                            verifying_keys=Vec[Tuple[Identifier, VerifyingKey, Certificate], u16].load(BytesIO(deploy_transaction["verifying_keys"])),
+    @staticmethod
+    def _get_confirmed_transaction_from_rows(confirmed_transaction: dict[str, Any], f: list[FinalizeOperation],
+                                             program_data: Optional[dict[str, Any]], tss: list[Transition],
+                                             fee_transition: Optional[Transition]) -> ConfirmedTransaction:
+        transaction = confirmed_transaction
+        # TODO: store full program on rejected deploy so we dont need dummy data - should we?
+        match confirmed_transaction["confirmed_transaction_type"]:
+            case ConfirmedTransaction.Type.AcceptedDeploy.name | ConfirmedTransaction.Type.RejectedDeploy.name:
+                deploy_transaction = transaction
+                if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
+                    if program_data is None:
+                        raise RuntimeError("database inconsistent")
+                    program = program_data["raw_data"]
+                    deployment = Deployment(
+                        edition=u16(deploy_transaction["edition"]),
+                        program=Program.load(BytesIO(program)),
+                        verifying_keys=VerifyingKeys.load(BytesIO(deploy_transaction["verifying_keys"])),
+                    )
+                else:
+                    deployment = Deployment(
+                        edition=u16(deploy_transaction["edition"]),
+                        program=Program(
+                            id_=ProgramID.loads("placeholder.aleo"),
+                            imports=Vec[Import, u8]([]),
+                            mappings={},
+                            structs={},
+                            records={},
+                            closures={},
+                            functions={},
+                            identifiers={},
+                        ),
+                        verifying_keys=VerifyingKeys([])
+                    )
+                fee_dict = transaction
+                if fee_transition is None:
+                    raise ValueError("fee transition not found")
+                proof = None
+                if fee_dict["fee_proof"] is not None:
+                    proof = Proof.loads(fee_dict["fee_proof"])
+                fee = Fee(
+                    transition=fee_transition,
+                    global_state_root=StateRoot.loads(fee_dict["fee_global_state_root"]),
+                    proof=Option[Proof](proof),
+                )
+                if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
+                    program_data = cast(dict[str, Any], program_data)
+                    tx = DeployTransaction(
+                        id_=TransactionID.loads(transaction["transaction_id"]),
+                        deployment=deployment,
+                        fee=fee,
+                        owner=ProgramOwner(
+                            address=Address.loads(program_data["owner"]),
+                            signature=Signature.loads(program_data["signature"])
                         )
-                    else:
-                        deployment = Deployment(
-                            edition=u16(deploy_transaction["edition"]),
-                            program=Program(
-                                id_=ProgramID.loads("placeholder.aleo"),
-                                imports=Vec[Import, u8]([]),
-                                mappings={},
-                                structs={},
-                                records={},
-                                closures={},
-                                functions={},
-                                identifiers={},
-                            ),
-                            verifying_keys=Vec[Tuple[Identifier, VerifyingKey, Certificate], u16]([])
+                    )
+                else:
+                    tx = DeployTransaction(
+                        id_=TransactionID.loads(transaction["transaction_id"]),
+                        deployment=deployment,
+                        fee=fee,
+                        owner=ProgramOwner(
+                            address=Address.loads(deploy_transaction["owner"]),
+                            signature=Signature(
+                                challenge=Scalar(0),
+                                response=Scalar(0),
+                                compute_key=ComputeKey(
+                                    pk_sig=Group(0),
+                                    pr_sig=Group(0),
+                                )
+                            )
                         )
-                        program_data = None
-                    fee_dict = transaction
-                    if not fee_dict:
-                        raise RuntimeError("database inconsistent")
-                    await cur.execute(
-                        "SELECT * FROM transition WHERE fee_id = %s",
-                        (fee_dict["fee_id"],)
                     )
-                    fee_transition = await cur.fetchone()
+                ctx = AcceptedDeploy(
+                    index=u32(confirmed_transaction["index"]),
+                    transaction=tx,
+                    finalize=Vec[FinalizeOperation, u16](f),
+                )
+            case ConfirmedTransaction.Type.AcceptedExecute.name | ConfirmedTransaction.Type.RejectedExecute.name:
+                execute_transaction = transaction
+                fee = transaction
+                if fee["fee_id"] is None:
+                    fee = None
+                else:
                     if fee_transition is None:
                         raise ValueError("fee transition not found")
                     proof = None
-                    if fee_dict["fee_proof"] is not None:
-                        proof = Proof.loads(fee_dict["fee_proof"])
+                    if fee["fee_proof"] is not None:
+                        proof = Proof.loads(fee["fee_proof"])
                     fee = Fee(
-                        transition=await DatabaseBlock._get_transition_from_dict(fee_transition, conn),
-                        global_state_root=StateRoot.loads(fee_dict["fee_global_state_root"]),
+                        transition=fee_transition,
+                        global_state_root=StateRoot.loads(fee["fee_global_state_root"]),
                         proof=Option[Proof](proof),
                     )
-                    if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
-                        program_data = cast(dict[str, Any], program_data)
-                        tx = DeployTransaction(
+                if execute_transaction["proof"] is None:
+                    proof = None
+                else:
+                    proof = Proof.loads(execute_transaction["proof"])
+                if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedExecute.name:
+                    ctx = AcceptedExecute(
+                        index=u32(confirmed_transaction["index"]),
+                        transaction=ExecuteTransaction(
                             id_=TransactionID.loads(transaction["transaction_id"]),
-                            deployment=deployment,
-                            fee=fee,
-                            owner=ProgramOwner(
-                                address=Address.loads(program_data["owner"]),
-                                signature=Signature.loads(program_data["signature"])
-                            )
-                        )
-                    else:
-                        tx = DeployTransaction(
+                            execution=Execution(
+                                transitions=Vec[Transition, u8](tss),
+                                global_state_root=StateRoot.loads(execute_transaction["global_state_root"]),
+                                proof=Option[Proof](proof),
+                            ),
+                            fee=Option[Fee](fee),
+                        ),
+                        finalize=Vec[FinalizeOperation, u16](f),
+                    )
+                else:
+                    if fee is None:
+                        raise ValueError("fee is None")
+                    ctx = RejectedExecute(
+                        index=u32(confirmed_transaction["index"]),
+                        transaction=FeeTransaction(
                             id_=TransactionID.loads(transaction["transaction_id"]),
-                            deployment=deployment,
                             fee=fee,
-                            owner=ProgramOwner(
-                                address=Address.loads(deploy_transaction["owner"]),
-                                signature=Signature(
-                                    challenge=Scalar(0),
-                                    response=Scalar(0),
-                                    compute_key=ComputeKey(
-                                        pk_sig=Group(0),
-                                        pr_sig=Group(0),
-                                    )
-                                )
+                        ),
+                        rejected=RejectedExecution(
+                            execution=Execution(
+                                transitions=Vec[Transition, u8](tss),
+                                global_state_root=StateRoot.loads(execute_transaction["global_state_root"]),
+                                proof=Option[Proof](proof),
                             )
-                        )
-                    ctx = AcceptedDeploy(
-                        index=u32(confirmed_transaction["index"]),
-                        transaction=tx,
+                        ),
                         finalize=Vec[FinalizeOperation, u16](f),
                     )
-                case ConfirmedTransaction.Type.AcceptedExecute.name | ConfirmedTransaction.Type.RejectedExecute.name:
-                    execute_transaction = transaction
-                    await cur.execute(
-                        "SELECT * FROM transition WHERE transaction_execute_id = %s ORDER BY id",
-                        (execute_transaction["transaction_execute_id"],)
-                    )
-                    transitions = await cur.fetchall()
-                    tss: list[Transition] = []
-                    for transition in transitions:
-                        tss.append(await DatabaseBlock._get_transition_from_dict(transition, conn))
-                    fee = transaction
-                    if fee["fee_id"] is None:
-                        fee = None
-                    else:
-                        await cur.execute(
-                            "SELECT * FROM transition WHERE fee_id = %s",
-                            (fee["fee_id"],)
-                        )
-                        fee_transition = await cur.fetchone()
-                        if fee_transition is None:
-                            print(transaction)
-                            raise ValueError("fee transition not found")
-                        proof = None
-                        if fee["fee_proof"] is not None:
-                            proof = Proof.loads(fee["fee_proof"])
-                        fee = Fee(
-                            transition=await DatabaseBlock._get_transition_from_dict(fee_transition, conn),
-                            global_state_root=StateRoot.loads(fee["fee_global_state_root"]),
-                            proof=Option[Proof](proof),
-                        )
-                    if execute_transaction["proof"] is None:
-                        proof = None
-                    else:
-                        proof = Proof.loads(execute_transaction["proof"])
-                    if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedExecute.name:
-                        ctx = AcceptedExecute(
-                            index=u32(confirmed_transaction["index"]),
-                            transaction=ExecuteTransaction(
-                                id_=TransactionID.loads(transaction["transaction_id"]),
-                                execution=Execution(
-                                    transitions=Vec[Transition, u8](tss),
-                                    global_state_root=StateRoot.loads(execute_transaction["global_state_root"]),
-                                    proof=Option[Proof](proof),
-                                ),
-                                fee=Option[Fee](fee),
-                            ),
-                            finalize=Vec[FinalizeOperation, u16](f),
-                        )
-                    else:
-                        if fee is None:
-                            raise ValueError("fee is None")
-                        ctx = RejectedExecute(
-                            index=u32(confirmed_transaction["index"]),
-                            transaction=FeeTransaction(
-                                id_=TransactionID.loads(transaction["transaction_id"]),
-                                fee=fee,
-                            ),
-                            rejected=RejectedExecution(
-                                execution=Execution(
-                                    transitions=Vec[Transition, u8](tss),
-                                    global_state_root=StateRoot.loads(execute_transaction["global_state_root"]),
-                                    proof=Option[Proof](proof),
-                                )
-                            ),
-                            finalize=Vec[FinalizeOperation, u16](f),
-                        )
-                case _:
-                    raise NotImplementedError
-            return ctx
+            case _:
+                raise NotImplementedError
+        return ctx
+
+    @staticmethod
+    async def get_confirmed_transaction_from_dict(conn: psycopg.AsyncConnection[DictRow], confirmed_transaction: dict[str, Any]) -> ConfirmedTransaction:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT * FROM get_finalize_operations(%s)", (confirmed_transaction["confirmed_transaction_id"],))
+            f = [DatabaseBlock._get_finalize_operation_from_dict(x) for x in await cur.fetchall()]
+            program_data = None
+            if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
+                await cur.execute(
+                    "SELECT raw_data, owner, signature FROM program WHERE transaction_deploy_id = %s",
+                    (confirmed_transaction["transaction_deploy_id"],)
+                )
+                program_data = await cur.fetchone()
+            tss: list[Transition] = []
+            if confirmed_transaction["confirmed_transaction_type"] in (
+                ConfirmedTransaction.Type.AcceptedExecute.name, ConfirmedTransaction.Type.RejectedExecute.name
+            ):
+                await cur.execute(
+                    "SELECT * FROM transition WHERE transaction_execute_id = %s ORDER BY id",
+                    (confirmed_transaction["transaction_execute_id"],)
+                )
+                tss = await DatabaseBlock._get_transitions_from_dicts(await cur.fetchall(), conn)
+            fee_transition = None
+            if confirmed_transaction["fee_id"] is not None:
+                await cur.execute(
+                    "SELECT * FROM transition WHERE fee_id = %s",
+                    (confirmed_transaction["fee_id"],)
+                )
+                if (fee_transition := await cur.fetchone()) is not None:
+                    fee_transition = await DatabaseBlock._get_transition_from_dict(fee_transition, conn)
+        return DatabaseBlock._get_confirmed_transaction_from_rows(confirmed_transaction, f, program_data, tss, fee_transition)
+
+    @staticmethod
+    @profile
+    async def _get_confirmed_transactions_from_dicts(conn: psycopg.AsyncConnection[DictRow], confirmed_transactions: list[dict[str, Any]]) -> list[ConfirmedTransaction]:
+        # set based version of get_confirmed_transaction_from_dict, the query count doesn't depend on the transaction count
+        if not confirmed_transactions:
+            return []
+        finalize_operations: dict[int, list[FinalizeOperation]] = defaultdict(list)
+        programs: dict[int, dict[str, Any]] = {}
+        transitions: list[dict[str, Any]] = []
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT fo.confirmed_transaction_id, fo.type, fo.index, "
+                "COALESCE(im.mapping_id, ik.mapping_id, uk.mapping_id, rk.mapping_id, rp.mapping_id, rm.mapping_id) AS mapping_id, "
+                "COALESCE(ik.key_id, uk.key_id, rk.key_id) AS key_id, "
+                "COALESCE(ik.value_id, uk.value_id) AS value_id "
+                "FROM finalize_operation fo "
+                "LEFT JOIN finalize_operation_initialize_mapping im ON fo.type = 'InitializeMapping' AND im.finalize_operation_id = fo.id "
+                "LEFT JOIN finalize_operation_insert_kv ik ON fo.type = 'InsertKeyValue' AND ik.finalize_operation_id = fo.id "
+                "LEFT JOIN finalize_operation_update_kv uk ON fo.type = 'UpdateKeyValue' AND uk.finalize_operation_id = fo.id "
+                "LEFT JOIN finalize_operation_remove_kv rk ON fo.type = 'RemoveKeyValue' AND rk.finalize_operation_id = fo.id "
+                "LEFT JOIN finalize_operation_replace_mapping rp ON fo.type = 'ReplaceMapping' AND rp.finalize_operation_id = fo.id "
+                "LEFT JOIN finalize_operation_remove_mapping rm ON fo.type = 'RemoveMapping' AND rm.finalize_operation_id = fo.id "
+                "WHERE fo.confirmed_transaction_id = ANY(%s) ORDER BY fo.id",
+                ([x["confirmed_transaction_id"] for x in confirmed_transactions],)
+            )
+            for finalize_operation in await cur.fetchall():
+                finalize_operations[finalize_operation["confirmed_transaction_id"]].append(
+                    DatabaseBlock._get_finalize_operation_from_dict(finalize_operation)
+                )
+
+            deploy_ids = [
+                x["transaction_deploy_id"] for x in confirmed_transactions
+                if x["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name
+            ]
+            if deploy_ids:
+                await cur.execute(
+                    "SELECT transaction_deploy_id, raw_data, owner, signature FROM program WHERE transaction_deploy_id = ANY(%s)",
+                    (deploy_ids,)
+                )
+                for program in await cur.fetchall():
+                    programs[program["transaction_deploy_id"]] = program
+
+            execute_ids = [x["transaction_execute_id"] for x in confirmed_transactions if x["transaction_execute_id"] is not None]
+            fee_ids = [x["fee_id"] for x in confirmed_transactions if x["fee_id"] is not None]
+            if execute_ids or fee_ids:
+                await cur.execute(
+                    "SELECT * FROM transition WHERE transaction_execute_id = ANY(%s) OR fee_id = ANY(%s) ORDER BY id",
+                    (execute_ids, fee_ids)
+                )
+                transitions = await cur.fetchall()
+
+        tss = await DatabaseBlock._get_transitions_from_dicts(transitions, conn)
+        execute_transitions: dict[int, list[Transition]] = defaultdict(list)
+        fee_transitions: dict[int, Transition] = {}
+        for transition, ts in zip(transitions, tss):
+            if transition["transaction_execute_id"] is not None:
+                execute_transitions[transition["transaction_execute_id"]].append(ts)
+            elif transition["fee_id"] is not None:
+                fee_transitions.setdefault(transition["fee_id"], ts)
+
+        ctxs: list[ConfirmedTransaction] = []
+        for confirmed_transaction in confirmed_transactions:
+            if confirmed_transaction["transaction_execute_id"] is None:
+                execution_transitions = []
+            else:
+                execution_transitions = execute_transitions[confirmed_transaction["transaction_execute_id"]]
+            ctxs.append(DatabaseBlock._get_confirmed_transaction_from_rows(
+                confirmed_transaction,
+                finalize_operations[confirmed_transaction["confirmed_transaction_id"]],
+                programs.get(confirmed_transaction["transaction_deploy_id"]),
+                execution_transitions,
+                fee_transitions.get(confirmed_transaction["fee_id"]),
+            ))
+        return ctxs
+
 
     async def get_confirmed_transaction(self, transaction_id: str) -> Optional[ConfirmedTransaction]:
         async with self.pool.connection() as conn:
@@ -788,63 +933,150 @@ class DatabaseBlock(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    @staticmethod
+    async def _get_genesis_ratify(conn: psycopg.AsyncConnection[DictRow]) -> GenesisRatify:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT * FROM committee_history WHERE height = %s", (0,))
+            committee_history = await cur.fetchone()
+            if committee_history is None:
+                raise RuntimeError("database inconsistent")
+            await cur.execute("SELECT * FROM committee_history_member WHERE committee_id = %s", (committee_history["id"],))
+            committee_history_members = await cur.fetchall()
+            members: list[Tuple[Address, u64, bool_, u8]] = []
+            for committee_history_member in committee_history_members:
+                members.append(Tuple[Address, u64, bool_, u8]((
+                    Address.loads(committee_history_member["address"]),
+                    u64(committee_history_member["stake"]),
+                    bool_(committee_history_member["is_open"]),
+                    u8(committee_history_member["commission"]),
+                )))
+            committee = Committee(
+                id_=Field.loads(committee_history["committee_id"]),
+                starting_round=u64(committee_history["starting_round"]),
+                members=Vec[Tuple[Address, u64, bool_, u8], u16](members),
+                total_stake=u64(committee_history["total_stake"]),
+            )
+            await cur.execute("SELECT * FROM ratification_genesis_balance")
+            public_balances = await cur.fetchall()
+            balances: list[Tuple[Address, u64]] = []
+            for public_balance in public_balances:
+                balances.append(Tuple[Address, u64]((Address.loads(public_balance["address"]), u64(public_balance["amount"]))))
+            await cur.execute("SELECT * FROM ratification_genesis_bonded")
+            bonded_balances = await cur.fetchall()
+            bonded: list[Tuple[Address, Address, Address, u64]] = []
+            for bonded_balance in bonded_balances:
+                bonded.append(
+                    Tuple[Address, Address, Address, u64]((
+                        Address.loads(bonded_balance["staker"]),
+                        Address.loads(bonded_balance["validator"]),
+                        Address.loads(bonded_balance["withdrawal"]),
+                        u64(bonded_balance["amount"])
+                    ))
+                )
+            return GenesisRatify(
+                committee=committee,
+                public_balances=Vec[Tuple[Address, u64], u16](balances),
+                bonded_balances=Vec[Tuple[Address, Address, Address, u64], u16](bonded),
+            )
+
     @staticmethod
     @profile
     async def _get_full_block(block: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]):
+        return (await DatabaseBlock._get_full_blocks([block], conn))[0]
+
+    @staticmethod
+    @profile
+    async def _get_full_blocks(blocks: list[dict[str, Any]], conn: psycopg.AsyncConnection[DictRow]) -> list[Block]:
+        # every child table is fetched once for all blocks and grouped in memory,
+        # so the query count doesn't depend on the number of transactions / transitions / vertices
+        if not blocks:
+            return []
+        block_ids = [block["id"] for block in blocks]
+        block_transactions: dict[int, list[ConfirmedTransaction]] = defaultdict(list)
+        block_ratifications: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        block_solutions: dict[int, list[Solution]] = {}
+        authorities: dict[int, dict[str, Any]] = {}
+        dag_vertices: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        vertex_transmission_ids: dict[int, list[TransmissionID]] = defaultdict(list)
+        block_aborted_solution_ids: dict[int, list[SolutionID]] = defaultdict(list)
+        block_aborted_transaction_ids: dict[int, list[TransactionID]] = defaultdict(list)
         async with conn.cursor() as cur:
-            await cur.execute("SELECT * FROM get_confirmed_transactions(%s)", (block["id"],))
+            await cur.execute(
+                "SELECT b.block_id, ct.* FROM unnest(%s::integer[]) b(block_id) "
+                "CROSS JOIN LATERAL get_confirmed_transactions(b.block_id) ct",
+                (block_ids,)
+            )
             confirmed_transactions = await cur.fetchall()
-            ctxs: list[ConfirmedTransaction] = []
-            for confirmed_transaction in confirmed_transactions:
-                ctxs.append(await DatabaseBlock.get_confirmed_transaction_from_dict(conn, confirmed_transaction))
-            await cur.execute("SELECT * FROM ratification WHERE block_id = %s ORDER BY index", (block["id"],))
-            ratifications = await cur.fetchall()
+
+            await cur.execute("SELECT * FROM ratification WHERE block_id = ANY(%s) ORDER BY index", (block_ids,))
+            for ratification in await cur.fetchall():
+                block_ratifications[ratification["block_id"]].append(ratification)
+
+            await cur.execute(
+                "SELECT ps.block_id, s.id AS solution_db_id, s.epoch_hash, s.address, s.counter, s.target "
+                "FROM puzzle_solution ps LEFT JOIN solution s ON s.puzzle_solution_id = ps.id "
+                "WHERE ps.block_id = ANY(%s) ORDER BY s.id",
+                (block_ids,)
+            )
+            for solution in await cur.fetchall():
+                ss = block_solutions.setdefault(solution["block_id"], [])
+                if solution["solution_db_id"] is None:
+                    continue
+                ss.append(Solution(
+                    partial_solution=PartialSolution(
+                        solution_id=SolutionID.load(BytesIO(aleo_explorer_rust.solution_to_id(str(solution["epoch_hash"]), str(solution["address"]), int(solution["counter"])))),
+                        epoch_hash=BlockHash.loads(solution["epoch_hash"]),
+                        address=Address.loads(solution["address"]),
+                        counter=u64(solution["counter"]),
+                    ),
+                    target=u64(solution["target"]),
+                ))
+
+            await cur.execute("SELECT * FROM authority WHERE block_id = ANY(%s)", (block_ids,))
+            for authority in await cur.fetchall():
+                authorities[authority["block_id"]] = authority
+            quorum_ids = [x["id"] for x in authorities.values() if x["type"] == Authority.Type.Quorum.name]
+            if quorum_ids:
+                await cur.execute(
+                    "SELECT * FROM dag_vertex WHERE authority_id = ANY(%s) ORDER BY index",
+                    (quorum_ids,)
+                )
+                for dag_vertex in await cur.fetchall():
+                    dag_vertices[dag_vertex["authority_id"]].append(dag_vertex)
+                vertex_ids = [v["id"] for vs in dag_vertices.values() for v in vs]
+                if vertex_ids:
+                    await cur.execute(
+                        "SELECT * FROM dag_vertex_transmission_id WHERE vertex_id = ANY(%s) ORDER BY index",
+                        (vertex_ids,)
+                    )
+                    for tid in await cur.fetchall():
+                        tids = vertex_transmission_ids[tid["vertex_id"]]
+                        if tid["type"] == TransmissionID.Type.Ratification:
+                            tids.append(RatificationTransmissionID())
+                        elif tid["type"] == TransmissionID.Type.Solution:
+                            tids.append(SolutionTransmissionID(id_=SolutionID.loads(tid["commitment"]), checksum=u128()))
+                        elif tid["type"] == TransmissionID.Type.Transaction:
+                            tids.append(TransactionTransmissionID(id_=TransactionID.loads(tid["transaction_id"]), checksum=u128()))
+
+            await cur.execute("SELECT * FROM block_aborted_solution_id WHERE block_id = ANY(%s) ORDER BY id", (block_ids,))
+            for x in await cur.fetchall():
+                block_aborted_solution_ids[x["block_id"]].append(SolutionID.loads(x["solution_id"]))
+
+            await cur.execute("SELECT * FROM block_aborted_transaction_id WHERE block_id = ANY(%s) ORDER BY id", (block_ids,))
+            for x in await cur.fetchall():
+                block_aborted_transaction_ids[x["block_id"]].append(TransactionID.loads(x["transaction_id"]))
+
+        ctxs = await DatabaseBlock._get_confirmed_transactions_from_dicts(conn, confirmed_transactions)
+        for confirmed_transaction, ctx in zip(confirmed_transactions, ctxs):
+            block_transactions[confirmed_transaction["block_id"]].append(ctx)
+
+        res: list[Block] = []
+        for block in blocks:
             rs: list[Ratify] = []
-            for ratification in ratifications:
+            for ratification in block_ratifications[block["id"]]:
                 match ratification["type"]:
                     case Ratify.Type.Genesis.name:
-                        await cur.execute("SELECT * FROM committee_history WHERE height = %s", (0,))
-                        committee_history = await cur.fetchone()
-                        if committee_history is None:
-                            raise RuntimeError("database inconsistent")
-                        await cur.execute("SELECT * FROM committee_history_member WHERE committee_id = %s", (committee_history["id"],))
-                        committee_history_members = await cur.fetchall()
-                        members: list[Tuple[Address, u64, bool_, u8]] = []
-                        for committee_history_member in committee_history_members:
-                            members.append(Tuple[Address, u64, bool_, u8]((
-                                Address.loads(committee_history_member["address"]),
-                                u64(committee_history_member["stake"]),
-                                bool_(committee_history_member["is_open"]),
-                                u8(committee_history_member["commission"]),
-                            )))
-                        committee = Committee(
-                            id_=Field.loads(committee_history["committee_id"]),
-                            starting_round=u64(committee_history["starting_round"]),
-                            members=Vec[Tuple[Address, u64, bool_, u8], u16](members),
-                            total_stake=u64(committee_history["total_stake"]),
-                        )
-                        await cur.execute("SELECT * FROM ratification_genesis_balance")
-                        public_balances = await cur.fetchall()
-                        balances: list[Tuple[Address, u64]] = []
-                        for public_balance in public_balances:
-                            balances.append(Tuple[Address, u64]((Address.loads(public_balance["address"]), u64(public_balance["amount"]))))
-                        await cur.execute("SELECT * FROM ratification_genesis_bonded")
-                        bonded_balances = await cur.fetchall()
-                        bonded: list[Tuple[Address, Address, Address, u64]] = []
-                        for bonded_balance in bonded_balances:
-                            bonded.append(
-                                Tuple[Address, Address, Address, u64]((
-                                    Address.loads(bonded_balance["staker"]),
-                                    Address.loads(bonded_balance["validator"]),
-                                    Address.loads(bonded_balance["withdrawal"]),
-                                    u64(bonded_balance["amount"])
-                                ))
-                            )
-                        rs.append(GenesisRatify(
-                            committee=committee,
-                            public_balances=Vec[Tuple[Address, u64], u16](balances),
-                            bonded_balances=Vec[Tuple[Address, Address, Address, u64], u16](bonded),
-                        ))
+                        rs.append(await DatabaseBlock._get_genesis_ratify(conn))
                     case Ratify.Type.BlockReward.name:
                         rs.append(BlockRewardRatify(
                             amount=u64(ratification["amount"]),
@@ -856,31 +1088,12 @@ class DatabaseBlock(DatabaseBase):
                     case _:
                         raise NotImplementedError
 
-            await cur.execute("SELECT * FROM puzzle_solution WHERE block_id = %s", (block["id"],))
-            puzzle_solution = await cur.fetchone()
-            if puzzle_solution is not None:
-                await cur.execute(
-                    "SELECT * FROM solution WHERE puzzle_solution_id = %s",
-                    (puzzle_solution["id"],)
-                )
-                solutions = await cur.fetchall()
-                ss: list[Solution] = []
-                for solution in solutions:
-                    ss.append(Solution(
-                        partial_solution=PartialSolution(
-                            solution_id=SolutionID.load(BytesIO(aleo_explorer_rust.solution_to_id(str(solution["epoch_hash"]), str(solution["address"]), int(solution["counter"])))),
-                            epoch_hash=BlockHash.loads(solution["epoch_hash"]),
-                            address=Address.loads(solution["address"]),
-                            counter=u64(solution["counter"]),
-                        ),
-                        target=u64(solution["target"]),
-                    ))
+            if (ss := block_solutions.get(block["id"])) is not None:
                 puzzle_solution = PuzzleSolutions(solutions=Vec[Solution, u8](ss))
             else:
                 puzzle_solution = None
 
-            await cur.execute("SELECT * FROM authority WHERE block_id = %s", (block["id"],))
-            authority = await cur.fetchone()
+            authority = authorities.get(block["id"])
             if authority is None:
                 raise RuntimeError("database inconsistent")
             if authority["type"] == Authority.Type.Beacon.name:
@@ -888,13 +1101,8 @@ class DatabaseBlock(DatabaseBase):
                     signature=Signature.loads(authority["signature"]),
                 )
             elif authority["type"] == Authority.Type.Quorum.name:
-                await cur.execute(
-                    "SELECT * FROM dag_vertex WHERE authority_id = %s ORDER BY index",
-                    (authority["id"],)
-                )
-                dag_vertices = await cur.fetchall()
                 certificates: list[BatchCertificate] = []
-                for dag_vertex in dag_vertices:
+                for dag_vertex in dag_vertices[authority["id"]]:
                     # await cur.execute(
                     #     "SELECT * FROM dag_vertex_signature WHERE vertex_id = %s ORDER BY index",
                     #     (dag_vertex["id"],)
@@ -920,20 +1128,6 @@ class DatabaseBlock(DatabaseBase):
                     # )
                     # previous_cert_ids = [x["batch_certificate_id"] for x in await cur.fetchall()]
                     previous_cert_ids: list[str] = []
-
-                    await cur.execute(
-                        "SELECT * FROM dag_vertex_transmission_id WHERE vertex_id = %s ORDER BY index",
-                        (dag_vertex["id"],)
-                    )
-                    tids: list[TransmissionID] = []
-                    for tid in await cur.fetchall():
-                        if tid["type"] == TransmissionID.Type.Ratification:
-                            tids.append(RatificationTransmissionID())
-                        elif tid["type"] == TransmissionID.Type.Solution:
-                            tids.append(SolutionTransmissionID(id_=SolutionID.loads(tid["commitment"]), checksum=u128()))
-                        elif tid["type"] == TransmissionID.Type.Transaction:
-                            tids.append(TransactionTransmissionID(id_=TransactionID.loads(tid["transaction_id"]), checksum=u128()))
-
                     certificates.append(
                         BatchCertificate(
                             batch_header=BatchHeader(
@@ -942,7 +1136,7 @@ class DatabaseBlock(DatabaseBase):
                                 round_=u64(dag_vertex["round"]),
                                 timestamp=i64(dag_vertex["timestamp"]),
                                 committee_id=Field.loads(dag_vertex["committee_id"]),
-                                transmission_ids=Vec[TransmissionID, u32](tids),
+                                transmission_ids=Vec[TransmissionID, u32](vertex_transmission_ids[dag_vertex["id"]]),
                                 previous_certificate_ids=Vec[Field, u16]([Field.loads(x) for x in previous_cert_ids]),
                                 signature=Signature.loads(dag_vertex["author_signature"]),
                             ),
@@ -959,27 +1153,20 @@ class DatabaseBlock(DatabaseBase):
             else:
                 raise NotImplementedError
 
-            await cur.execute("SELECT * FROM block_aborted_solution_id WHERE block_id = %s", (block["id"],))
-            aborted_solution_ids = await cur.fetchall()
-            aborted_solution_ids = [SolutionID.loads(x["solution_id"]) for x in aborted_solution_ids]
-
-            await cur.execute("SELECT * FROM block_aborted_transaction_id WHERE block_id = %s", (block["id"],))
-            aborted_transaction_ids = await cur.fetchall()
-            aborted_transaction_ids = [TransactionID.loads(x["transaction_id"]) for x in aborted_transaction_ids]
-
-            return Block(
+            res.append(Block(
                 block_hash=BlockHash.loads(block['block_hash']),
                 previous_hash=BlockHash.loads(block['previous_hash']),
                 header=DatabaseBlock._get_block_header(block),
                 authority=auth,
                 transactions=Transactions(
-                    transactions=Vec[ConfirmedTransaction, u32](ctxs),
+                    transactions=Vec[ConfirmedTransaction, u32](block_transactions[block["id"]]),
                 ),
                 ratifications=Ratifications(ratifications=Vec[Ratify, u32](rs)),
                 solutions=Solutions(solutions=Option[PuzzleSolutions](puzzle_solution)),
-                aborted_solution_ids=Vec[SolutionID, u32](aborted_solution_ids),
-                aborted_transaction_ids=Vec[TransactionID, u32](aborted_transaction_ids),
-            )
+                aborted_solution_ids=Vec[SolutionID, u32](block_aborted_solution_ids[block["id"]]),
+                aborted_transaction_ids=Vec[TransactionID, u32](block_aborted_transaction_ids[block["id"]]),
+            ))
+        return res
 
     @staticmethod
     async def get_full_block_range(start: int, end: int, conn: psycopg.AsyncConnection[DictRow]):
@@ -989,33 +1176,74 @@ class DatabaseBlock(DatabaseBase):
                 (start, end)
             )
             blocks = await cur.fetchall()
-            return [await DatabaseBlock._get_full_block(block, conn) for block in blocks]
+        return await DatabaseBlock._get_full_blocks(blocks, conn)
 
     @staticmethod
-    async def _get_fast_block(block: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]) -> dict[str, Any]:
+    async def get_stored_block_range(block_store: Optional[BlockStore], start: int, end: int,
+                                     conn: psycopg.AsyncConnection[DictRow]) -> Optional[list[Block]]:
+        # same range as get_full_block_range, None if the store doesn't have all of it or doesn't match the database:
+        # the store is only truncated after a revert commits, so it can still hold reverted blocks
+        if block_store is None:
+            return None
         async with conn.cursor() as cur:
             await cur.execute(
-                "SELECT COUNT(*) FROM confirmed_transaction WHERE block_id = %s",
-                (block["id"],)
-            )
-            if (res := await cur.fetchone()) is None:
-                transaction_count = 0
-            else:
-                transaction_count = res["count"]
-            await cur.execute(
-                "WITH ps AS (SELECT ps.id FROM puzzle_solution ps WHERE ps.block_id = %s LIMIT 1) "
-                "SELECT COUNT(*) FROM solution s, ps WHERE s.puzzle_solution_id = ps.id",
-                (block["id"],)
+                "SELECT height, block_hash FROM block WHERE height <= %s AND height > %s ORDER BY height DESC",
+                (start, end)
             )
-            if (res := await cur.fetchone()) is None:
-                partial_solution_count = 0
-            else:
-                partial_solution_count = res["count"]
-            return {
-                **block,
-                "transaction_count": transaction_count,
-                "partial_solution_count": partial_solution_count,
-            }
+            rows = await cur.fetchall()
+        if not rows:
+            return []
+        try:
+            blocks = block_store.get_blocks(range(rows[0]["height"], rows[-1]["height"] - 1, -1))
+        except Exception:
+            # unreadable store, the database has everything
+            return None
+        if blocks is None or len(blocks) != len(rows):
+            return None
+        for block, row in zip(blocks, rows):
+            if block.height != row["height"] or str(block.block_hash) != row["block_hash"]:
+                return None
+        return blocks
+
+    # blocks loaded per query while filling the block store
+    block_store_fill_batch = 100
+
+    async def fill_block_store(self, end: int, start: Optional[int] = None):
+        """
+        Appends the blocks the block store is missing after its last block, up to and including end.
+
+        @param start: first height to store when the store is empty, the store is rebuilt from here if it
+                      doesn't include start or the blocks right before it. Without it an empty store stays empty
+        """
+        block_store = self.block_store
+        if block_store is None:
+            return
+        stored = block_store.heights
+        if start is not None and not stored.start <= start <= stored.stop:
+            block_store.clear()
+            height = start
+        elif not stored:
+            return
+        else:
+            height = stored.stop
+        async with self.pool.connection() as conn:
+            while height <= end:
+                last = min(end, height + self.block_store_fill_batch - 1)
+                blocks = await DatabaseBlock.get_full_block_range(last, height - 1, conn)
+                for block in reversed(blocks):
+                    block_store.append(block.height, block.dump())
+                height = last + 1
+
+    async def _get_block_from_row(self, block: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]) -> Block:
+        if self.block_store is not None:
+            try:
+                stored = self.block_store.get_block(block["height"])
+            except Exception as e:
+                await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                stored = None
+            if stored is not None and str(stored.block_hash) == block["block_hash"]:
+                return stored
+        return await self._get_full_block(block, conn)
 
     @staticmethod
     async def _get_fast_block_range(start: int, end: int, conn: psycopg.AsyncConnection[DictRow]):
@@ -1024,71 +1252,75 @@ class DatabaseBlock(DatabaseBase):
                 "SELECT * FROM block WHERE height <= %s AND height > %s ORDER BY height DESC",
                 (start, end)
             )
-            blocks = await cur.fetchall()
-            return [await DatabaseBlock._get_fast_block(block, conn) for block in blocks]
+            # transaction_count and partial_solution_count are kept on the block row
+            return await cur.fetchall()
 
-    async def get_latest_height(self) -> Optional[int]:
+    async def _get_latest_block_row(self) -> Optional[dict[str, Any]]:
+        if (block := self._get_cached_latest_block()) is not None:
+            return block
+        generation = self._latest_block_generation
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT height FROM block ORDER BY height DESC LIMIT 1")
-                    result = await cur.fetchone()
-                    if result is None:
-                        return None
-                    return result['height']
+                    await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT 1")
+                    block = await cur.fetchone()
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
+        if block is not None:
+            self._set_cached_latest_block(block, generation)
+        return block
+
+    async def get_latest_height(self) -> Optional[int]:
+        block = await self._get_latest_block_row()
+        if block is None:
+            return None
+        return block['height']
 
     async def get_latest_block_timestamp(self) -> int:
-        async with self.pool.connection() as conn:
-            async with conn.cursor() as cur:
-                try:
-                    await cur.execute("SELECT timestamp FROM block ORDER BY height DESC LIMIT 1")
-                    result = await cur.fetchone()
-                    if result is None:
-                        raise RuntimeError("no blocks in database")
-                    return result['timestamp']
-                except Exception as e:
-                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
-                    raise
+        block = await self._get_latest_block_row()
+        if block is None:
+            raise RuntimeError("no blocks in database")
+        return block['timestamp']
 
+    async def get_latest_block_header(self) -> BlockHeader:
+        block = await self._get_latest_block_row()
+        if block is None:
+            raise RuntimeError("no blocks in database")
+        return self._get_block_header(block)
 
     async def get_latest_block(self) -> Block:
+        block = await self._get_latest_block_row()
+        if block is None:
+            raise RuntimeError("no blocks in database")
         async with self.pool.connection() as conn:
-            async with conn.cursor() as cur:
-                try:
-                    await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT 1")
-                    block = await cur.fetchone()
-                    if block is None:
-                        raise RuntimeError("no blocks in database")
-                    return await self._get_full_block(block, conn)
-                except Exception as e:
-                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
-                    raise
+            try:
+                return await self._get_block_from_row(block, conn)
+            except Exception as e:
+                await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                raise
 
     async def get_latest_coinbase_target(self) -> int:
-        async with self.pool.connection() as conn:
-            async with conn.cursor() as cur:
-                try:
-                    await cur.execute("SELECT coinbase_target FROM block ORDER BY height DESC LIMIT 1")
-                    result = await cur.fetchone()
-                    if result is None:
-                        raise RuntimeError("no blocks in database")
-                    return result['coinbase_target']
-                except Exception as e:
-                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
-                    raise
+        block = await self._get_latest_block_row()
+        if block is None:
+            raise RuntimeError("no blocks in database")
+        return block['coinbase_target']
 
     async def get_latest_cumulative_proof_target(self) -> int:
+        block = await self._get_latest_block_row()
+        if block is None:
+            raise RuntimeError("no blocks in database")
+        return block['cumulative_proof_target']
+
+    async def get_network_summary(self) -> dict[str, Any]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT cumulative_proof_target FROM block ORDER BY height DESC LIMIT 1")
-                    result = await cur.fetchone()
-                    if result is None:
+                    await cur.execute("SELECT * FROM network_summary ORDER BY height DESC LIMIT 1")
+                    summary = await cur.fetchone()
+                    if summary is None:
                         raise RuntimeError("no blocks in database")
-                    return result['cumulative_proof_target']
+                    return summary
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -1101,7 +1333,7 @@ class DatabaseBlock(DatabaseBase):
                     block = await cur.fetchone()
                     if block is None:
                         return None
-                    return await self._get_full_block(block, conn)
+                    return await self._get_block_from_row(block, conn)
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -1140,7 +1372,7 @@ class DatabaseBlock(DatabaseBase):
                     block = await cur.fetchone()
                     if block is None:
                         return None
-                    return await self._get_full_block(block, conn)
+                    return await self._get_block_from_row(block, conn)
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -1159,11 +1391,12 @@ class DatabaseBlock(DatabaseBase):
                     raise
 
     async def get_recent_blocks_fast(self, limit: int = 30):
+        # not under the connection below, get_latest_height may need one of its own
+        latest_height = await self.get_latest_height()
+        if latest_height is None:
+            raise RuntimeError("no blocks in database")
         async with self.pool.connection() as conn:
             try:
-                latest_height = await self.get_latest_height()
-                if latest_height is None:
-                    raise RuntimeError("no blocks in database")
                 return await DatabaseBlock._get_fast_block_range(latest_height, latest_height - limit, conn)
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
@@ -1172,6 +1405,8 @@ class DatabaseBlock(DatabaseBase):
     async def get_blocks_range(self, start: int, end: int):
         async with self.pool.connection() as conn:
             try:
+                if (blocks := await DatabaseBlock.get_stored_block_range(self.block_store, start, end, conn)) is not None:
+                    return blocks
                 return await DatabaseBlock.get_full_block_range(start, end, conn)
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import mmap
+import os
+import struct
+import sys
+from io import BytesIO
+from typing import Any, Optional, cast
+
+from aleo_types import Block
+
+# base height, block count, generation (bumped whenever stored blocks are dropped)
+_header = struct.Struct("<QQQ")
+_entry = struct.Struct("<Q")
+
+
+class BlockStore:
+    # Append-only store of the canonical serialized blocks, indexed by height.
+    #
+    # blocks.dat holds the raw block bytes back to back, blocks.idx holds the header followed by the end offset of
+    # every stored block. Only the explorer process writes, every process reads through mmap.
+    # The files never shrink so the mappings other processes hold stay valid: dropping blocks only lowers the count
+    # and bumps the generation in the header, and readers re-check the header after copying a block out.
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._index_fd = os.open(os.path.join(path, "blocks.idx"), os.O_RDWR | os.O_CREAT, 0o644)
+        self._data_fd = os.open(os.path.join(path, "blocks.dat"), os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._index_fd).st_size < _header.size:
+            os.pwrite(self._index_fd, _header.pack(0, 0, 0), 0)
+        self._index_map: Optional[mmap.mmap] = None
+        self._data_map: Optional[mmap.mmap] = None
+
+    @staticmethod
+    def _remap(fd: int, current: Optional[mmap.mmap], size: int) -> Optional[mmap.mmap]:
+        if current is not None and len(current) >= size:
+            return current
+        if current is not None:
+            current.close()
+        if os.fstat(fd).st_size == 0:
+            return None
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+
+    def _read_index(self, offset: int, fmt: struct.Struct) -> tuple[int, ...]:
+        self._index_map = self._remap(self._index_fd, self._index_map, offset + fmt.size)
+        if self._index_map is None or len(self._index_map) < offset + fmt.size:
+            raise RuntimeError("block store index is truncated")
+        return fmt.unpack_from(self._index_map, offset)
+
+    def _header(self) -> tuple[int, int, int]:
+        base, count, generation = self._read_index(0, _header)
+        return base, count, generation
+
+    def _end_offset(self, index: int) -> int:
+        if index < 0:
+            return 0
+        return self._read_index(_header.size + index * _entry.size, _entry)[0]
+
+    @property
+    def heights(self) -> range:
+        base, count, _ = self._header()
+        return range(base, base + count)
+
+    def get(self, height: int) -> Optional[bytes]:
+        base, count, generation = self._header()
+        index = height - base
+        if not 0 <= index < count:
+            return None
+        start = self._end_offset(index - 1)
+        end = self._end_offset(index)
+        self._data_map = self._remap(self._data_fd, self._data_map, end)
+        if self._data_map is None:
+            return None
+        data = self._data_map[start:end]
+        new_base, new_count, new_generation = self._header()
+        if new_base != base or new_generation != generation or index >= new_count or len(data) != end - start:
+            # dropped while we were reading
+            return None
+        return data
+
+    def get_block(self, height: int) -> Optional[Block]:
+        data = self.get(height)
+        if data is None:
+            return None
+        return Block.load(BytesIO(data))
+
+    def get_blocks(self, heights: range) -> Optional[list[Block]]:
+        if not heights:
+            return []
+        stored = self.heights
+        if min(heights) not in stored or max(heights) not in stored:
+            return None
+        blocks: list[Block] = []
+        for height in heights:
+            if (block := self.get_block(height)) is None:
+                return None
+            blocks.append(block)
+        return blocks
+
+    def append(self, height: int, data: bytes):
+        header = self._header()
+        base, count, generation = header
+        if count == 0:
+            base, generation = height, generation + 1
+        elif height > base + count:
+            # the missing blocks have to be appended first, see DatabaseBlock.fill_block_store
+            raise ValueError(f"block store has blocks up to {base + count - 1}, can't append {height}")
+        elif height < base:
+            raise ValueError(f"block store starts at {base}, can't append {height}")
+        elif height < base + count:
+            # block replaced without a revert
+            count, generation = height - base, generation + 1
+        if (base, count, generation) != header:
+            # drop the blocks about to be overwritten first, like truncate, so readers never copy out torn bytes
+            os.pwrite(self._index_fd, _header.pack(base, count, generation), 0)
+            os.fdatasync(self._index_fd)
+        start = self._end_offset(count - 1)
+        os.pwrite(self._data_fd, data, start)
+        os.pwrite(self._index_fd, _entry.pack(start + len(data)), _header.size + count * _entry.size)
+        os.fdatasync(self._data_fd)
+        os.fdatasync(self._index_fd)
+        os.pwrite(self._index_fd, _header.pack(base, count + 1, generation), 0)
+
+    def truncate(self, height: int):
+        # keeps blocks up to and including height
+        base, count, generation = self._header()
+        keep = min(count, max(0, height - base + 1))
+        if keep != count:
+            os.pwrite(self._index_fd, _header.pack(base, keep, generation + 1), 0)
+
+    def clear(self):
+        base, count, generation = self._header()
+        if count != 0:
+            os.pwrite(self._index_fd, _header.pack(base, 0, generation + 1), 0)
+
+    def check(self) -> list[str]:
+        errors: list[str] = []
+        base, count, _ = self._header()
+        data_size = os.fstat(self._data_fd).st_size
+        previous_end = 0
+        previous_hash: Optional[str] = None
+        for index in range(count):
+            height = base + index
+            end = self._end_offset(index)
+            if end < previous_end or end > data_size:
+                errors.append(f"height {height}: bad offset {previous_end}-{end} (data size {data_size})")
+                break
+            data = self.get(height)
+            previous_end = end
+            if data is None:
+                errors.append(f"height {height}: unreadable")
+                continue
+            try:
+                block = Block.load(BytesIO(data))
+            except Exception as e:
+                errors.append(f"height {height}: failed to load: {e}")
+                previous_hash = None
+                continue
+            if block.height != height:
+                errors.append(f"height {height}: block has height {block.height}")
+            if block.dump() != data:
+                errors.append(f"height {height}: serialization mismatch")
+            if previous_hash is not None and str(block.previous_hash) != previous_hash:
+                errors.append(f"height {height}: previous hash {block.previous_hash} doesn't match {previous_hash}")
+            previous_hash = str(block.block_hash)
+        return errors
+
+    def close(self):
+        if self._index_map is not None:
+            self._index_map.close()
+        if self._data_map is not None:
+            self._data_map.close()
+        os.close(self._index_fd)
+        os.close(self._data_fd)
+
+
+async def _backfill(path: str, start: Optional[int]):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    import explorer # type: ignore # db has to be imported through explorer, like main.py does
+    from db import Database
+
+    async def print_message(msg: Any):
+        if msg.type == msg.Type.DatabaseError:
+            print(msg.data)
+
+    db = Database(server=os.environ["DB_HOST"], user=os.environ["DB_USER"], password=os.environ["DB_PASS"],
+                  database=os.environ["DB_DATABASE"], schema=os.environ["DB_SCHEMA"],
+                  redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
+                  redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
+                  redis_password=os.environ.get("REDIS_PASS"), block_store_path=path, message_callback=print_message)
+    await db.connect()
+    try:
+        if (latest := await db.get_latest_height()) is None:
+            print("no blocks in the database")
+            return
+        if start is None and not cast(BlockStore, db.block_store).heights:
+            start = 0
+        await db.fill_block_store(latest, start=start)
+        stored = cast(BlockStore, db.block_store).heights
+        print(f"stored {len(stored)} blocks ({stored.start} - {stored.stop - 1})")
+    finally:
+        await db.pool.close()
+
+
+if __name__ == "__main__":
+    # integrity check: python -m db.block_store <path>
+    # backfill from the database in .env: python -m db.block_store <path> --backfill [--start HEIGHT]
+    # only the explorer process may write to the store, stop it while backfilling
+    parser = argparse.ArgumentParser(prog="python -m db.block_store")
+    parser.add_argument("path", help="block store path")
+    parser.add_argument("--backfill", action="store_true",
+                        help="append the database blocks the store is missing, up to the latest height")
+    parser.add_argument("--start", type=int,
+                        help="with --backfill, first height to store, the store is rebuilt if it doesn't reach back "
+                             "that far (default: continue after the stored blocks, or 0 for an empty store)")
+    args = parser.parse_args()
+    if args.backfill:
+        asyncio.run(_backfill(args.path, args.start))
+        sys.exit(0)
+    store = BlockStore(args.path)
+    stored = store.heights
+    print(f"checking {len(stored)} blocks ({stored.start} - {stored.stop - 1})")
+    problems = store.check()
+    for problem in problems:
+        print(problem)
+    store.close()
+    sys.exit(1 if problems else 0)
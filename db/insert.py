@@ -17,6 +17,7 @@ from explorer.types import Message as ExplorerMessage
 from util.global_cache import global_mapping_cache
 from .base import DatabaseBase, profile
 from .util import DatabaseUtil
+from .validator import DatabaseValidator
 
 
 class _SupplyTracker:
@@ -55,6 +56,26 @@ class DatabaseInsert(DatabaseBase):
             "address_fee",
         ]
 
+    @staticmethod
+    async def _index_addresses(cur: psycopg.AsyncCursor[DictRow], addresses: set[str]):
+        # feeds the address prefix search index, reverts remove rows again, see DatabaseUtil._trim_address_index
+        if not addresses:
+            return
+        await cur.execute(
+            "INSERT INTO address_index (address) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING",
+            (sorted(addresses),)
+        )
+
+    @staticmethod
+    async def _insert_address_transitions(cur: psycopg.AsyncCursor[DictRow], addresses: set[str], transition_db_id: int):
+        if not addresses:
+            return
+        await cur.execute(
+            "INSERT INTO address_transition (address, transition_id) SELECT unnest(%s::text[]), %s",
+            (list(addresses), transition_db_id)
+        )
+        await DatabaseInsert._index_addresses(cur, addresses)
+
     @staticmethod
     async def _insert_future(cur: psycopg.AsyncCursor[DictRow], future: Future,
                              transition_output_future_db_id: Optional[int] = None, argument_db_id: Optional[int] = None,):
@@ -119,18 +140,10 @@ class DatabaseInsert(DatabaseBase):
                     (future_db_id, argument.type.name, plaintext.dump())
                 )
                 if isinstance(plaintext, LiteralPlaintext) and plaintext.literal.type == Literal.Type.Address:
-                    address = str(plaintext.literal.primitive)
-                    await cur.execute(
-                        "INSERT INTO address_transition (address, transition_id) VALUES (%s, %s)",
-                        (address, transition_db_id)
-                    )
+                    await DatabaseInsert._insert_address_transitions(cur, {str(plaintext.literal.primitive)}, transition_db_id)
                 elif isinstance(plaintext, StructPlaintext):
                     addresses = DatabaseUtil.get_addresses_from_struct(plaintext)
-                    for address in addresses:
-                        await cur.execute(
-                            "INSERT INTO address_transition (address, transition_id) VALUES (%s, %s)",
-                            (address, transition_db_id)
-                        )
+                    await DatabaseInsert._insert_address_transitions(cur, addresses, transition_db_id)
 
             elif isinstance(argument, FutureArgument):
                 await cur.execute(
@@ -265,18 +278,10 @@ class DatabaseInsert(DatabaseBase):
                 if transition_input.plaintext.value is not None:
                     plaintext = transition_input.plaintext.value
                     if isinstance(plaintext, LiteralPlaintext) and plaintext.literal.type == Literal.Type.Address:
-                        address = str(plaintext.literal.primitive)
-                        await cur.execute(
-                            "INSERT INTO address_transition (address, transition_id) VALUES (%s, %s)",
-                            (address, transition_db_id)
-                        )
+                        await DatabaseInsert._insert_address_transitions(cur, {str(plaintext.literal.primitive)}, transition_db_id)
                     elif isinstance(plaintext, StructPlaintext):
                         addresses = DatabaseUtil.get_addresses_from_struct(plaintext)
-                        for address in addresses:
-                            await cur.execute(
-                                "INSERT INTO address_transition (address, transition_id) VALUES (%s, %s)",
-                                (address, transition_db_id)
-                            )
+                        await DatabaseInsert._insert_address_transitions(cur, addresses, transition_db_id)
             elif isinstance(transition_input, PrivateTransitionInput):
                 await cur.execute(
                     "INSERT INTO transition_input_private (transition_input_id, ciphertext_hash, ciphertext) "
@@ -683,6 +688,10 @@ class DatabaseInsert(DatabaseBase):
         if (res := await cur.fetchone()) is None:
             raise Exception("failed to insert row into database")
         program_db_id = res["id"]
+        program_addresses = {aleo_explorer_rust.program_id_to_address(str(program.id))}
+        if transaction:
+            program_addresses.add(str(transaction.owner.address))
+        await DatabaseInsert._index_addresses(cur, program_addresses)
         for function in program.functions.values():
             inputs: list[str] = []
             input_modes: list[str] = []
@@ -784,10 +793,20 @@ class DatabaseInsert(DatabaseBase):
                 "key": key,
                 "value": value,
             }
+        bonded_index = {
+            DatabaseValidator._bonded_index_member(str(address), str(validator), amount): 0
+            for address, (validator, amount) in stakers.items()
+        }
         await self.redis.execute_command("MULTI") # type: ignore
         await self.redis.delete("credits.aleo:bonded")
         await self.redis.hset("credits.aleo:bonded", mapping={k: json.dumps(v) for k, v in bonded_mapping.items()})
         await self.redis.execute_command("EXEC") # type: ignore
+        # zadd parses its reply, so it can't be queued with MULTI like the commands above
+        pipe = self.redis.pipeline()
+        pipe.delete(DatabaseValidator.bonded_index_key)
+        if bonded_index:
+            pipe.zadd(DatabaseValidator.bonded_index_key, bonded_index)
+        await pipe.execute() # type: ignore
         await cur.execute(
             "INSERT INTO mapping_bonded_history (height, content) VALUES (%s, %s) RETURNING id",
             (height, json.dumps({str(i["key"]): i["value"].dump().hex() for i in global_mapping_cache[bonded_mapping_id].values()}))
@@ -833,6 +852,139 @@ class DatabaseInsert(DatabaseBase):
                 (committee_db_id, str(address), stake, bool(is_open), commission)
             )
 
+    @staticmethod
+    async def _save_network_summary(cur: psycopg.AsyncCursor[dict[str, Any]], block: Block, block_db_id: int,
+                                    solution_reward: int):
+        # summary endpoints read the latest row, the rolling windows only touch the last few minutes of rows
+        height = block.height
+        timestamp = block.header.metadata.timestamp
+        solution_count = 0 if block.solutions.value is None else len(block.solutions.value.solutions)
+        await cur.execute(
+            "SELECT b.proof_target, ns.validator_count, coalesce(ns.total_solution_count, 0) AS total_solution_count, "
+            "coalesce(ns.total_solution_reward, 0) AS total_solution_reward "
+            "FROM block b LEFT JOIN network_summary ns ON ns.height = b.height WHERE b.height = %s",
+            (height - 1,)
+        )
+        previous = await cur.fetchone()
+        if previous is None:
+            previous = {"proof_target": 0, "validator_count": None, "total_solution_count": 0, "total_solution_reward": 0}
+        solution_proof_target = solution_count * int(previous["proof_target"])
+
+        await cur.execute(
+            "SELECT count(*) AS validator_count, coalesce(sum(chm.stake), 0) AS committee_stake, "
+            "coalesce(sum(chm.stake) FILTER (WHERE bv.validator IS NOT NULL), 0) AS participating_stake "
+            "FROM committee_history ch "
+            "JOIN committee_history_member chm ON chm.committee_id = ch.id "
+            "LEFT JOIN block_validator bv ON bv.block_id = %s AND bv.validator = chm.address "
+            "WHERE ch.height = %s",
+            (block_db_id, height)
+        )
+        if (committee := await cur.fetchone()) is None:
+            raise RuntimeError("failed to retrieve committee stake")
+        validator_count = committee["validator_count"]
+        if validator_count == 0:
+            validator_count = previous["validator_count"] or 0
+
+        await cur.execute(
+            "SELECT coalesce(sum(solution_proof_target), 0) AS sum FROM network_summary WHERE timestamp > %s",
+            (timestamp - 900,)
+        )
+        if (res := await cur.fetchone()) is None:
+            raise RuntimeError("failed to retrieve network speed")
+        network_speed = (int(res["sum"]) + solution_proof_target) / 900
+        await cur.execute(
+            "SELECT coalesce(sum(committee_stake), 0) AS committee_stake, "
+            "coalesce(sum(participating_stake), 0) AS participating_stake "
+            "FROM network_summary WHERE timestamp > %s",
+            (timestamp - 300,)
+        )
+        if (res := await cur.fetchone()) is None:
+            raise RuntimeError("failed to retrieve participation rate")
+        committee_stake = int(res["committee_stake"]) + int(committee["committee_stake"])
+        participating_stake = int(res["participating_stake"]) + int(committee["participating_stake"])
+        participation_rate = participating_stake / committee_stake if committee_stake else 0
+
+        await cur.execute(
+            "INSERT INTO network_summary (height, timestamp, solution_count, solution_proof_target, solution_reward, "
+            "committee_stake, participating_stake, validator_count, total_solution_count, total_solution_reward, "
+            "network_speed, participation_rate) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            (height, timestamp, solution_count, solution_proof_target, solution_reward,
+             committee["committee_stake"], committee["participating_stake"], validator_count,
+             previous["total_solution_count"] + solution_count, int(previous["total_solution_reward"]) + solution_reward,
+             network_speed, participation_rate)
+        )
+
+    @staticmethod
+    async def _update_validator_uptime(cur: psycopg.AsyncCursor[dict[str, Any]], block: Block, block_db_id: int):
+        # slide the window: drop the blocks that fell out of it and add the new one
+        timestamp = block.header.metadata.timestamp
+        await cur.execute("SELECT timestamp FROM block WHERE height = %s", (block.height - 1,))
+        if (res := await cur.fetchone()) is not None:
+            expire_range = (res["timestamp"] - DatabaseValidator.uptime_window, timestamp - DatabaseValidator.uptime_window)
+            await cur.execute(
+                "UPDATE validator_uptime u SET signed = u.signed - c.count "
+                "FROM (SELECT validator, count(*) FROM block_validator bv "
+                "JOIN block b ON bv.block_id = b.id "
+                "WHERE b.timestamp > %s AND b.timestamp <= %s "
+                "GROUP BY validator) c "
+                "WHERE c.validator = u.validator",
+                expire_range
+            )
+            await cur.execute(
+                "UPDATE validator_uptime u SET committee = u.committee - c.count "
+                "FROM (SELECT chm.address, count(*) FROM committee_history_member chm "
+                "JOIN committee_history ch ON chm.committee_id = ch.id "
+                "JOIN block b ON ch.height = b.height "
+                "WHERE b.timestamp > %s AND b.timestamp <= %s "
+                "GROUP BY chm.address) c "
+                "WHERE c.address = u.validator",
+                expire_range
+            )
+        await cur.execute(
+            "INSERT INTO validator_uptime (validator, signed, committee) "
+            "SELECT validator, count(*), 0 FROM block_validator WHERE block_id = %s GROUP BY validator "
+            "ON CONFLICT (validator) DO UPDATE SET signed = validator_uptime.signed + excluded.signed",
+            (block_db_id,)
+        )
+        await cur.execute(
+            "INSERT INTO validator_uptime (validator, signed, committee) "
+            "SELECT chm.address, 0, count(*) FROM committee_history_member chm "
+            "JOIN committee_history ch ON chm.committee_id = ch.id "
+            "WHERE ch.height = %s GROUP BY chm.address "
+            "ON CONFLICT (validator) DO UPDATE SET committee = validator_uptime.committee + excluded.committee",
+            (block.height,)
+        )
+        await cur.execute("DELETE FROM validator_uptime WHERE signed = 0 AND committee = 0")
+
+    @staticmethod
+    async def _save_solution_minute(cur: psycopg.AsyncCursor[dict[str, Any]], block: Block,
+                                    solutions: list[tuple[Solution, int, int]]):
+        await cur.execute("SELECT proof_target FROM block WHERE height = %s", (block.height - 1,))
+        proof_target = 0 if (res := await cur.fetchone()) is None else int(res["proof_target"])
+        buckets: dict[str, tuple[int, int, int]] = defaultdict(lambda: (0, 0, 0))
+        for solution, target, reward in solutions:
+            address = str(solution.partial_solution.address)
+            count, target_sum, reward_sum = buckets[address]
+            buckets[address] = count + 1, target_sum + target, reward_sum + reward
+        if not buckets:
+            return
+        addresses = list(buckets.keys())
+        counts, target_sums, reward_sums = zip(*buckets.values())
+        await cur.execute(
+            "INSERT INTO solution_minute (address, minute, solution_count, target_sum, proof_target_sum, reward) "
+            "SELECT a.address, %s, a.solution_count, a.target_sum, a.solution_count * %s::numeric, a.reward "
+            "FROM unnest(%s::text[], %s::integer[], %s::numeric[], %s::bigint[]) "
+            "a(address, solution_count, target_sum, reward) "
+            "ON CONFLICT (address, minute) DO UPDATE SET "
+            "solution_count = solution_minute.solution_count + excluded.solution_count, "
+            "target_sum = solution_minute.target_sum + excluded.target_sum, "
+            "proof_target_sum = solution_minute.proof_target_sum + excluded.proof_target_sum, "
+            "reward = solution_minute.reward + excluded.reward",
+            (block.header.metadata.timestamp // 60, proof_target, addresses, list(counts), list(target_sums),
+             list(reward_sums))
+        )
+
     @staticmethod
     def _stakers_to_delegated(stakers: dict[Address, tuple[Address, u64]]):
         delegated: dict[Address, u64] = {}
@@ -1142,6 +1294,7 @@ class DatabaseInsert(DatabaseBase):
                     supply_tracker.mint(amount)
                     supply_tracker.tally_block_reward(amount)
                 await pipe.execute() # type: ignore
+                await self._index_addresses(cur, set(map(str, stake_rewards.keys())))
 
                 await self._update_committee_bonded_delegated_map(cur, committee_members, stakers, delegated, height)
                 starting_round = u64(round_)
@@ -1216,6 +1369,8 @@ class DatabaseInsert(DatabaseBase):
                 else:
                     print("redis backup exists, rolling back")
                     await redis_conn.copy(backup_key, key, replace=True) # type: ignore[arg-type]
+                    if key == "credits.aleo:bonded":
+                        await DatabaseValidator._rebuild_bonded_index(redis_conn)
 
     async def _redis_cleanup(self, redis_conn: Redis[str], keys: list[str], height: int, rollback: bool):
         if height != 0:
@@ -1229,6 +1384,8 @@ class DatabaseInsert(DatabaseBase):
                 if await redis_conn.exists(backup_key) == 1:
                     if rollback:
                         await redis_conn.copy(backup_key, key, replace=True) # type: ignore[arg-type]
+                        if key == "credits.aleo:bonded":
+                            await DatabaseValidator._rebuild_bonded_index(redis_conn)
                     else:
                         if history:
                             history_key = f"{key}:history:{height - 1}"
@@ -1297,8 +1454,9 @@ class DatabaseInsert(DatabaseBase):
                                 "INSERT INTO block (height, block_hash, previous_hash, previous_state_root, transactions_root, "
                                 "finalize_root, ratifications_root, solutions_root, subdag_root, round, cumulative_weight, "
                                 "cumulative_proof_target, coinbase_target, proof_target, last_coinbase_target, "
-                                "last_coinbase_timestamp, timestamp, block_reward, coinbase_reward, total_supply, confirm_timestamp) "
-                                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                                "last_coinbase_timestamp, timestamp, block_reward, coinbase_reward, total_supply, confirm_timestamp, "
+                                "transaction_count, partial_solution_count) "
+                                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
                                 "RETURNING id",
                                 (block.height, str(block.block_hash), str(block.previous_hash), str(block.header.previous_state_root),
                                  str(block.header.transactions_root), str(block.header.finalize_root), str(block.header.ratifications_root),
@@ -1306,7 +1464,9 @@ class DatabaseInsert(DatabaseBase):
                                  block.header.metadata.cumulative_weight, block.header.metadata.cumulative_proof_target,
                                  block.header.metadata.coinbase_target, block.header.metadata.proof_target,
                                  block.header.metadata.last_coinbase_target, block.header.metadata.last_coinbase_timestamp,
-                                 block.header.metadata.timestamp, block_reward, coinbase_reward, supply_tracker.supply, 0)
+                                 block.header.metadata.timestamp, block_reward, coinbase_reward, supply_tracker.supply, 0,
+                                 len(block.transactions.transactions),
+                                 0 if block.solutions.value is None else len(block.solutions.value.solutions))
                             ) # total supply will be rewritten after everything
                             if (res := await cur.fetchone()) is None:
                                 raise RuntimeError("failed to insert row into database")
@@ -1547,6 +1707,7 @@ class DatabaseInsert(DatabaseBase):
                                     raise NotImplementedError
 
                             address_puzzle_rewards: dict[str, int] = defaultdict(int)
+                            solution_reward = 0
 
                             if block.solutions.value is not None:
                                 prover_solutions = block.solutions.value.solutions
@@ -1575,12 +1736,15 @@ class DatabaseInsert(DatabaseBase):
                                         (puzzle_solution_db_id, str(solution.partial_solution.address), solution.partial_solution.counter,
                                          solution.target, reward, str(solution.partial_solution.epoch_hash), str(solution.partial_solution.solution_id))
                                     )
+                                    solution_reward += reward
                                     if reward > 0:
                                         address_puzzle_rewards[str(solution.partial_solution.address)] += reward
                                 if not os.environ.get("DEBUG_SKIP_COINBASE"):
                                     async with cur.copy("COPY solution (puzzle_solution_id, address, counter, target, reward, epoch_hash, solution_id) FROM STDIN") as copy:
                                         for row in copy_data:
                                             await copy.write_row(row)
+                                    await self._save_solution_minute(cur, block, solutions)
+                                    await self._index_addresses(cur, set(address_puzzle_rewards.keys()))
                                     for address, reward in address_puzzle_rewards.items():
                                         pipe = self.redis.pipeline()
                                         pipe.hincrby("address_puzzle_reward", address, reward)
@@ -1672,6 +1836,9 @@ class DatabaseInsert(DatabaseBase):
                                 write_mapping_debug(sorted(values, key=lambda x: x[0]), f"/tmp/mapping_debug/{block.height}/self/account")
 
 
+                            await self._save_network_summary(cur, block, block_db_id, solution_reward)
+                            await self._update_validator_uptime(cur, block, block_db_id)
+
                             await cur.execute(
                                 "UPDATE block SET total_supply = %s WHERE id = %s",
                                 (supply_tracker.supply, block_db_id)
@@ -1709,6 +1876,15 @@ class DatabaseInsert(DatabaseBase):
                             await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                             raise
                 signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+            # only after commit, readers fall back to the database for anything missing here
+            if self.block_store is not None:
+                try:
+                    # blocks left out by a crash or a failed append are filled in first, the store never restarts
+                    await cast("Database", self).fill_block_store(block.height - 1)
+                    self.block_store.append(block.height, block.dump())
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+            await self._publish_latest_block(block.height)
         except KeyboardInterrupt as e:
             import traceback
             print("Interrupted during block insert!")
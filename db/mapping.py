@@ -6,10 +6,16 @@ import psycopg.sql
 from aleo_types import *
 from aleo_types.cached import cached_get_mapping_id
 from explorer.types import Message as ExplorerMessage
+from node import Network
+from util.aleo_strings import string_from_u128_array_le
 from .base import DatabaseBase
+from .validator import DatabaseValidator
 
 
 class DatabaseMapping(DatabaseBase):
+
+    ans_index_mappings = ("names", "primary_names", "nft_owners")
+
     async def get_mapping_cache_with_cur(self, cur: psycopg.AsyncCursor[dict[str, Any]], program_name: str,
                                          mapping_name: str) -> dict[Field, Any]:
         if program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]:
@@ -173,6 +179,159 @@ class DatabaseMapping(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def _update_bonded_index(self, key_id: str, key: Optional[bytes], value: Optional[bytes]):
+        pipe = self.redis.pipeline()
+        if (previous := await self.redis.hget("credits.aleo:bonded", key_id)) is not None:
+            previous = json.loads(previous)
+            pipe.zrem(
+                DatabaseValidator.bonded_index_key,
+                DatabaseValidator._bonded_index_member_from_mapping(bytes.fromhex(previous["key"]), bytes.fromhex(previous["value"]))
+            )
+        if key is not None and value is not None:
+            pipe.zadd(DatabaseValidator.bonded_index_key, {DatabaseValidator._bonded_index_member_from_mapping(key, value): 0})
+        await pipe.execute() # type: ignore
+
+    @staticmethod
+    def _get_ans_index_row(mapping_name: str, key: bytes, value: bytes) -> tuple[str, ...]:
+        key_plaintext = Plaintext.load(BytesIO(key))
+        value_plaintext = cast(PlaintextValue, Value.load(BytesIO(value))).plaintext
+        if mapping_name == "names":
+            name_struct = cast(StructPlaintext, value_plaintext)
+            return (
+                str(cast(LiteralPlaintext, key_plaintext).literal.primitive),
+                string_from_u128_array_le(cast(ArrayPlaintext, name_struct["name"])),
+                str(cast(LiteralPlaintext, name_struct["parent"]).literal.primitive),
+            )
+        return (
+            str(cast(LiteralPlaintext, key_plaintext).literal.primitive),
+            str(cast(LiteralPlaintext, value_plaintext).literal.primitive),
+        )
+
+    @staticmethod
+    async def _update_ans_index(cur: psycopg.AsyncCursor[dict[str, Any]], mapping_name: str, key: bytes,
+                                value: Optional[bytes]):
+        # ans_name keeps the full dotted name of every name hash, so lookups never need to recompute hashes
+        key_field = str(cast(LiteralPlaintext, Plaintext.load(BytesIO(key))).literal.primitive)
+        if mapping_name == "names":
+            if value is None:
+                await cur.execute("DELETE FROM ans_name WHERE name_hash = %s", (key_field,))
+                await cur.execute(
+                    "WITH RECURSIVE t(name_hash) AS ("
+                    "  SELECT name_hash FROM ans_name WHERE parent = %s "
+                    "  UNION ALL "
+                    "  SELECT c.name_hash FROM ans_name c JOIN t ON c.parent = t.name_hash"
+                    ") "
+                    "UPDATE ans_name n SET full_name = NULL FROM t WHERE n.name_hash = t.name_hash",
+                    (key_field,)
+                )
+                return
+            name_hash, name, parent = DatabaseMapping._get_ans_index_row(mapping_name, key, value)
+            await cur.execute(
+                "INSERT INTO ans_name (name_hash, name, parent) VALUES (%s, %s, %s) "
+                "ON CONFLICT (name_hash) DO UPDATE SET name = excluded.name, parent = excluded.parent",
+                (name_hash, name, parent)
+            )
+            # also fixes up the subtree in case children were registered first
+            await cur.execute(
+                "WITH RECURSIVE t(name_hash, full_name) AS ("
+                "  SELECT n.name_hash, CASE WHEN n.parent = %s THEN n.name ELSE n.name || '.' || p.full_name END "
+                "  FROM ans_name n LEFT JOIN ans_name p ON p.name_hash = n.parent WHERE n.name_hash = %s "
+                "  UNION ALL "
+                "  SELECT c.name_hash, c.name || '.' || t.full_name FROM ans_name c JOIN t ON c.parent = t.name_hash"
+                ") "
+                "UPDATE ans_name n SET full_name = t.full_name FROM t WHERE n.name_hash = t.name_hash",
+                (str(Field(0)), name_hash)
+            )
+        elif mapping_name == "primary_names":
+            if value is None:
+                await cur.execute("DELETE FROM ans_primary_name WHERE address = %s", (key_field,))
+                return
+            address, name_hash = DatabaseMapping._get_ans_index_row(mapping_name, key, value)
+            await cur.execute(
+                "INSERT INTO ans_primary_name (address, name_hash) VALUES (%s, %s) "
+                "ON CONFLICT (address) DO UPDATE SET name_hash = excluded.name_hash",
+                (address, name_hash)
+            )
+        elif mapping_name == "nft_owners":
+            if value is None:
+                await cur.execute("DELETE FROM ans_nft_owner WHERE name_hash = %s", (key_field,))
+                return
+            name_hash, owner = DatabaseMapping._get_ans_index_row(mapping_name, key, value)
+            await cur.execute(
+                "INSERT INTO ans_nft_owner (name_hash, owner) VALUES (%s, %s) "
+                "ON CONFLICT (name_hash) DO UPDATE SET owner = excluded.owner",
+                (name_hash, owner)
+            )
+
+    @staticmethod
+    async def _rebuild_ans_index(cur: psycopg.AsyncCursor[dict[str, Any]]):
+        await cur.execute("TRUNCATE TABLE ans_name, ans_primary_name, ans_nft_owner")
+        await cur.execute(
+            "SELECT m.mapping, mv.key, mv.value FROM mapping_value mv "
+            "JOIN mapping m on mv.mapping_id = m.id "
+            "WHERE m.program_id = %s AND m.mapping = ANY(%s)",
+            (Network.ans_registry, list(DatabaseMapping.ans_index_mappings))
+        )
+        rows: dict[str, list[tuple[str, ...]]] = {x: [] for x in DatabaseMapping.ans_index_mappings}
+        for item in await cur.fetchall():
+            rows[item["mapping"]].append(DatabaseMapping._get_ans_index_row(item["mapping"], item["key"], item["value"]))
+        for mapping_name, table, columns in [
+            ("names", "ans_name", "name_hash, name, parent"),
+            ("primary_names", "ans_primary_name", "address, name_hash"),
+            ("nft_owners", "ans_nft_owner", "name_hash, owner"),
+        ]:
+            if not rows[mapping_name]:
+                continue
+            # noinspection SqlResolve
+            async with cur.copy(psycopg.sql.SQL("COPY {} ({}) FROM STDIN").format(
+                psycopg.sql.Identifier(table), psycopg.sql.SQL(columns)
+            )) as copy:
+                for row in rows[mapping_name]:
+                    await copy.write_row(row)
+        await cur.execute(
+            "WITH RECURSIVE t(name_hash, full_name) AS ("
+            "  SELECT name_hash, name FROM ans_name WHERE parent = %s "
+            "  UNION ALL "
+            "  SELECT c.name_hash, c.name || '.' || t.full_name FROM ans_name c JOIN t ON c.parent = t.name_hash"
+            ") "
+            "UPDATE ans_name n SET full_name = t.full_name FROM t WHERE n.name_hash = t.name_hash",
+            (str(Field(0)),)
+        )
+
+    async def get_ans_primary_names(self, addresses: list[str]) -> dict[str, str]:
+        # addresses without a resolvable primary name are left out
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT p.address, n.full_name FROM ans_primary_name p "
+                        "JOIN ans_name n ON n.name_hash = p.name_hash "
+                        "WHERE p.address = ANY(%s) AND n.full_name IS NOT NULL",
+                        (addresses,)
+                    )
+                    return {x["address"]: x["full_name"] for x in await cur.fetchall()}
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
+    async def get_ans_name_owner(self, name: str) -> Optional[str]:
+        # None if the name doesn't exist, empty string if it has no public owner
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
+                    await cur.execute(
+                        "SELECT o.owner FROM ans_name n "
+                        "LEFT JOIN ans_nft_owner o ON o.name_hash = n.name_hash "
+                        "WHERE n.full_name = %s",
+                        (name,)
+                    )
+                    if (res := await cur.fetchone()) is None:
+                        return None
+                    return res["owner"] or ""
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
     async def update_mapping_key_value(self, cur: psycopg.AsyncCursor[dict[str, Any]], program_name: str,
                                        mapping_name: str, mapping_id: str, key_id: str, value_id: str,
                                        key: bytes, value: bytes, height: int, from_transaction: bool):
@@ -184,6 +343,8 @@ class DatabaseMapping(DatabaseBase):
                     "key": key.hex(),
                     "value": value.hex(),
                 }
+                if mapping_name == "bonded":
+                    await self._update_bonded_index(key_id, key, value)
                 await conn.hset(f"{program_name}:{mapping_name}", key_id, json.dumps(data))
 
             if not limited_tracking or from_transaction:
@@ -200,6 +361,8 @@ class DatabaseMapping(DatabaseBase):
                         "ON CONFLICT (mapping_id, key_id) DO UPDATE SET value_id = %s, value = %s",
                         (mapping_id, key_id, value_id, key, value, value_id, value)
                     )
+                    if program_name == Network.ans_registry and mapping_name in self.ans_index_mappings:
+                        await self._update_ans_index(cur, mapping_name, key, value)
 
                 await cur.execute(
                     "SELECT last_history_id FROM mapping_history_last_id WHERE key_id = %s",
@@ -233,6 +396,8 @@ class DatabaseMapping(DatabaseBase):
             limited_tracking = program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]
             if limited_tracking:
                 conn = self.redis
+                if mapping_name == "bonded":
+                    await self._update_bonded_index(key_id, None, None)
                 await conn.hdel(f"{program_name}:{mapping_name}", key_id)
 
             if not limited_tracking or from_transaction:
@@ -246,6 +411,8 @@ class DatabaseMapping(DatabaseBase):
                         "DELETE FROM mapping_value WHERE mapping_id = %s AND key_id = %s",
                         (mapping_id, key_id)
                     )
+                    if program_name == Network.ans_registry and mapping_name in self.ans_index_mappings:
+                        await self._update_ans_index(cur, mapping_name, key, None)
 
                 await cur.execute(
                     "SELECT last_history_id FROM mapping_history_last_id WHERE key_id = %s",
@@ -9,7 +9,10 @@ from redis.asyncio.client import Redis
 
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
+from .address import DatabaseAddress
 from .base import DatabaseBase
+from .mapping import DatabaseMapping
+from .validator import DatabaseValidator
 
 
 class DatabaseMigrate(DatabaseBase):
@@ -26,6 +29,14 @@ class DatabaseMigrate(DatabaseBase):
             (7, self.migrate_7_rebuild_solution_id_index_with_ops),
             (8, self.migrate_8_fix_missing_fee_stats),
             (9, self.migrate_9_fix_object_orders),
+            (10, self.migrate_10_add_block_transaction_and_solution_count),
+            (11, self.migrate_11_add_network_summary),
+            (12, self.migrate_12_add_validator_uptime),
+            (13, self.migrate_13_add_solution_minute),
+            (14, self.migrate_14_build_validator_bonded_index),
+            (15, self.migrate_15_add_ans_index),
+            (16, self.migrate_16_add_address_index),
+            (17, self.migrate_17_add_search_prefix_indexes),
         ]
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
@@ -159,4 +170,203 @@ create table validator_info
 
     @staticmethod
     async def migrate_9_fix_object_orders(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
-        await conn.execute(cast(LiteralString, open("db/migrate_9.sql").read()))
\ No newline at end of file
+        await conn.execute(cast(LiteralString, open("db/migrate_9.sql").read()))
+
+    @staticmethod
+    async def migrate_10_add_block_transaction_and_solution_count(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "alter table block "
+                "add column transaction_count integer not null default 0, "
+                "add column partial_solution_count integer not null default 0"
+            )
+            await cur.execute(
+                "update block b set transaction_count = c.count "
+                "from (select block_id, count(*) from confirmed_transaction group by block_id) c "
+                "where c.block_id = b.id"
+            )
+            await cur.execute(
+                "update block b set partial_solution_count = c.count "
+                "from (select ps.block_id, count(*) from puzzle_solution ps "
+                "join solution s on s.puzzle_solution_id = ps.id group by ps.block_id) c "
+                "where c.block_id = b.id"
+            )
+
+    @staticmethod
+    async def migrate_11_add_network_summary(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await conn.execute("""
+create table network_summary
+(
+    height                bigint           not null
+        constraint network_summary_pk
+            primary key,
+    timestamp             bigint           not null,
+    solution_count        integer          not null,
+    solution_proof_target numeric(40, 0)   not null,
+    solution_reward       numeric(20, 0)   not null,
+    committee_stake       numeric(20, 0)   not null,
+    participating_stake   numeric(20, 0)   not null,
+    validator_count       integer          not null,
+    total_solution_count  bigint           not null,
+    total_solution_reward numeric(40, 0)   not null,
+    network_speed         double precision not null,
+    participation_rate    double precision not null
+)""")
+        await conn.execute("create index network_summary_timestamp_index on network_summary (timestamp)")
+        # same windows as _save_network_summary: solutions in the last 900 seconds, committee in the last 300 seconds
+        await conn.execute("""
+insert into network_summary
+with c as (
+    select ch.height,
+           count(*) as validator_count,
+           sum(chm.stake) as committee_stake,
+           coalesce(sum(chm.stake) filter (where bv.validator is not null), 0) as participating_stake
+    from committee_history ch
+    join committee_history_member chm on chm.committee_id = ch.id
+    join block b on b.height = ch.height
+    left join block_validator bv on bv.block_id = b.id and bv.validator = chm.address
+    group by ch.height
+), r as (
+    select ps.block_id, sum(s.reward) as reward
+    from puzzle_solution ps
+    join solution s on s.puzzle_solution_id = ps.id
+    group by ps.block_id
+), s as (
+    select b.height,
+           b.timestamp,
+           b.partial_solution_count as solution_count,
+           b.partial_solution_count * coalesce(lag(b.proof_target) over (order by b.height), 0) as solution_proof_target,
+           coalesce(r.reward, 0) as solution_reward,
+           coalesce(c.committee_stake, 0) as committee_stake,
+           coalesce(c.participating_stake, 0) as participating_stake,
+           c.validator_count,
+           count(c.validator_count) over (order by b.height) as committee_group
+    from block b
+    left join c on c.height = b.height
+    left join r on r.block_id = b.id
+)
+select height,
+       timestamp,
+       solution_count,
+       solution_proof_target,
+       solution_reward,
+       committee_stake,
+       participating_stake,
+       coalesce(max(validator_count) over (partition by committee_group), 0),
+       sum(solution_count) over (order by height),
+       sum(solution_reward) over (order by height),
+       sum(solution_proof_target) over (order by timestamp range between 899 preceding and current row) / 900,
+       coalesce(
+           (sum(participating_stake) over w)::double precision / nullif(sum(committee_stake) over w, 0),
+           0
+       )
+from s
+window w as (order by timestamp range between 299 preceding and current row)""")
+
+    @staticmethod
+    async def migrate_12_add_validator_uptime(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await conn.execute("""
+create table validator_uptime
+(
+    validator text   not null
+        constraint validator_uptime_pk
+            primary key,
+    signed    bigint not null,
+    committee bigint not null
+)""")
+        async with conn.cursor() as cur:
+            await DatabaseValidator._rebuild_validator_uptime(cur)
+
+    @staticmethod
+    async def migrate_13_add_solution_minute(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await conn.execute("""
+create table solution_minute
+(
+    address          text           not null,
+    minute           bigint         not null,
+    solution_count   integer        not null,
+    target_sum       numeric(40, 0) not null,
+    proof_target_sum numeric(40, 0) not null,
+    reward           bigint         not null,
+    constraint solution_minute_pk
+        primary key (address, minute)
+)""")
+        await conn.execute("create index solution_minute_minute_index on solution_minute (minute)")
+        async with conn.cursor() as cur:
+            await DatabaseAddress._rebuild_solution_minute(cur, 0)
+
+    @staticmethod
+    async def migrate_14_build_validator_bonded_index(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await DatabaseValidator._rebuild_bonded_index(redis)
+
+    @staticmethod
+    async def migrate_15_add_ans_index(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await conn.execute("""
+create table ans_name
+(
+    name_hash text not null
+        constraint ans_name_pk
+            primary key,
+    name      text not null,
+    parent    text not null,
+    full_name text
+)""")
+        await conn.execute("create index ans_name_parent_index on ans_name (parent)")
+        await conn.execute("create index ans_name_full_name_index on ans_name (full_name)")
+        await conn.execute("""
+create table ans_primary_name
+(
+    address   text not null
+        constraint ans_primary_name_pk
+            primary key,
+    name_hash text not null
+)""")
+        await conn.execute("""
+create table ans_nft_owner
+(
+    name_hash text not null
+        constraint ans_nft_owner_pk
+            primary key,
+    owner     text not null
+)""")
+        async with conn.cursor() as cur:
+            await DatabaseMapping._rebuild_ans_index(cur)
+
+    @staticmethod
+    async def migrate_16_add_address_index(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        # "C" collation so prefix LIKE can use the primary key index
+        await conn.execute("""
+create table address_index
+(
+    address text collate "C" not null
+        constraint address_index_pk
+            primary key
+)""")
+        await conn.execute(
+            "insert into address_index (address) "
+            "select address from address_transition "
+            "union select owner from program where owner is not null "
+            "union select address from program "
+            "on conflict do nothing"
+        )
+        for key in ["address_puzzle_reward", "address_stake_reward"]:
+            addresses: list[str] = []
+            async for address, _ in redis.hscan_iter(key, count=10000):
+                addresses.append(address)
+                if len(addresses) >= 10000:
+                    await conn.execute(
+                        "insert into address_index (address) select unnest(%s::text[]) on conflict do nothing",
+                        (addresses,)
+                    )
+                    addresses = []
+            if addresses:
+                await conn.execute(
+                    "insert into address_index (address) select unnest(%s::text[]) on conflict do nothing",
+                    (addresses,)
+                )
+
+    @staticmethod
+    async def migrate_17_add_search_prefix_indexes(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        await conn.execute("create index program_program_id_prefix_index on program (program_id text_pattern_ops)")
+        await conn.execute("drop index ans_name_full_name_index")
+        await conn.execute("create index ans_name_full_name_index on ans_name (full_name text_pattern_ops)")
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import base64
+import pickle
+
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
 from .base import DatabaseBase
@@ -255,6 +258,59 @@ class DatabaseProgram(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def _get_shared_program(self, program_id: str) -> tuple[Optional[str], Optional[Program]]:
+        # returns the current epoch (None when redis can't be reached) and the program stored in it
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(self.program_cache_epoch_key)
+            pipe.get(f"{self.program_cache_key}:{program_id}")
+            epoch, entry = await pipe.execute()
+        except Exception as e:
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+            return None, None
+        epoch = epoch or "0"
+        if entry is None:
+            return epoch, None
+        entry_epoch, data = entry.split(":", 1)
+        if entry_epoch != epoch:
+            return epoch, None
+        try:
+            return epoch, pickle.loads(base64.b64decode(data))
+        except Exception:
+            # written by a version of aleo_types that doesn't match ours, it is parsed again and replaced
+            return epoch, None
+
+    async def _set_shared_program(self, epoch: str, program_id: str, program: Program):
+        try:
+            data = base64.b64encode(pickle.dumps(program, pickle.HIGHEST_PROTOCOL)).decode()
+            await self.redis.set(f"{self.program_cache_key}:{program_id}", f"{epoch}:{data}",
+                                 ex=self.shared_program_cache_ttl)
+        except Exception as e:
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+
+    async def get_parsed_program(self, program_id: str) -> Optional[Program]:
+        # cached entries are only trusted while we are subscribed to reverts, see DatabaseBase._check_program_cache
+        self._start_latest_block_listener()
+        if self._latest_block_listening:
+            try:
+                return self._program_cache[program_id]
+            except KeyError:
+                pass
+        generation = self._program_cache_generation
+        # programs parsed by any process, tagged with the epoch they were read in. A revert moves the epoch before
+        # announcing the lower height, so a program read before the revert is never served after the announcement
+        epoch, program = await self._get_shared_program(program_id)
+        if program is None:
+            program_bytes = await self.get_program(program_id)
+            if program_bytes is None:
+                return None
+            program = Program.load(BytesIO(program_bytes))
+            if epoch is not None:
+                await self._set_shared_program(epoch, program_id, program)
+        # the cache was dropped while fetching, the program could come from before the revert
+        if self._latest_block_listening and generation == self._program_cache_generation:
+            self._program_cache[program_id] = program
+        return program
 
     async def get_program_leo_source_code(self, program_id: str) -> Optional[str]:
         async with self.pool.connection() as conn:
@@ -1,7 +1,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 from explorer.types import Message as ExplorerMessage
 from .base import DatabaseBase
@@ -9,26 +9,90 @@ from .base import DatabaseBase
 
 class DatabaseSearch(DatabaseBase):
 
+    search_limit = 50
+    search_min_length = 3
+    # query prefix, result type, minimum query length
+    search_kinds: list[tuple[str, str, int]] = [
+        ("ab1", "blocks", 6),
+        ("at1", "transactions", 6),
+        ("au1", "transitions", 6),
+        ("aleo1", "addresses", 8),
+        ("solution1", "solutions", 12),
+    ]
 
-    async def search_block_hash(self, block_hash: str) -> list[str]:
+    # the prefix indexes are text_pattern_ops, ordering by their ~<~ operator lets LIMIT stop the index scan early
+    # instead of sorting every match in the database collation
+
+    @staticmethod
+    def _like_prefix(prefix: str) -> str:
+        return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    async def search(self, query: str) -> dict[str, Any]:
+        """
+        Prefix search over every identifier kind. The query prefix picks the kind, anything else is looked up
+        as program id and ANS name. Every kind returns at most search_limit results, exact matches first.
+
+        @return: {"type": ..., <type>: [...], "too_many": bool}, in the format of the webapi search route
+        @raise ValueError: query is shorter than the minimum length for its kind
+        """
+        if len(query) < self.search_min_length:
+            raise ValueError("Query too short")
+        limit = self.search_limit + 1
+        for prefix, type_, min_length in self.search_kinds:
+            if not query.startswith(prefix):
+                continue
+            if len(query) < min_length:
+                raise ValueError("Query too short")
+            match type_:
+                case "blocks":
+                    results = await self.search_block_hash(query, limit)
+                case "transactions":
+                    results = await self.search_transaction_id(query, limit)
+                case "transitions":
+                    results = await self.search_transition_id(query, limit)
+                case "addresses":
+                    results = await self.search_address(query, limit)
+                case "solutions":
+                    results = await self.search_solution(query, limit)
+                case _:
+                    raise NotImplementedError
+            return {"type": type_, type_: results[:self.search_limit], "too_many": len(results) > self.search_limit}
+        programs = await self.search_program(query, limit)
+        names = await self.search_ans_name(query, limit)
+        return {
+            "type": "ans_program",
+            "programs": programs[:self.search_limit],
+            "names": names[:self.search_limit],
+            "too_many": len(programs) > self.search_limit or len(names) > self.search_limit,
+        }
+
+    async def search_block_hash(self, block_hash: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT block_hash FROM block WHERE block_hash LIKE %s", (f"{block_hash}%",))
+                    await cur.execute(
+                        "SELECT block_hash FROM block WHERE block_hash LIKE %s ORDER BY block_hash USING ~<~ LIMIT %s",
+                        (self._like_prefix(block_hash), limit)
+                    )
                     result = await cur.fetchall()
                     return list(map(lambda x: x['block_hash'], result))
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def search_transaction_id(self, transaction_id: str) -> list[str]:
+    async def search_transaction_id(self, transaction_id: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
+                    # separate branches so each one is a bounded scan on its own index
                     await cur.execute(
-                        "SELECT transaction_id FROM transaction "
-                        "WHERE transaction_id LIKE %s OR original_transaction_id LIKE %s",
-                        (f"{transaction_id}%", f"{transaction_id}%")
+                        "(SELECT transaction_id FROM transaction WHERE transaction_id LIKE %s "
+                        " ORDER BY transaction_id USING ~<~ LIMIT %s) "
+                        "UNION "
+                        "(SELECT transaction_id FROM transaction WHERE original_transaction_id LIKE %s "
+                        " ORDER BY original_transaction_id USING ~<~ LIMIT %s) "
+                        "ORDER BY transaction_id USING ~<~ LIMIT %s",
+                        (self._like_prefix(transaction_id), limit, self._like_prefix(transaction_id), limit, limit)
                     )
                     result = await cur.fetchall()
                     return list(map(lambda x: x['transaction_id'], result))
@@ -36,11 +100,14 @@ class DatabaseSearch(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def search_transition_id(self, transition_id: str) -> list[str]:
+    async def search_transition_id(self, transition_id: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT transition_id FROM transition WHERE transition_id LIKE %s", (f"{transition_id}%",))
+                    await cur.execute(
+                        "SELECT transition_id FROM transition WHERE transition_id LIKE %s ORDER BY transition_id USING ~<~ LIMIT %s",
+                        (self._like_prefix(transition_id), limit)
+                    )
                     result = await cur.fetchall()
                     return list(map(lambda x: x['transition_id'], result))
                 except Exception as e:
@@ -48,62 +115,68 @@ class DatabaseSearch(DatabaseBase):
                     raise
 
 
-    async def search_address(self, address: str) -> list[str]:
+    async def search_address(self, address: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    puzzle_rewards = await self.redis.hgetall("address_puzzle_reward")
-                    res = set(filter(lambda x: x.startswith(address), puzzle_rewards.keys()))
-                    stake_rewards = await self.redis.hgetall("address_stake_reward")
-                    res.update(set(filter(lambda x: x.startswith(address), stake_rewards.keys())))
-                    await cur.execute(
-                        "SELECT DISTINCT owner FROM program WHERE owner LIKE %s", (f"{address}%",)
-                    )
-                    res.update(set(map(lambda x: x['owner'], await cur.fetchall())))
+                    # the column is collate "C", so the primary key already has the byte order
                     await cur.execute(
-                        "SELECT DISTINCT address FROM address_transition WHERE address LIKE %s", (f"{address}%",)
+                        "SELECT address FROM address_index WHERE address LIKE %s ORDER BY address LIMIT %s",
+                        (self._like_prefix(address), limit)
                     )
-                    res.update(set(map(lambda x: x['address'], await cur.fetchall())))
-                    await cur.execute(
-                        "SELECT address FROM program WHERE address LIKE %s", (f"{address}%",)
-                    )
-                    res.update(set(map(lambda x: x['address'], await cur.fetchall())))
-                    return list(res)
+                    return list(map(lambda x: x['address'], await cur.fetchall()))
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def search_program(self, program_id: str) -> list[str]:
+    async def search_program(self, program_id: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
+                    # the first matches in index order, shown shortest (closest) first
                     await cur.execute(
-                        "SELECT program_id FROM program WHERE program_id LIKE %s", (f"{program_id}%",)
+                        "SELECT program_id FROM ("
+                        "  SELECT program_id FROM program WHERE program_id LIKE %s "
+                        "  ORDER BY program_id USING ~<~ LIMIT %s"
+                        ") p ORDER BY length(program_id), program_id USING ~<~",
+                        (self._like_prefix(program_id), limit)
                     )
                     return list(map(lambda x: x['program_id'], await cur.fetchall()))
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def search_solution(self, solution_id: str) -> list[str]:
-        """
-        @return: block height if solution exists
-        """
+    async def search_ans_name(self, name: str, limit: int = 100) -> list[str]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
+                    # the first matches in index order, shown shortest (closest) first
                     await cur.execute(
-                        "SELECT solution_id FROM block_aborted_solution_id "
-                        "WHERE solution_id LIKE %s",
-                        (f"{solution_id}%",)
+                        "SELECT full_name FROM ("
+                        "  SELECT full_name FROM ans_name WHERE full_name LIKE %s "
+                        "  ORDER BY full_name USING ~<~ LIMIT %s"
+                        ") n ORDER BY length(full_name), full_name USING ~<~",
+                        (self._like_prefix(name), limit)
                     )
-                    res = list(map(lambda x: x["solution_id"], await cur.fetchall()))
+                    return list(map(lambda x: x['full_name'], await cur.fetchall()))
+                except Exception as e:
+                    await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                    raise
+
+    async def search_solution(self, solution_id: str, limit: int = 100) -> list[str]:
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                try:
                     await cur.execute(
-                        "SELECT solution_id FROM solution WHERE solution_id LIKE %s",
-                        (f"{solution_id}%",)
+                        "(SELECT solution_id FROM block_aborted_solution_id WHERE solution_id LIKE %s "
+                        " ORDER BY solution_id USING ~<~ LIMIT %s) "
+                        "UNION ALL "
+                        "(SELECT solution_id FROM solution WHERE solution_id LIKE %s "
+                        " ORDER BY solution_id USING ~<~ LIMIT %s) "
+                        "ORDER BY solution_id USING ~<~ LIMIT %s",
+                        (self._like_prefix(solution_id), limit, self._like_prefix(solution_id), limit, limit)
                     )
-                    res.extend(map(lambda x: x["solution_id"], await cur.fetchall()))
-                    return res
+                    return list(map(lambda x: x["solution_id"], await cur.fetchall()))
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -2,18 +2,70 @@ from __future__ import annotations
 
 import signal
 
+import psycopg
 from aleo_explorer_rust import get_value_id
+from redis.asyncio import Redis
 
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
+from .address import DatabaseAddress
 from .base import DatabaseBase
 from .block import DatabaseBlock
+from .mapping import DatabaseMapping
+from .validator import DatabaseValidator
 
 
 class DatabaseUtil(DatabaseBase):
 
     redis_keys: list[str]
 
+    # redis hashes whose fields are fed to address_index next to address_transition and program
+    address_index_reward_keys = ["address_puzzle_reward", "address_stake_reward"]
+
+    @staticmethod
+    async def _get_new_hash_fields(redis: Redis[str], key: str, backup_key: str) -> set[str]:
+        # fields of key missing from its backup. The reward hashes only ever gain fields, so the length difference
+        # is the number to find and the scan stops once they are all found
+        missing = await redis.hlen(key) - await redis.hlen(backup_key) # type: ignore[misc]
+        fields: set[str] = set()
+        batch: list[str] = []
+
+        async def check_batch():
+            values: list[Optional[str]] = await redis.hmget(backup_key, batch) # type: ignore
+            fields.update(field for field, value in zip(batch, values) if value is None)
+            batch.clear()
+
+        if missing <= 0:
+            return fields
+        async for field, _ in redis.hscan_iter(key, count=10000):
+            batch.append(field)
+            if len(batch) >= 10000:
+                await check_batch()
+                if len(fields) >= missing:
+                    return fields
+        if batch:
+            await check_batch()
+        return fields
+
+    @staticmethod
+    async def _trim_address_index(cur: psycopg.AsyncCursor[dict[str, Any]], redis: Redis[str], addresses: set[str]):
+        # removes the given addresses from address_index unless a transition, a program or a reward still has them
+        if not addresses:
+            return
+        candidates = sorted(addresses)
+        rewarded: set[str] = set()
+        for key in DatabaseUtil.address_index_reward_keys:
+            values: list[Optional[str]] = await redis.hmget(key, candidates) # type: ignore
+            rewarded.update(address for address, value in zip(candidates, values) if value is not None)
+        await cur.execute(
+            "DELETE FROM address_index a "
+            "WHERE a.address = ANY(%s::text[]) AND a.address <> ALL(%s::text[]) "
+            "AND NOT EXISTS (SELECT 1 FROM address_transition at WHERE at.address = a.address) "
+            "AND NOT EXISTS (SELECT 1 FROM program p WHERE p.owner = a.address) "
+            "AND NOT EXISTS (SELECT 1 FROM program p WHERE p.address = a.address)",
+            (candidates, sorted(rewarded))
+        )
+
     @staticmethod
     def get_addresses_from_struct(plaintext: StructPlaintext):
         addresses: set[str] = set()
@@ -43,7 +95,13 @@ class DatabaseUtil(DatabaseBase):
                 await conn.execute("TRUNCATE TABLE mapping_committee_history RESTART IDENTITY CASCADE")
                 await conn.execute("TRUNCATE TABLE mapping_delegated_history RESTART IDENTITY CASCADE")
                 await conn.execute("TRUNCATE TABLE ratification_genesis_balance RESTART IDENTITY CASCADE")
+                await conn.execute("TRUNCATE TABLE network_summary")
+                await conn.execute("TRUNCATE TABLE validator_uptime")
+                await conn.execute("TRUNCATE TABLE solution_minute")
+                await conn.execute("TRUNCATE TABLE ans_name, ans_primary_name, ans_nft_owner")
+                await conn.execute("TRUNCATE TABLE address_index")
                 await self.redis.flushall()
+                await self._publish_latest_block(0)
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                 raise
@@ -110,6 +168,7 @@ class DatabaseUtil(DatabaseBase):
                             async with cur.copy("COPY mapping_history_last_id (key_id, last_history_id) FROM STDIN") as copy:
                                 for item in mapping_history_last_id_copy_data:
                                     await copy.write_row(item)
+                        await DatabaseMapping._rebuild_ans_index(cur)
                         await cur.execute(
                             "DELETE FROM mapping_history WHERE height > %s",
                             (last_backup_height,)
@@ -127,8 +186,18 @@ class DatabaseUtil(DatabaseBase):
                             (last_backup_height,)
                         )
 
+                        # address_index entries that may have lost their last source. Reverted transactions are
+                        # kept as unconfirmed ones, so the addresses of their transitions stay indexed
+                        unindexed: set[str] = set()
+                        for redis_key in self.address_index_reward_keys:
+                            unindexed.update(await self._get_new_hash_fields(
+                                self.redis, redis_key, f"{redis_key}:history:{last_backup_height}"
+                            ))
+
                         print("fetching blocks to revert")
-                        blocks_to_revert = await DatabaseBlock.get_full_block_range(u32.max, last_backup_height, conn)
+                        blocks_to_revert = await DatabaseBlock.get_stored_block_range(self.block_store, u32.max, last_backup_height, conn)
+                        if blocks_to_revert is None:
+                            blocks_to_revert = await DatabaseBlock.get_full_block_range(u32.max, last_backup_height, conn)
                         for block in blocks_to_revert:
                             print("reverting block", block.height)
                             for ct in block.transactions:
@@ -172,9 +241,11 @@ class DatabaseUtil(DatabaseBase):
                                     transitions = [fee.transition]
                                     program = t.deployment.program
                                     await cur.execute(
-                                        "DELETE FROM program WHERE program_id = %s",
+                                        "DELETE FROM program WHERE program_id = %s RETURNING owner, address",
                                         (str(program.id),)
                                     )
+                                    for res in await cur.fetchall():
+                                        unindexed.update(x for x in (res["owner"], res["address"]) if x is not None)
                                     await cur.execute(
                                         "DELETE FROM mapping WHERE program_id = %s",
                                         (str(program.id),)
@@ -208,6 +279,15 @@ class DatabaseUtil(DatabaseBase):
                             "DELETE FROM committee_history WHERE height > %s",
                             (last_backup_height,)
                         )
+                        await cur.execute(
+                            "DELETE FROM network_summary WHERE height > %s",
+                            (last_backup_height,)
+                        )
+                        await DatabaseValidator._rebuild_validator_uptime(cur)
+                        await cur.execute("SELECT timestamp FROM block WHERE height = %s", (last_backup_height,))
+                        if (res := await cur.fetchone()) is None:
+                            raise RuntimeError("failed to find last backup block")
+                        await DatabaseAddress._rebuild_solution_minute(cur, res["timestamp"] // 60)
 
                         for redis_key in self.redis_keys:
                             backup_key = f"{redis_key}:history:{last_backup_height}"
@@ -219,9 +299,14 @@ class DatabaseUtil(DatabaseBase):
                             _, keys = await self.redis.scan(0, f"{redis_key}:rollback_backup:*", 100)
                             for key in keys:
                                 await self.redis.delete(key)
+                        await DatabaseValidator._rebuild_bonded_index(self.redis)
+                        await self._trim_address_index(cur, self.redis, unindexed)
 
                     except Exception as e:
                         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                         signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
                         raise
+        if self.block_store is not None:
+            self.block_store.truncate(last_backup_height)
+        await self._publish_latest_block(last_backup_height)
         signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
\ No newline at end of file
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import psycopg
+from psycopg.rows import DictRow
+from redis.asyncio import Redis
+
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
 from .base import DatabaseBase
@@ -7,6 +11,65 @@ from .base import DatabaseBase
 
 class DatabaseValidator(DatabaseBase):
 
+    # validator_uptime holds the signed / in committee block counts of the 24 hours before the latest block
+    uptime_window = 86400
+
+    # the credits.aleo bonded mapping indexed by validator, members are "{validator}:{u64.max - amount:020}:{staker}"
+    # with equal scores so ZRANGEBYLEX pages through one validator's stakers sorted by amount, largest first.
+    # it's derived from the credits.aleo:bonded hash and rebuilt wherever that hash is restored from a backup
+    bonded_index_key = "validator_bonded_index"
+
+    @staticmethod
+    def _bonded_index_member(staker: str, validator: str, amount: int) -> str:
+        return f"{validator}:{u64.max - amount:020}:{staker}"
+
+    @staticmethod
+    def _bonded_index_member_from_mapping(key: bytes, value: bytes) -> str:
+        staker = cast(LiteralPlaintext, Plaintext.load(BytesIO(key))).literal.primitive
+        bond_state = cast(StructPlaintext, cast(PlaintextValue, Value.load(BytesIO(value))).plaintext)
+        validator = cast(LiteralPlaintext, bond_state["validator"]).literal.primitive
+        amount = cast(LiteralPlaintext, bond_state["microcredits"]).literal.primitive
+        return DatabaseValidator._bonded_index_member(str(staker), str(validator), int(cast(u64, amount)))
+
+    @staticmethod
+    async def _rebuild_bonded_index(redis_conn: Redis[str]):
+        data = await redis_conn.hgetall("credits.aleo:bonded")
+        members: dict[str, int] = {}
+        for d in data.values():
+            d = json.loads(d)
+            members[DatabaseValidator._bonded_index_member_from_mapping(bytes.fromhex(d["key"]), bytes.fromhex(d["value"]))] = 0
+        pipe = redis_conn.pipeline()
+        pipe.delete(DatabaseValidator.bonded_index_key)
+        if members:
+            pipe.zadd(DatabaseValidator.bonded_index_key, members)
+        await pipe.execute() # type: ignore
+
+    @staticmethod
+    async def _rebuild_validator_uptime(cur: psycopg.AsyncCursor[DictRow]):
+        await cur.execute("DELETE FROM validator_uptime")
+        await cur.execute("SELECT timestamp FROM block ORDER BY height DESC LIMIT 1")
+        if (res := await cur.fetchone()) is None:
+            return
+        since = res["timestamp"] - DatabaseValidator.uptime_window
+        await cur.execute(
+            "INSERT INTO validator_uptime (validator, signed, committee) "
+            "SELECT validator, count(*), 0 FROM block_validator bv "
+            "JOIN block b ON bv.block_id = b.id "
+            "WHERE b.timestamp > %s "
+            "GROUP BY validator",
+            (since,)
+        )
+        await cur.execute(
+            "INSERT INTO validator_uptime (validator, signed, committee) "
+            "SELECT chm.address, 0, count(*) FROM committee_history_member chm "
+            "JOIN committee_history ch ON chm.committee_id = ch.id "
+            "JOIN block b ON ch.height = b.height "
+            "WHERE b.timestamp > %s "
+            "GROUP BY chm.address "
+            "ON CONFLICT (validator) DO UPDATE SET committee = excluded.committee",
+            (since,)
+        )
+
     async def get_validator_count_at_height(self, height: int) -> Optional[int]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
@@ -39,32 +102,40 @@ class DatabaseValidator(DatabaseBase):
                         (height, end - start, start)
                     )
                     validators = await cur.fetchall()
-                    print(start, end)
-                    await cur.execute("SELECT timestamp FROM block WHERE height = %s", (height,))
-                    res = await cur.fetchone()
-                    if res:
-                        timestamp = res["timestamp"]
+                    if height == await cast("Database", self).get_latest_height():
+                        await cur.execute(
+                            "SELECT validator, signed, committee FROM validator_uptime WHERE validator = ANY(%s)",
+                            ([v["address"] for v in validators],)
+                        )
+                        res = await cur.fetchall()
+                        validator_counts = {v["validator"]: v["signed"] for v in res}
+                        validator_in_counts = {v["validator"]: v["committee"] for v in res if v["committee"]}
                     else:
-                        return []
-                    await cur.execute(
-                        "SELECT validator, count(validator) FROM block_validator bv "
-                        "JOIN block b ON bv.block_id = b.id "
-                        "WHERE b.timestamp > %s "
-                        "GROUP BY validator",
-                        (timestamp - 86400,)
-                    )
-                    res = await cur.fetchall()
-                    validator_counts = {v["validator"]: v["count"] for v in res}
-                    await cur.execute(
-                        "SELECT address, count(chm.address) FROM committee_history_member chm "
-                        "JOIN committee_history ch ON chm.committee_id = ch.id "
-                        "JOIN block b ON ch.height = b.height "
-                        "WHERE b.timestamp > %s "
-                        "GROUP BY address",
-                        (timestamp - 86400,)
-                    )
-                    res = await cur.fetchall()
-                    validator_in_counts = {v["address"]: v["count"] for v in res}
+                        await cur.execute("SELECT timestamp FROM block WHERE height = %s", (height,))
+                        res = await cur.fetchone()
+                        if res:
+                            timestamp = res["timestamp"]
+                        else:
+                            return []
+                        await cur.execute(
+                            "SELECT validator, count(validator) FROM block_validator bv "
+                            "JOIN block b ON bv.block_id = b.id "
+                            "WHERE b.timestamp > %s "
+                            "GROUP BY validator",
+                            (timestamp - self.uptime_window,)
+                        )
+                        res = await cur.fetchall()
+                        validator_counts = {v["validator"]: v["count"] for v in res}
+                        await cur.execute(
+                            "SELECT address, count(chm.address) FROM committee_history_member chm "
+                            "JOIN committee_history ch ON chm.committee_id = ch.id "
+                            "JOIN block b ON ch.height = b.height "
+                            "WHERE b.timestamp > %s "
+                            "GROUP BY address",
+                            (timestamp - self.uptime_window,)
+                        )
+                        res = await cur.fetchall()
+                        validator_in_counts = {v["address"]: v["count"] for v in res}
                     for validator in validators:
                         validator["uptime"] = validator_counts.get(validator["address"], 0) / validator_in_counts.get(validator["address"], 1)
 
@@ -77,48 +148,28 @@ class DatabaseValidator(DatabaseBase):
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute("SELECT timestamp FROM block ORDER BY height DESC LIMIT 1")
-                    res = await cur.fetchone()
-                    if res:
-                        timestamp = res["timestamp"]
-                    else:
-                        return None
-                    await cur.execute(
-                        "SELECT count(validator) FROM block_validator bv "
-                        "JOIN block b ON bv.block_id = b.id "
-                        "WHERE b.timestamp > %s AND validator = %s",
-                        (timestamp - 86400, address)
-                    )
+                    await cur.execute("SELECT signed, committee FROM validator_uptime WHERE validator = %s", (address,))
                     res = await cur.fetchone()
-                    if res:
-                        validator_counts = res["count"]
-                    else:
-                        validator_counts = 0
-                    await cur.execute(
-                        "SELECT height FROM block WHERE timestamp > %s ORDER BY timestamp LIMIT 1",
-                        (timestamp - 86400,)
-                    )
-                    res = await cur.fetchone()
-                    if res:
-                        height = res["height"]
-                    else:
-                        return None
-                    await cur.execute(
-                        "SELECT count(chm.address) FROM committee_history_member chm "
-                        "JOIN committee_history ch ON chm.committee_id = ch.id "
-                        "WHERE ch.height > %s AND chm.address = %s",
-                        (height, address)
-                    )
-                    res = await cur.fetchone()
-                    if res:
-                        block_count = res["count"]
-                    else:
+                    if res is None or res["committee"] == 0:
                         return None
-                    return validator_counts / block_count
+                    return res["signed"] / res["committee"]
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def get_validator_bonded_stakers(self, validator: str, start: int, end: int) -> list[tuple[str, int]]:
+        data = await self.redis.zrangebylex(
+            self.bonded_index_key, f"[{validator}:", f"({validator};", start, end - start
+        )
+        stakers: list[tuple[str, int]] = []
+        for member in data:
+            _, inverted_amount, staker = member.split(":")
+            stakers.append((staker, u64.max - int(inverted_amount)))
+        return stakers
+
+    async def get_validator_bonded_staker_count(self, validator: str) -> int:
+        return await self.redis.zlexcount(self.bonded_index_key, f"[{validator}:", f"({validator};")
+
     async def get_current_validator_count(self) -> int:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
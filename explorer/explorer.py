@@ -26,6 +26,7 @@ class Explorer:
                            redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
                            redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
                            redis_password=os.environ.get("REDIS_PASS"),
+                           block_store_path=os.environ.get("BLOCK_STORE_PATH"),
                            message_callback=self.message)
 
         # states
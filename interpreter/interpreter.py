@@ -5,7 +5,7 @@ from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
 from db import Database
 from interpreter.finalizer import execute_finalizer, ExecuteError, mapping_cache_read, profile
 from interpreter.utils import FinalizeState
-from util.global_cache import global_mapping_cache, global_program_cache, MappingCacheDict, get_program
+from util.global_cache import global_mapping_cache, MappingCacheDict, get_program
 
 
 async def init_builtin_program(db: Database, program: Program):
@@ -238,14 +238,9 @@ async def get_mapping_value(db: Database, program_id: str, mapping_name: str, ke
     mapping_id = Field.loads(cached_get_mapping_id(program_id, mapping_name))
     if mapping_id not in global_mapping_cache:
         global_mapping_cache[mapping_id] = await mapping_cache_read(db, program_id, mapping_name)
-    if str(program_id) in global_program_cache:
-        program = global_program_cache[str(program_id)]
-    else:
-        program_bytes = await db.get_program(str(program_id))
-        if program_bytes is None:
-            raise RuntimeError("program not found")
-        program = Program.load(BytesIO(program_bytes))
-        global_program_cache[str(program_id)] = program
+    program = await get_program(db, program_id)
+    if program is None:
+        raise RuntimeError("program not found")
     mapping = program.mappings[Identifier(value=mapping_name)]
     mapping_key_type = mapping.key.plaintext_type
     if not isinstance(mapping_key_type, LiteralPlaintextType):
@@ -1,8 +1,15 @@
+from __future__ import annotations
+
 import asyncio
 import functools
+import json
+import os
 import time
-from collections import defaultdict
+import uuid
+from typing import NamedTuple, Optional
 
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
 from starlette.types import ASGIApp, Message, Scope, Receive, Send
@@ -18,79 +25,232 @@ COST_UNKNOWN = -2
 class QuotaExceeded(Exception):
     pass
 
+class LocalLease:
+    # a call lease a worker keeps after the call ends, so the client's next calls skip redis
+    def __init__(self, call_id: str, quota: float, expires: float):
+        self.call_id = call_id
+        self.quota = quota
+        self.spent = 0.0
+        self.expires = expires
+        self.busy = True
+
+class QuotaTier(NamedTuple):
+    max_call_time: float = 5.0
+    recover_rate: float = 0.1
+    max_concurrency: int = 10
+
+    @property
+    def concurrency_penalty(self) -> float:
+        return self.max_call_time / self.max_concurrency
+
+# Every client has a bucket of call time (seconds) that refills at recover_rate while it has no call running.
+# A call reserves concurrency_penalty up front and is charged its real duration when it ends.
+# The buckets live in redis so all workers share them, and both scripts use the redis clock for the same reason.
+# Running calls are leases in a sorted set scored by their expiry, so the calls of a worker that dies without
+# ending them stop counting against the client once the longest they could have run has passed.
+# A worker keeps the lease of a client's call for local_lease_seconds after it ends and serves the client's next calls
+# on it one at a time without redis, then ends it once with their total cost. Meanwhile the lease holds one of the
+# client's concurrency slots and the bucket doesn't refill, and other workers see the spent time only when it ends,
+# at most about local_lease_seconds of call time per worker.
+
+# KEYS[1] bucket, KEYS[2] calls, ARGV max_call_time, recover_rate, concurrency_penalty, max_concurrency, ttl,
+# call id, lease margin
+_start_call_script = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local max_call_time = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'remaining', 'last_call')
+local remaining = tonumber(state[1]) or max_call_time
+local last_call = tonumber(state[2]) or -1
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local outstanding = redis.call('ZCARD', KEYS[2])
+local quota = remaining
+if outstanding == 0 and last_call ~= -1 then
+    quota = math.min(max_call_time, remaining + (now - last_call) * tonumber(ARGV[2]))
+end
+if outstanding >= tonumber(ARGV[4]) or quota - tonumber(ARGV[3]) < 0 then
+    return {0, tostring(quota)}
+end
+redis.call('HSET', KEYS[1], 'remaining', quota - tonumber(ARGV[3]), 'last_call', now)
+redis.call('ZADD', KEYS[2], now + quota + tonumber(ARGV[7]), ARGV[6])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return {1, tostring(quota)}
+"""
+
+# KEYS[1] bucket, KEYS[2] calls, ARGV cost, concurrency_penalty, ttl, call id
+_end_call_script = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREM', KEYS[2], ARGV[4])
+local remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+if remaining == nil then
+    return 0
+end
+local penalty = tonumber(ARGV[2])
+local cost = tonumber(ARGV[1])
+if cost == -1 then
+    -- timed out, don't give the reserved time back as the client has depleted the quota
+    cost = remaining + penalty
+elseif cost < 0 then
+    cost = 0
+end
+redis.call('HSET', KEYS[1], 'remaining', remaining - cost + penalty, 'last_call', now)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
 class APIQuotaMiddleware:
+    # tiers and the clients assigned to them come from API_QUOTA_TIERS, e.g.
+    # {"tiers": {"partner": {"max_call_time": 60, "recover_rate": 1, "max_concurrency": 20}}, "clients": {"10.0.0.2": "partner"}}
+
+    key_prefix = "api_quota"
+    # a rejected client is turned away locally for this long before asking redis again
+    reject_cache_seconds = 1.0
+    # a call lease outlives the call's time limit by this much, to cover sending the timeout response and end_call
+    lease_margin = 30.0
+    # how long a worker keeps a client's lease for its next calls, 0 ends every call in redis
+    local_lease_seconds = 1.0
+
     def __init__(self, app: ASGIApp, *, max_call_time: float = 5.0, recover_rate: float = 0.1, max_concurrency: int = 10) -> None:
         self.app = app
-        self.max_call_time = max_call_time
-        self.recover_rate = recover_rate
-        self.max_concurrency = max_concurrency
-        self.concurrency_penalty = max_call_time / max_concurrency
-        self.ip_remaining_time: dict[str, tuple[float, float, int]] = defaultdict(lambda: (max_call_time, -1.0, 0))
-        self.ip_remaining_time_lock = asyncio.Lock()
-
-    async def start_call(self, ip: str):
-        async with self.ip_remaining_time_lock:
-            remaining, last_call, outstanding_call = self.ip_remaining_time[ip]
-            print(f"ip {ip} has quota {remaining}s, last call {last_call}, outstanding call {outstanding_call}")
-            if outstanding_call == 0 and last_call != -1:
-                quota = remaining + (time.monotonic() - last_call) * self.recover_rate
-                if quota > self.max_call_time:
-                    quota = self.max_call_time
-                print(f"ip {ip} quota recovered to {quota}")
-            else:
-                quota = remaining
-            if outstanding_call >= self.max_concurrency or quota - self.concurrency_penalty < 0:
-                raise QuotaExceeded()
-            # save current quota subtract 1 second right now to avoid flood attack
-            self.ip_remaining_time[ip] = (quota - self.concurrency_penalty, last_call, outstanding_call + 1)
-        return quota
-
-    def get_quota_for_header(self, ip: str, cost: float):
-        remaining, _, outstanding_call = self.ip_remaining_time[ip]
-        return remaining - cost + outstanding_call * self.concurrency_penalty
-
-    async def end_call(self, ip: str, cost: float):
-        async with self.ip_remaining_time_lock:
-            remaining, _, outstanding_call = self.ip_remaining_time[ip]
-            if cost == COST_TIMEOUT:
-                # don't add the 1 sec back as the user has depleted the quota
-                cost = remaining + self.concurrency_penalty
-            elif cost == COST_UNKNOWN:
-                # honestly, unknown exception, refunding time used
-                cost = 0
-            elif cost < 0:
-                # just in case
-                cost = 0
-            self.ip_remaining_time[ip] = (remaining - cost + self.concurrency_penalty, time.monotonic(), outstanding_call - 1)
-        remaining, last_call, outstanding_call = self.ip_remaining_time[ip]
-        print(f"ip {ip} used {cost}s, remaining {remaining}s, last call {last_call}, outstanding call {outstanding_call}")
+        self.default_tier = QuotaTier(max_call_time, recover_rate, max_concurrency)
+        self.tiers: dict[str, QuotaTier] = {}
+        self.client_tiers: dict[str, str] = {}
+        if config := os.environ.get("API_QUOTA_TIERS"):
+            config = json.loads(config)
+            self.tiers = {name: QuotaTier(**tier) for name, tier in config.get("tiers", {}).items()}
+            self.client_tiers = config.get("clients", {})
+        self.rejected_until: dict[str, float] = {}
+        self.leases: dict[str, LocalLease] = {}
+        self.ending_leases: set[asyncio.Task[None]] = set()
+        # run with EVALSHA, registered on first use as the redis client comes from the app state
+        self.start_call_script: Optional[AsyncScript] = None
+        self.end_call_script: Optional[AsyncScript] = None
+
+    def get_tier(self, ip: str) -> QuotaTier:
+        if (name := self.client_tiers.get(ip)) is not None and name in self.tiers:
+            return self.tiers[name]
+        return self.default_tier
+
+    @staticmethod
+    def bucket_ttl(tier: QuotaTier) -> int:
+        # long enough for an idle bucket to have refilled completely
+        return int(tier.max_call_time / tier.recover_rate) + 60
+
+    def bucket_keys(self, ip: str) -> list[str]:
+        return [f"{self.key_prefix}:{ip}", f"{self.key_prefix}:{ip}:calls"]
+
+    async def start_call(self, redis: Redis[str], ip: str, tier: QuotaTier) -> tuple[float, str]:
+        # returns the remaining quota and the id end_call needs to release the call
+        now = time.monotonic()
+        if self.rejected_until.get(ip, 0) > now:
+            raise QuotaExceeded()
+        if self.start_call_script is None:
+            self.start_call_script = redis.register_script(_start_call_script)
+        call_id = uuid.uuid4().hex
+        allowed, quota = await self.start_call_script( # type: ignore
+            keys=self.bucket_keys(ip),
+            args=[tier.max_call_time, tier.recover_rate, tier.concurrency_penalty, tier.max_concurrency,
+                  self.bucket_ttl(tier), call_id, self.lease_margin],
+            client=redis,
+        )
+        if not allowed:
+            if len(self.rejected_until) > 10000:
+                self.rejected_until = {k: v for k, v in self.rejected_until.items() if v > now}
+            self.rejected_until[ip] = now + self.reject_cache_seconds
+            raise QuotaExceeded()
+        return float(quota), call_id
 
+    async def end_call(self, redis: Redis[str], ip: str, tier: QuotaTier, call_id: str, cost: float):
+        if self.end_call_script is None:
+            self.end_call_script = redis.register_script(_end_call_script)
+        await self.end_call_script( # type: ignore
+            keys=self.bucket_keys(ip),
+            args=[cost, tier.concurrency_penalty, self.bucket_ttl(tier), call_id],
+            client=redis,
+        )
+
+
+    async def acquire(self, redis: Redis[str], ip: str, tier: QuotaTier) -> tuple[float, str]:
+        # start_call, served from the worker's lease of the client when it's free
+        lease = self.leases.get(ip)
+        if lease is not None and not lease.busy and time.monotonic() < lease.expires \
+                and lease.quota - lease.spent - tier.concurrency_penalty >= 0:
+            lease.busy = True
+            return lease.quota - lease.spent, lease.call_id
+        quota, call_id = await self.start_call(redis, ip, tier)
+        if lease is None and self.local_lease_seconds > 0:
+            lease = LocalLease(call_id, quota, time.monotonic() + self.local_lease_seconds)
+            self.leases[ip] = lease
+            asyncio.get_running_loop().call_later(self.local_lease_seconds, self.expire_lease, redis, ip, tier, lease)
+        return quota, call_id
+
+    async def release(self, redis: Redis[str], ip: str, tier: QuotaTier, call_id: str, cost: float):
+        # end_call, or keep the lease for the client's next calls until it expires
+        lease = self.leases.get(ip)
+        if lease is None or lease.call_id != call_id:
+            return await self.end_call(redis, ip, tier, call_id, cost)
+        lease.busy = False
+        if cost == COST_TIMEOUT:
+            del self.leases[ip]
+            return await self.end_call(redis, ip, tier, call_id, COST_TIMEOUT)
+        lease.spent += max(cost, 0)
+        if time.monotonic() >= lease.expires:
+            del self.leases[ip]
+            await self.end_call(redis, ip, tier, call_id, lease.spent)
+
+    def expire_lease(self, redis: Redis[str], ip: str, tier: QuotaTier, lease: LocalLease):
+        # a lease in use is ended by its call
+        if self.leases.get(ip) is not lease or lease.busy:
+            return
+        del self.leases[ip]
+        task = asyncio.create_task(self.end_lease(redis, ip, tier, lease))
+        self.ending_leases.add(task)
+        task.add_done_callback(self.ending_leases.discard)
+
+    async def end_lease(self, redis: Redis[str], ip: str, tier: QuotaTier, lease: LocalLease):
+        try:
+            await self.end_call(redis, ip, tier, lease.call_id, lease.spent)
+        except Exception:
+            # the lease expires on its own
+            import traceback
+            traceback.print_exc()
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
         ip = scope["client"][0]
+        tier = self.get_tier(ip)
+        redis: Optional[Redis[str]] = None
         try:
-            remaining = await self.start_call(ip)
+            redis = scope["app"].state.db.redis
+            remaining, call_id = await self.acquire(redis, ip, tier)
         except QuotaExceeded:
             headers = {
-                "Retry-After": str(int(1 / self.recover_rate)),
+                "Retry-After": str(int(1 / tier.recover_rate)),
             }
             response = JSONResponse({"error": "API quota exceeded"}, status_code=429, headers=headers)
             await response(scope, receive, send)
             return
+        except Exception:
+            # quota storage unavailable, serve the request rather than failing every call
+            import traceback
+            traceback.print_exc()
+            redis = None
+            remaining, call_id = tier.max_call_time, ""
         timing = RequestTiming()
         cost = COST_UNKNOWN # final catch if try except borked
         try:
             receive = functools.partial(self.wrapped_receive, timing=timing, receive=receive)
-            send = functools.partial(self.wrapped_send, scope=scope, timing=timing, send=send)
+            send = functools.partial(self.wrapped_send, tier=tier, quota=remaining, timing=timing, send=send)
             timing.start_ns = time.perf_counter_ns()
             await asyncio.wait_for(self.app(scope, receive, send), timeout=remaining)
             cost = (timing.end_ns - timing.start_ns) / 1e9
         except TimeoutError:
             headers = {
-                "Retry-After": str(int(1 / self.recover_rate)),
+                "Retry-After": str(int(1 / tier.recover_rate)),
             }
             response = JSONResponse({"error": "Request timed out - API quota exceeded"}, status_code=429, headers=headers)
             await response(scope, receive, send)
@@ -105,7 +265,13 @@ class APIQuotaMiddleware:
             import traceback
             traceback.print_exc()
         finally:
-            await self.end_call(ip, cost)
+            if redis is not None:
+                try:
+                    await self.release(redis, ip, tier, call_id, cost)
+                except Exception:
+                    # the response is already sent, the call's lease expires on its own
+                    import traceback
+                    traceback.print_exc()
 
     # noinspection PyMethodMayBeStatic
     async def wrapped_receive(self, timing: RequestTiming, receive: Receive) -> Message:
@@ -115,17 +281,17 @@ class APIQuotaMiddleware:
         return message
 
 
-    async def wrapped_send(self, message: Message, scope: Scope, timing: RequestTiming, send: Send) -> None:
+    # noinspection PyMethodMayBeStatic
+    async def wrapped_send(self, message: Message, tier: QuotaTier, quota: float, timing: RequestTiming, send: Send) -> None:
         if timing.end_ns == 0:
             timing.end_ns = time.perf_counter_ns()
         if message["type"] != "http.response.start":
             await send(message)
         else:
             cost = (timing.end_ns - timing.start_ns) / 1e9
-            remaining = self.get_quota_for_header(scope["client"][0], cost)
             headers = MutableHeaders(scope=message)
             headers["Quota-Used"] = str(cost)
-            headers["Quota-Remaining"] = str(remaining)
-            headers["Quota-Max"] = str(self.max_call_time)
-            headers["Quota-Recover-Rate"] = str(self.recover_rate)
-            await send(message)
\ No newline at end of file
+            headers["Quota-Remaining"] = str(quota - cost)
+            headers["Quota-Max"] = str(tier.max_call_time)
+            headers["Quota-Recover-Rate"] = str(tier.recover_rate)
+            await send(message)
@@ -1,22 +1,76 @@
+import asyncio
+import hashlib
 import os
+from collections import OrderedDict
+from typing import Optional
 
 import minify_html
 from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Message, Scope, Receive, Send
 
 
+def _minify(body: bytes) -> bytes:
+    return minify_html.minify(
+        body.decode("utf-8"),
+        do_not_minify_doctype=True,
+        ensure_spec_compliant_unquoted_attribute_values=True,
+        keep_closing_tags=True,
+        keep_html_and_head_opening_tags=True,
+        minify_css=True,
+        minify_js=True,
+    ).encode("utf-8")
+
+
+class MinifyCache:
+    # minified output keyed on the hash of the original body, least recently used entries are evicted first
+    def __init__(self, max_size: int = 64 * 1024 * 1024) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.entries: OrderedDict[bytes, bytes] = OrderedDict()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        if (value := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: bytes) -> None:
+        if len(value) > self.max_size or key in self.entries:
+            return
+        self.entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
 class MinifyMiddleware:
+    # bodies larger than this are minified in a worker thread
+    offload_size = 64 * 1024
+
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
+        self.cache = MinifyCache()
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
-        await MinifyWrapper(self.app)(scope, receive, send)
+        await MinifyWrapper(self.app, self)(scope, receive, send)
+
+    async def minify(self, body: bytes) -> bytes:
+        key = hashlib.blake2b(body, digest_size=16).digest()
+        if (minified := self.cache.get(key)) is not None:
+            return minified
+        if len(body) > self.offload_size:
+            minified = await asyncio.to_thread(_minify, body)
+        else:
+            minified = _minify(body)
+        self.cache.put(key, minified)
+        return minified
 
 class MinifyWrapper:
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(self, app: ASGIApp, middleware: MinifyMiddleware) -> None:
         self.app = app
+        self.middleware = middleware
         self.start_message: Message
         self.has_trailers: bool
         self.body: bytes
@@ -33,7 +87,8 @@ class MinifyWrapper:
                 self.body = b""
                 self.non_html = False
                 headers = MutableHeaders(scope=message)
-                if not headers.get("content-type", "").startswith("text/html"):
+                # streamed responses have no content-length and are passed through as they come
+                if not headers.get("content-type", "").startswith("text/html") or "content-length" not in headers:
                     self.non_html = True
                     await send(message)
                     return
@@ -46,15 +101,7 @@ class MinifyWrapper:
                     return
                 body = self.body + message.get("body", b"")
                 if not message.get("more_body", False):
-                    body = minify_html.minify(
-                        body.decode("utf-8"),
-                        do_not_minify_doctype=True,
-                        ensure_spec_compliant_unquoted_attribute_values=True,
-                        keep_closing_tags=True,
-                        keep_html_and_head_opening_tags=True,
-                        minify_css=True,
-                        minify_js=True,
-                    ).encode("utf-8")
+                    body = await self.middleware.minify(body)
                     message["body"] = body
                     headers = MutableHeaders(scope=self.start_message)
                     headers["content-length"] = str(len(body))
@@ -0,0 +1,180 @@
+# The name resolution util.arc0137 did before the ans_name index: it recomputes name hashes and walks the ANS registry
+# mappings (here one query per name depth). Kept as the oracle for tests/test_ans_index.py.
+
+from io import BytesIO
+from typing import Optional
+
+import aleo_explorer_rust
+
+from aleo_types import Address, Field, StructPlaintext, Vec, Tuple, Identifier, Plaintext, u8, LiteralType, Value, \
+    PlaintextValue, LiteralPlaintext, Literal, ArrayPlaintext, Scalar, u32
+from aleo_types.cached import cached_get_key_id
+from db import Database
+from node import Network
+from util.aleo_strings import string_to_u128_array_le, string_from_u128_array_le
+
+
+async def _get_mapping_value(db: Database, program_id: str, mapping_name: str, key: Plaintext) -> Optional[Plaintext]:
+    key_id = Field.loads(cached_get_key_id(program_id, mapping_name, key.dump()))
+    data = await db.get_mapping_value(program_id, mapping_name, str(key_id))
+    if data is None:
+        return None
+    value = Value.load(BytesIO(data))
+    if not isinstance(value, PlaintextValue):
+        raise RuntimeError(f"mapping value is not a plaintext: {value}")
+    return value.plaintext
+
+
+async def _get_mapping_values(db: Database, program_id: str, mapping_name: str, keys: list[Plaintext]) -> list[Optional[Plaintext]]:
+    key_ids = [str(Field.loads(cached_get_key_id(program_id, mapping_name, key.dump()))) for key in keys]
+    async with db.pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT key_id, value FROM mapping_value mv "
+                "JOIN mapping m on mv.mapping_id = m.id "
+                "WHERE m.program_id = %s AND m.mapping = %s AND mv.key_id = ANY(%s)",
+                (program_id, mapping_name, key_ids)
+            )
+            data = {res["key_id"]: res["value"] for res in await cur.fetchall()}
+    plaintexts: list[Optional[Plaintext]] = []
+    for key_id in key_ids:
+        if (d := data.get(key_id)) is None:
+            plaintexts.append(None)
+            continue
+        value = Value.load(BytesIO(d))
+        if not isinstance(value, PlaintextValue):
+            raise RuntimeError(f"mapping value is not a plaintext: {value}")
+        plaintexts.append(value.plaintext)
+    return plaintexts
+
+
+def get_name_hash(name_st: StructPlaintext) -> Field:
+    name_field = Field.load(BytesIO(
+        aleo_explorer_rust.hash_ops(PlaintextValue(plaintext=name_st).dump(), "psd2", LiteralType.Field)
+    ))
+    zero_field_plaintext = LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=Field(data=0)))
+    data_struct = PlaintextValue(
+        plaintext=StructPlaintext(
+            members=Vec[Tuple[Identifier, Plaintext], u8]([
+                Tuple[Identifier, Plaintext]((
+                    Identifier(value="metadata"),
+                    ArrayPlaintext(
+                        elements=Vec[Plaintext, u32]([
+                            LiteralPlaintext(
+                                literal=Literal(type_=Literal.Type.Field, primitive=name_field)
+                            ),
+                            zero_field_plaintext,
+                            zero_field_plaintext,
+                            zero_field_plaintext,
+                        ])
+                    )
+                ))
+            ])
+        )
+    )
+    data_hash = Field.load(BytesIO(
+        aleo_explorer_rust.hash_ops(data_struct.dump(), "bhp256", LiteralType.Field)
+    ))
+    data_hash_value = PlaintextValue(
+        plaintext=LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=data_hash)))
+    return Field.load(BytesIO(
+        aleo_explorer_rust.commit_ops(data_hash_value.dump(), Scalar(0), "bhp256", LiteralType.Field)
+    ))
+
+
+def get_name_st(name: str, parent: Field) -> StructPlaintext:
+    return StructPlaintext(
+        members=Vec[Tuple[Identifier, Plaintext], u8]([
+            Tuple[Identifier, Plaintext]((
+                Identifier(value="name"),
+                string_to_u128_array_le(name, 4)
+            )),
+            Tuple[Identifier, Plaintext]((
+                Identifier(value="parent"),
+                LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=parent))
+            ))
+        ])
+    )
+
+
+async def _resolve_name_hashes(db: Database, name_hashes: set[Field]) -> dict[Field, Optional[str]]:
+    parts: dict[Field, tuple[str, Field]] = {}
+    missing: set[Field] = set()
+    pending = list(name_hashes)
+    while pending:
+        keys: list[Plaintext] = [LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=x)) for x in pending]
+        name_structs = await _get_mapping_values(db, Network.ans_registry, "names", keys)
+        parents: set[Field] = set()
+        for name_hash, name_struct in zip(pending, name_structs):
+            if name_struct is None:
+                missing.add(name_hash)
+                continue
+            if not isinstance(name_struct, StructPlaintext):
+                raise RuntimeError(f"mapping value is not a struct: {name_struct}")
+            name = name_struct["name"]
+            if not isinstance(name, ArrayPlaintext):
+                raise RuntimeError(f"mapping value is not an array: {name}")
+            parent = name_struct["parent"]
+            if not isinstance(parent, LiteralPlaintext):
+                raise RuntimeError(f"mapping value is not a literal: {parent}")
+            if not isinstance(parent.literal.primitive, Field):
+                raise RuntimeError(f"mapping value is not a field: {parent.literal.primitive}")
+            parts[name_hash] = string_from_u128_array_le(name), parent.literal.primitive
+            if parent.literal.primitive != Field(data=0):
+                parents.add(parent.literal.primitive)
+        pending = [x for x in parents if x not in parts and x not in missing]
+
+    def resolve(name_hash: Field) -> Optional[str]:
+        if name_hash not in parts:
+            return None
+        name_str, parent = parts[name_hash]
+        if parent == Field(data=0):
+            return name_str
+        parent_name = resolve(parent)
+        if parent_name is None:
+            return None
+        return f"{name_str}.{parent_name}"
+
+    return {name_hash: resolve(name_hash) for name_hash in name_hashes}
+
+
+async def get_address_from_domain(db: Database, domain: str) -> Optional[str]:
+    domain_parts = domain.split(".")
+    parent_hash = Field(data=0)
+    for part in reversed(domain_parts):
+        name_st = get_name_st(part, parent_hash)
+        parent_hash = get_name_hash(name_st)
+    name_hash = LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=parent_hash))
+
+    name_struct = await _get_mapping_value(db, Network.ans_registry, "names", name_hash)
+    if name_struct is None:
+        return None
+    if not isinstance(name_struct, StructPlaintext):
+        raise RuntimeError(f"mapping value is not a struct: {name_struct}")
+
+    owner = await _get_mapping_value(db, Network.ans_registry, "nft_owners", name_hash)
+    if owner is None:
+        return ""
+    if not isinstance(owner, LiteralPlaintext):
+        raise RuntimeError(f"mapping value is not a literal: {owner}")
+    if owner.literal.type != Literal.Type.Address:
+        raise RuntimeError(f"mapping value is not an address: {owner.literal}")
+    return str(owner.literal.primitive)
+
+
+async def get_primary_names_from_addresses(db: Database, addresses: list[str]) -> dict[str, Optional[str]]:
+    keys: list[Plaintext] = [
+        LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=Address.loads(address)))
+        for address in addresses
+    ]
+    name_hashes: dict[str, Field] = {}
+    for address, name_hash in zip(addresses, await _get_mapping_values(db, Network.ans_registry, "primary_names", keys)):
+        if name_hash is None:
+            continue
+        if not isinstance(name_hash, LiteralPlaintext):
+            raise RuntimeError(f"mapping value is not a literal: {name_hash}")
+        if not isinstance(name_hash.literal.primitive, Field):
+            raise RuntimeError(f"mapping value is not a field: {name_hash.literal}")
+        name_hashes[address] = name_hash.literal.primitive
+    names = await _resolve_name_hashes(db, set(name_hashes.values()))
+    return {address: names[name_hashes[address]] if address in name_hashes else None for address in addresses}
@@ -0,0 +1,71 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable
+
+import pytest
+
+
+# Tests that need services use the ones configured through TEST_* variables and are skipped without them.
+# Use a redis database and a postgres database dedicated to the tests, they are written to.
+
+@pytest.fixture
+def redis_settings() -> dict[str, Any]:
+    if "TEST_REDIS_HOST" not in os.environ:
+        pytest.skip("TEST_REDIS_HOST is not set")
+    return {
+        "redis_server": os.environ["TEST_REDIS_HOST"],
+        "redis_port": int(os.environ.get("TEST_REDIS_PORT", 6379)),
+        "redis_db": int(os.environ.get("TEST_REDIS_DB", 15)),
+        "redis_user": os.environ.get("TEST_REDIS_USER"),
+        "redis_password": os.environ.get("TEST_REDIS_PASS"),
+    }
+
+
+@pytest.fixture
+def database_settings(redis_settings: dict[str, Any]) -> dict[str, Any]:
+    if "TEST_DB_HOST" not in os.environ:
+        pytest.skip("TEST_DB_HOST is not set")
+    return {
+        "server": os.environ["TEST_DB_HOST"],
+        "user": os.environ.get("TEST_DB_USER", "postgres"),
+        "password": os.environ.get("TEST_DB_PASS", ""),
+        "database": os.environ.get("TEST_DB_DATABASE", "explorer_test"),
+        "schema": "explorer",
+        **redis_settings,
+    }
+
+
+async def ignore_message(msg: Any):
+    pass
+
+
+@pytest.fixture
+def fresh_database(database_settings: dict[str, Any]) -> Callable[[], AsyncContextManager[Any]]:
+    # a connected Database on the pg_dump.sql schema with every migration applied, recreated on each use
+
+    @asynccontextmanager
+    async def fresh() -> AsyncIterator[Any]:
+        import psycopg
+        import explorer # type: ignore # db has to be imported through explorer, like main.py does
+        from db import Database
+
+        s = database_settings
+        async with await psycopg.AsyncConnection.connect(
+            f"host={s['server']} user={s['user']} password={s['password']} dbname={s['database']}", autocommit=True
+        ) as conn:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {s['schema']} CASCADE")
+            with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "pg_dump.sql")) as f:
+                await conn.execute(f.read()) # type: ignore[arg-type]
+        db = Database(message_callback=ignore_message, **s)
+        await db.connect()
+        await db.redis.flushdb()
+        await db.migrate()
+        try:
+            yield db
+        finally:
+            if db._latest_block_listener is not None:
+                db._latest_block_listener.cancel()
+            await db.pool.close()
+            await db.redis.aclose()
+
+    return fresh
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, AsyncContextManager, Callable
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db.util import DatabaseUtil
+
+
+def test_trim_address_index_keeps_addresses_with_sources(fresh_database: Callable[[], AsyncContextManager[Any]]):
+    addresses = [f"aleo1address{i}" for i in range(7)]
+
+    async def test():
+        async with fresh_database() as db:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("INSERT INTO address_index (address) SELECT unnest(%s::text[])", (addresses,))
+                    await cur.execute(
+                        "INSERT INTO transition (transition_id, program_id, function_name, tpk, tcm, index, scm) "
+                        "VALUES ('au1transition', 'credits.aleo', 'transfer_public', '', '', 0, '') RETURNING id"
+                    )
+                    transition_id = (await cur.fetchone())["id"]
+                    await cur.execute(
+                        "INSERT INTO address_transition (address, transition_id) VALUES (%s, %s)",
+                        (addresses[0], transition_id)
+                    )
+                    await cur.execute(
+                        "INSERT INTO program (program_id, raw_data, feature_hash, owner, address) "
+                        "VALUES ('test.aleo', '', '', %s, %s)",
+                        (addresses[1], addresses[2])
+                    )
+                    await db.redis.hset("address_puzzle_reward", addresses[3], 1)
+                    await db.redis.hset("address_stake_reward", addresses[4], 1)
+
+                    # addresses[6] isn't a candidate, it stays even without a source
+                    await DatabaseUtil._trim_address_index(cur, db.redis, set(addresses[:6]))
+                    await cur.execute("SELECT address FROM address_index ORDER BY address")
+                    assert [row["address"] for row in await cur.fetchall()] == addresses[:5] + addresses[6:]
+
+    asyncio.run(test())
+
+
+def test_new_hash_fields(redis_settings: dict[str, Any]):
+    from redis.asyncio import Redis
+
+    async def test():
+        redis = Redis(host=redis_settings["redis_server"], port=redis_settings["redis_port"],
+                      db=redis_settings["redis_db"], decode_responses=True)
+        try:
+            await redis.delete("address_index_test", "address_index_test:backup")
+            await redis.hset("address_index_test", mapping={f"aleo1address{i}": i for i in range(25000)})
+            await redis.copy("address_index_test", "address_index_test:backup")
+            assert await DatabaseUtil._get_new_hash_fields(redis, "address_index_test", "address_index_test:backup") == set()
+            await redis.hset("address_index_test", mapping={"aleo1new0": 1, "aleo1new1": 1})
+            await redis.hincrby("address_index_test", "aleo1address3", 1)
+            assert await DatabaseUtil._get_new_hash_fields(redis, "address_index_test", "address_index_test:backup") == \
+                {"aleo1new0", "aleo1new1"}
+        finally:
+            await redis.delete("address_index_test", "address_index_test:backup")
+            await redis.aclose()
+
+    asyncio.run(test())
@@ -0,0 +1,130 @@
+import asyncio
+import random
+from typing import Any, AsyncContextManager, Callable, Optional
+
+import pytest
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+import ans_reference
+from aleo_types import Address, Field, Literal, LiteralPlaintext, PlaintextValue
+from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
+from db.mapping import DatabaseMapping
+from node import Network
+from util import arc0137
+
+
+def field_key(value: Field) -> LiteralPlaintext:
+    return LiteralPlaintext(literal=Literal(type_=Literal.Type.Field, primitive=value))
+
+
+def address_plaintext(address: Address) -> LiteralPlaintext:
+    return LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=address))
+
+
+async def set_mapping(db: Any, cur: Any, mapping: str, key: LiteralPlaintext, value: Optional[LiteralPlaintext | PlaintextValue],
+                      height: int):
+    mapping_id = cached_get_mapping_id(Network.ans_registry, mapping)
+    key_id = cached_get_key_id(Network.ans_registry, mapping, key.dump())
+    if value is None:
+        await db.remove_mapping_key_value(cur, Network.ans_registry, mapping, mapping_id, key_id, key.dump(), height, True)
+        return
+    if isinstance(value, LiteralPlaintext):
+        value = PlaintextValue(plaintext=value)
+    await db.update_mapping_key_value(cur, Network.ans_registry, mapping, mapping_id, key_id, key_id, key.dump(),
+                                      value.dump(), height, True)
+
+
+async def compare(db: Any, domains: list[str], addresses: list[str], orphans: set[str]):
+    for domain in domains:
+        expected = await ans_reference.get_address_from_domain(db, domain)
+        if domain in orphans:
+            # the hash walk still found names under a removed parent, the index no longer resolves them
+            assert expected is not None
+            assert await arc0137.get_address_from_domain(db, domain) is None
+            continue
+        assert await arc0137.get_address_from_domain(db, domain) == expected, domain
+    assert await arc0137.get_primary_names_from_addresses(db, addresses) == \
+        await ans_reference.get_primary_names_from_addresses(db, addresses)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_ans_index_matches_hash_resolver(fresh_database: Callable[[], AsyncContextManager[Any]], seed: int):
+    rng = random.Random(seed)
+
+    async def test():
+        async with fresh_database() as db:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    for mapping in DatabaseMapping.ans_index_mappings:
+                        await cur.execute(
+                            "INSERT INTO mapping (mapping_id, program_id, mapping) VALUES (%s, %s, %s)",
+                            (cached_get_mapping_id(Network.ans_registry, mapping), Network.ans_registry, mapping)
+                        )
+
+                    # a few top level names with subnames up to three levels deep
+                    names: dict[str, tuple[str, Field, Field]] = {}
+                    pending = [(f"name{i}", "", Field(0)) for i in range(8)]
+                    while pending:
+                        name, parent_domain, parent = pending.pop()
+                        domain = f"{name}.{parent_domain}" if parent_domain else name
+                        name_hash = ans_reference.get_name_hash(ans_reference.get_name_st(name, parent))
+                        names[domain] = name, parent, name_hash
+                        if domain.count(".") < 3:
+                            pending.extend((f"sub{i}", domain, name_hash) for i in range(rng.randint(0, 3)))
+                    domains = list(names)
+                    addresses = [Address(rng.randbytes(32)) for _ in range(20)]
+
+                    async def register(domain: str, height: int):
+                        name, parent, name_hash = names[domain]
+                        value = PlaintextValue(plaintext=ans_reference.get_name_st(name, parent))
+                        await set_mapping(db, cur, "names", field_key(name_hash), value, height)
+
+                    # subnames can be registered before their parents
+                    height = 0
+                    for domain in rng.sample(domains, len(domains)):
+                        await register(domain, height)
+                        height += 1
+                    for domain in domains:
+                        if rng.random() < 0.7:
+                            await set_mapping(db, cur, "nft_owners", field_key(names[domain][2]),
+                                              address_plaintext(rng.choice(addresses)), height)
+                    for address in addresses:
+                        if rng.random() < 0.7:
+                            await set_mapping(db, cur, "primary_names", address_plaintext(address),
+                                              field_key(names[rng.choice(domains)][2]), height)
+
+                    removed: set[str] = set()
+                    for _ in range(40):
+                        height += 1
+                        domain = rng.choice(domains)
+                        action = rng.random()
+                        if action < 0.3:
+                            if domain in removed:
+                                await register(domain, height)
+                                removed.discard(domain)
+                            else:
+                                await set_mapping(db, cur, "names", field_key(names[domain][2]), None, height)
+                                removed.add(domain)
+                        elif action < 0.6:
+                            owner = address_plaintext(rng.choice(addresses)) if rng.random() < 0.8 else None
+                            await set_mapping(db, cur, "nft_owners", field_key(names[domain][2]), owner, height)
+                        else:
+                            name_hash = field_key(names[domain][2]) if rng.random() < 0.8 else None
+                            await set_mapping(db, cur, "primary_names", address_plaintext(rng.choice(addresses)),
+                                              name_hash, height)
+
+            address_strs = [str(x) for x in addresses]
+            orphans = {
+                domain for domain in domains
+                if domain not in removed and any(
+                    parent in removed for parent in (domain.split(".", i)[-1] for i in range(1, domain.count(".") + 1))
+                )
+            }
+            await compare(db, domains + ["missing", "sub0.missing"], address_strs, orphans)
+
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await DatabaseMapping._rebuild_ans_index(cur)
+            await compare(db, domains + ["missing", "sub0.missing"], address_strs, orphans)
+
+    asyncio.run(test())
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from redis.asyncio import Redis
+
+from middleware.api_quota import APIQuotaMiddleware, QuotaExceeded, QuotaTier
+
+
+def make_redis(settings: dict[str, Any]) -> Redis[str]:
+    return Redis(host=settings["redis_server"], port=settings["redis_port"], db=settings["redis_db"],
+                 username=settings["redis_user"], password=settings["redis_password"], decode_responses=True)
+
+
+async def request(middleware: APIQuotaMiddleware, redis: Redis[str], ip: str) -> int:
+    scope = {"type": "http", "client": (ip, 1234), "app": SimpleNamespace(state=SimpleNamespace(db=SimpleNamespace(redis=redis)))}
+    status = 0
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await middleware(scope, receive, send)
+    return status
+
+
+def test_concurrency_is_shared_by_workers(redis_settings: dict[str, Any]):
+    max_concurrency = 4
+    running = 0
+    most_running = 0
+
+    async def app(scope: Any, receive: Any, send: Any):
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def test():
+        redis = make_redis(redis_settings)
+        await redis.flushdb()
+        # two workers, each with its own middleware and connection
+        workers = [
+            APIQuotaMiddleware(app, max_call_time=100, recover_rate=1, max_concurrency=max_concurrency)
+            for _ in range(2)
+        ]
+        clients = [make_redis(redis_settings) for _ in workers]
+        for worker in workers:
+            worker.reject_cache_seconds = 0
+        statuses = await asyncio.gather(*(
+            request(workers[i % 2], clients[i % 2], "10.0.0.1") for i in range(40)
+        ))
+        assert most_running <= max_concurrency
+        assert statuses.count(200) >= max_concurrency
+        assert set(statuses) <= {200, 429}
+        # the leases the workers kept end on their own
+        await asyncio.sleep(APIQuotaMiddleware.local_lease_seconds + 0.2)
+        assert await redis.zcard("api_quota:10.0.0.1:calls") == 0
+        # every served call was charged about its duration, the penalties reserved up front are returned
+        remaining = float(await redis.hget("api_quota:10.0.0.1", "remaining")) # type: ignore[arg-type]
+        assert 100 - statuses.count(200) * 0.5 < remaining < 100
+        for client in clients + [redis]:
+            await client.aclose()
+
+    asyncio.run(test())
+
+
+def test_calls_of_a_dead_worker_expire(redis_settings: dict[str, Any]):
+    async def test():
+        redis = make_redis(redis_settings)
+        await redis.flushdb()
+        middleware = APIQuotaMiddleware(None, max_call_time=0.5, recover_rate=1, max_concurrency=1) # type: ignore[arg-type]
+        middleware.reject_cache_seconds = 0
+        middleware.lease_margin = 0
+        tier = middleware.default_tier
+        # started and never ended, like a worker that died mid call
+        await middleware.start_call(redis, "10.0.0.2", tier)
+        try:
+            await middleware.start_call(redis, "10.0.0.2", tier)
+            assert False, "second concurrent call was allowed"
+        except QuotaExceeded:
+            pass
+        await asyncio.sleep(0.6)
+        _, call_id = await middleware.start_call(redis, "10.0.0.2", tier)
+        await middleware.end_call(redis, "10.0.0.2", tier, call_id, 0.1)
+        assert await redis.zcard("api_quota:10.0.0.2:calls") == 0
+        await redis.aclose()
+
+    asyncio.run(test())
+
+
+def test_end_call_errors_dont_fail_the_request(redis_settings: dict[str, Any]):
+    async def app(scope: Any, receive: Any, send: Any):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def test():
+        redis = make_redis(redis_settings)
+        await redis.flushdb()
+        middleware = APIQuotaMiddleware(app)
+        middleware.local_lease_seconds = 0
+
+        async def broken_end_call(*args: Any):
+            raise ConnectionError("redis went away")
+
+        middleware.end_call = broken_end_call # type: ignore[method-assign]
+        assert await request(middleware, redis, "10.0.0.3") == 200
+        await redis.aclose()
+
+    asyncio.run(test())
+
+
+def test_sequential_calls_share_a_local_lease(redis_settings: dict[str, Any]):
+    async def app(scope: Any, receive: Any, send: Any):
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def test():
+        redis = make_redis(redis_settings)
+        await redis.flushdb()
+        middleware = APIQuotaMiddleware(app, max_call_time=10, recover_rate=1, max_concurrency=2)
+        middleware.local_lease_seconds = 0.3
+        calls: list[str] = []
+        start_call, end_call = middleware.start_call, middleware.end_call
+
+        async def counting_start_call(*args: Any):
+            calls.append("start")
+            return await start_call(*args)
+
+        async def counting_end_call(*args: Any):
+            calls.append("end")
+            return await end_call(*args)
+
+        middleware.start_call = counting_start_call # type: ignore[method-assign]
+        middleware.end_call = counting_end_call # type: ignore[method-assign]
+        for _ in range(5):
+            assert await request(middleware, redis, "10.0.0.4") == 200
+        assert calls == ["start"]
+        assert await redis.zcard("api_quota:10.0.0.4:calls") == 1
+        # concurrent calls beyond the lease go through redis
+        assert await asyncio.gather(*(request(middleware, redis, "10.0.0.4") for _ in range(2))) == [200, 200]
+        assert calls == ["start", "start", "end"]
+        await asyncio.sleep(0.5)
+        assert calls == ["start", "start", "end", "end"]
+        assert await redis.zcard("api_quota:10.0.0.4:calls") == 0
+        # charged the time of the calls, the penalty reserved for the lease is returned
+        remaining = float(await redis.hget("api_quota:10.0.0.4", "remaining")) # type: ignore[arg-type]
+        assert 10 - 7 * 0.05 < remaining < 10 - 7 * 0.01
+        await redis.aclose()
+
+    asyncio.run(test())
+
+
+def test_tier_from_config(monkeypatch: Any):
+    monkeypatch.setenv("API_QUOTA_TIERS", '{"tiers": {"partner": {"max_call_time": 60, "recover_rate": 1, "max_concurrency": 20}}, "clients": {"10.0.0.2": "partner"}}')
+    middleware = APIQuotaMiddleware(None) # type: ignore[arg-type]
+    assert middleware.get_tier("10.0.0.2") == QuotaTier(60, 1, 20)
+    assert middleware.get_tier("10.0.0.3") == middleware.default_tier
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from webapi.utils import BlockBroadcaster
+
+
+class FakeDatabase:
+    # wait_for_new_block returns when the test announces a block
+
+    def __init__(self):
+        self.height = 0
+        self.new_block = asyncio.Event()
+
+    def announce(self, height: int):
+        self.height = height
+        self.new_block.set()
+        self.new_block = asyncio.Event()
+
+    async def wait_for_new_block(self):
+        await self.new_block.wait()
+
+
+async def build(db: Any) -> tuple[int, bytes]:
+    return db.height, f"block {db.height}".encode()
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_blocks_announced_while_a_client_is_sending_are_not_skipped():
+    async def test():
+        db = FakeDatabase()
+        broadcaster = BlockBroadcaster(build)
+        stream = broadcaster.subscribe(db) # type: ignore[arg-type]
+        assert await anext(stream) == b"block 0"
+        # the client is still busy with the first message when the next block arrives
+        db.announce(1)
+        await settle()
+        assert await asyncio.wait_for(anext(stream), 1) == b"block 1"
+        db.announce(2)
+        db.announce(3)
+        await settle()
+        # blocks in between can be merged, the latest is always sent
+        assert await asyncio.wait_for(anext(stream), 1) == b"block 3"
+        await stream.aclose()
+        assert broadcaster._task is not None
+        broadcaster._task.cancel()
+
+    asyncio.run(test())
+
+
+def test_keepalive_while_the_first_block_is_built():
+    async def test():
+        db = FakeDatabase()
+        release = asyncio.Event()
+
+        async def slow_build(db: Any) -> tuple[int, bytes]:
+            await release.wait()
+            return await build(db)
+
+        broadcaster = BlockBroadcaster(slow_build)
+        stream = broadcaster.subscribe(db, keepalive=0) # type: ignore[arg-type]
+        assert await asyncio.wait_for(anext(stream), 1) == b": keepalive\n\n"
+        release.set()
+        message = await asyncio.wait_for(anext(stream), 1)
+        while message == b": keepalive\n\n":
+            message = await asyncio.wait_for(anext(stream), 1)
+        assert message == b"block 0"
+        await stream.aclose()
+        assert broadcaster._task is not None
+        broadcaster._task.cancel()
+
+    asyncio.run(test())
@@ -0,0 +1,150 @@
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, cast
+
+import pytest
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db import Database
+from db.block import DatabaseBlock
+from db.block_store import BlockStore
+
+
+def payload(height: int, version: int = 0) -> bytes:
+    # different lengths per version so a torn read can't pass for a whole block
+    return f"block {height} v{version} ".encode() * (height % 5 + 1 + version * 3)
+
+
+@pytest.fixture
+def store(tmp_path: Any):
+    store = BlockStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+def test_append_and_get(store: BlockStore):
+    for height in range(10, 20):
+        store.append(height, payload(height))
+    assert store.heights == range(10, 20)
+    for height in range(10, 20):
+        assert store.get(height) == payload(height)
+    assert store.get(9) is None
+    assert store.get(20) is None
+
+
+def test_truncate(store: BlockStore):
+    for height in range(10):
+        store.append(height, payload(height))
+    store.truncate(5)
+    assert store.heights == range(6)
+    assert store.get(6) is None
+    store.append(6, payload(6, 1))
+    assert store.get(6) == payload(6, 1)
+    assert store.get(5) == payload(5)
+
+
+def test_replace_without_revert(store: BlockStore):
+    for height in range(10):
+        store.append(height, payload(height))
+    store.append(4, payload(4, 1))
+    assert store.heights == range(5)
+    assert store.get(4) == payload(4, 1)
+    assert store.get(3) == payload(3)
+
+
+def test_gap_is_refused(store: BlockStore):
+    for height in range(5):
+        store.append(height, payload(height))
+    with pytest.raises(ValueError):
+        store.append(100, payload(100))
+    with pytest.raises(ValueError):
+        store.append(6, payload(6))
+    assert store.heights == range(5)
+    assert store.get(2) == payload(2)
+
+
+def test_clear(store: BlockStore):
+    for height in range(5):
+        store.append(height, payload(height))
+    store.clear()
+    assert store.heights == range(0)
+    assert store.get(2) is None
+    store.append(100, payload(100))
+    assert store.heights == range(100, 101)
+    assert store.get(100) == payload(100)
+
+
+class FakePool:
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[None]:
+        yield None
+
+
+def fill_database(tmp_path: Any, monkeypatch: pytest.MonkeyPatch, latest: int) -> Database:
+    # get_full_block_range serves payloads for every height up to latest, like the relational tables
+    async def get_full_block_range(start: int, end: int, conn: Any) -> list[Any]:
+        return [SimpleNamespace(height=h, dump=functools.partial(payload, h)) for h in range(min(start, latest), end, -1)]
+
+    async def ignore_message(msg: Any):
+        pass
+
+    monkeypatch.setattr(DatabaseBlock, "get_full_block_range", staticmethod(get_full_block_range))
+    db = Database(server="", user="", password="", database="", schema="", redis_server="", redis_port=0, redis_db=0,
+                  redis_user=None, redis_password=None, message_callback=ignore_message, block_store_path=str(tmp_path))
+    db.pool = FakePool() # type: ignore[assignment]
+    db.block_store_fill_batch = 7
+    return db
+
+
+def test_fill_block_store(tmp_path: Any, monkeypatch: pytest.MonkeyPatch):
+    db = fill_database(tmp_path, monkeypatch, 40)
+    store = cast(BlockStore, db.block_store)
+
+    async def test():
+        # an empty store is only started by the next append or an explicit start
+        await db.fill_block_store(30)
+        assert store.heights == range(0)
+        await db.fill_block_store(30, start=10)
+        assert store.heights == range(10, 31)
+        # blocks missed after the stored ones
+        await db.fill_block_store(39)
+        assert store.heights == range(10, 40)
+        assert all(store.get(h) == payload(h) for h in range(10, 40))
+        # a start inside the stored range continues after it, one before it rebuilds
+        await db.fill_block_store(40, start=20)
+        assert store.heights == range(10, 41)
+        await db.fill_block_store(40, start=5)
+        assert store.heights == range(5, 41)
+        assert store.get(5) == payload(5)
+
+    asyncio.run(test())
+    store.close()
+
+
+@pytest.mark.parametrize("height", [3, 0, 8])
+def test_readers_never_see_torn_blocks(store: BlockStore, tmp_path: Any, monkeypatch: pytest.MonkeyPatch, height: int):
+    # a second reader checks every stored height after each write the appending store makes
+    for h in range(8):
+        store.append(h, payload(h))
+    reader = BlockStore(str(tmp_path))
+    valid = {h: {payload(h)} for h in range(8)}
+    valid.setdefault(height, set()).add(payload(height, 1))
+    pwrite = os.pwrite
+
+    def checked_pwrite(fd: int, data: bytes, offset: int) -> int:
+        written = pwrite(fd, data, offset)
+        for h in range(8):
+            result = reader.get(h)
+            assert result is None or result in valid[h]
+        result = reader.get(height)
+        assert result is None or result in valid[height]
+        return written
+
+    monkeypatch.setattr(os, "pwrite", checked_pwrite)
+    store.append(height, payload(height, 1))
+    monkeypatch.undo()
+    assert reader.get(height) == payload(height, 1)
+    reader.close()
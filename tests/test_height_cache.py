@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from starlette.responses import Response
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from webapi.utils import HeightCache
+
+
+def test_waiters_retry_when_the_computation_is_cancelled():
+    async def test():
+        cache = HeightCache()
+        started = asyncio.Event()
+        calls = 0
+
+        async def compute() -> Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return Response(content=b"result")
+
+        leader = asyncio.create_task(cache.get("/summary?", 1, compute))
+        await started.wait()
+        waiters = [asyncio.create_task(cache.get("/summary?", 1, compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # one of the waiters computes again, the others share its result
+        assert [response.body for response in await asyncio.gather(*waiters)] == [b"result"] * 3
+        assert calls == 2
+        assert cache.pending == {}
+
+    asyncio.run(test())
+
+
+def test_computations_are_not_shared_across_heights():
+    async def test():
+        cache = HeightCache()
+        release = asyncio.Event()
+
+        def compute(height: int):
+            async def f() -> Response:
+                await release.wait()
+                return Response(content=str(height).encode())
+            return f
+
+        old = asyncio.create_task(cache.get("/blocks?", 1, compute(1)))
+        await asyncio.sleep(0)
+        new = asyncio.create_task(cache.get("/blocks?", 2, compute(2)))
+        await asyncio.sleep(0)
+        release.set()
+        assert (await old).body == b"1"
+        assert (await new).body == b"2"
+        assert cache.entries["/blocks?"][1] == b"2"
+        # the old height's result isn't cached for the new height
+        assert (await cache.get("/blocks?", 2, compute(3))).body == b"2"
+
+    asyncio.run(test())
@@ -0,0 +1,168 @@
+# Int arithmetic against the implementation before the range check shortcuts, where every result went back through
+# the validating constructor and truncating division used a Decimal round trip.
+
+import decimal
+import math
+import operator
+from decimal import Decimal
+from typing import Any, Callable
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from aleo_types import Int, i8, i16, i32, i64, i128, u8, u16, u32, u64, u128
+
+int_types: list[type[Int]] = [u8, u16, u32, u64, u128, i8, i16, i32, i64, i128]
+shift_types: list[type[Int]] = [u8, u16, u32]
+
+
+def reference_floordiv(a: int, b: int) -> int:
+    # main.py sets the precision to 80, which keeps the Decimal division exact for 128 bit operands
+    with decimal.localcontext() as ctx:
+        ctx.prec = 80
+        return int(Decimal(a) // Decimal(b))
+
+
+def reference(cls: type[Int], op: Callable[[int, int], int]) -> Callable[[Int, Any], Int]:
+    return lambda a, b: cls(op(int(a), int(b)))
+
+
+def reference_floordiv_op(cls: type[Int]) -> Callable[[Int, Any], Int]:
+    def floordiv(a: Int, b: Any) -> Int:
+        if b == 0:
+            # the only intended difference: 0 // 0 with a plain int raised decimal.InvalidOperation, which is not a
+            # ZeroDivisionError and so escaped the finalizer's rejection handling
+            raise ZeroDivisionError("division by zero")
+        return cls(reference_floordiv(int(a), int(b)))
+    return floordiv
+
+
+def reference_wrapped(cls: type[Int], op: Callable[[int, int], int]) -> Callable[[Int, Any], Int]:
+    return lambda a, b: cls(cls.wrap_value(op(int(a), int(b))))
+
+
+def reference_pow(cls: type[Int], a: Int, b: int) -> Int:
+    max_digits = math.ceil(math.log10(cls.max))
+    if math.log10(abs(a)) * b > max_digits:
+        raise OverflowError(f"value *too large* is out of range for {cls.__name__}")
+    return cls(int(a) ** b)
+
+
+def outcome(func: Callable[[], Any]) -> tuple[Any, ...]:
+    try:
+        result = func()
+    except (OverflowError, ZeroDivisionError, ValueError) as e:
+        # decimal.DivisionByZero subclasses ZeroDivisionError, InvalidOperation (0 // 0) doesn't, see reference_floordiv_op
+        for base in (OverflowError, ZeroDivisionError, ValueError):
+            if isinstance(e, base):
+                return "raises", base
+        raise
+    return "ok", type(result), int(result)
+
+
+def assert_same(new: Callable[[], Any], old: Callable[[], Any]):
+    assert outcome(new) == outcome(old)
+
+
+checked_ops: dict[str, tuple[Callable[[Any, Any], Any], Callable[[type[Int]], Callable[[Int, Any], Int]]]] = {
+    "add": (operator.add, lambda cls: reference(cls, operator.add)),
+    "sub": (operator.sub, lambda cls: reference(cls, operator.sub)),
+    "mul": (operator.mul, lambda cls: reference(cls, operator.mul)),
+    "floordiv": (operator.floordiv, reference_floordiv_op),
+    "mod": (operator.mod, lambda cls: reference(cls, operator.mod)),
+    "and": (operator.and_, lambda cls: reference(cls, operator.and_)),
+    "or": (operator.or_, lambda cls: reference(cls, operator.or_)),
+    "xor": (operator.xor, lambda cls: reference(cls, operator.xor)),
+}
+
+wrapped_ops: dict[str, tuple[str, Callable[[int, int], int]]] = {
+    "add_wrapped": ("add_wrapped", operator.add),
+    "sub_wrapped": ("sub_wrapped", operator.sub),
+    "mul_wrapped": ("mul_wrapped", operator.mul),
+    "div_wrapped": ("div_wrapped", lambda a, b: int(a / b)),
+}
+
+
+def values(cls: type[Int]) -> st.SearchStrategy[int]:
+    # the edges are where the shortcuts could differ, so draw them more often than uniform sampling would
+    edges = [cls.min, cls.min + 1, -1, 0, 1, cls.max - 1, cls.max]
+    return st.one_of(st.sampled_from([v for v in edges if cls.min <= v <= cls.max]), st.integers(cls.min, cls.max))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("name", list(checked_ops))
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_checked_op(cls: type[Int], name: str, data: st.DataObject):
+    op, make_reference = checked_ops[name]
+    ref = make_reference(cls)
+    a = cls(data.draw(values(cls)))
+    b = cls(data.draw(values(cls)))
+    assert_same(lambda: op(a, b), lambda: ref(a, b))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("name", list(checked_ops))
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_checked_op_plain_int(cls: type[Int], name: str, data: st.DataObject):
+    op, make_reference = checked_ops[name]
+    ref = make_reference(cls)
+    a = cls(data.draw(values(cls)))
+    # plain ints are not range checked as operands, only the result is
+    b = data.draw(st.one_of(values(cls), st.integers(-2 * 2 ** (cls.size * 8), 2 * 2 ** (cls.size * 8))))
+    assert_same(lambda: op(a, b), lambda: ref(a, b))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("name", list(wrapped_ops))
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_wrapped_op(cls: type[Int], name: str, data: st.DataObject):
+    method, op = wrapped_ops[name]
+    ref = reference_wrapped(cls, op)
+    a = cls(data.draw(values(cls)))
+    b = cls(data.draw(values(cls)))
+    assert_same(lambda: getattr(a, method)(b), lambda: ref(a, b))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_invert(cls: type[Int], data: st.DataObject):
+    a = cls(data.draw(values(cls)))
+    if cls.min == 0:
+        assert_same(lambda: ~a, lambda: cls(~int(a) & cls.max))
+    else:
+        assert_same(lambda: ~a, lambda: cls(~int(a)))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("shift_cls", shift_types, ids=lambda cls: cls.__name__)
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_shift(cls: type[Int], shift_cls: type[Int], data: st.DataObject):
+    a = cls(data.draw(values(cls)))
+    # past the width every checked left shift of a nonzero value overflows, no need to build huge ints
+    b = shift_cls(data.draw(st.integers(0, min(shift_cls.max, cls.size * 8 + 2))))
+    assert_same(lambda: a << b, lambda: cls(int(a) << int(b)))
+    assert_same(lambda: a >> b, lambda: cls(int(a) >> int(b)))
+    assert_same(lambda: a.shl_wrapped(b), lambda: cls(cls.wrap_value(int(a) << int(b))))
+    assert_same(lambda: a.shr_wrapped(b), lambda: cls(cls.wrap_value(int(a) >> int(b))))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+@settings(max_examples=100, deadline=None)
+@given(data=st.data())
+def test_pow(cls: type[Int], data: st.DataObject):
+    a = cls(data.draw(values(cls)))
+    b = u8(data.draw(st.integers(0, cls.size * 8 + 2)))
+    assert_same(lambda: a ** b, lambda: reference_pow(cls, a, int(b)))
+
+
+@pytest.mark.parametrize("cls", int_types, ids=lambda cls: cls.__name__)
+def test_mismatched_types_rejected(cls: type[Int]):
+    other = u8(1) if cls is not u8 else u16(1)
+    for op in (operator.add, operator.sub, operator.mul, operator.floordiv):
+        with pytest.raises(TypeError):
+            op(cls(1), other)
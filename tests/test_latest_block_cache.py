@@ -0,0 +1,130 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db import Database
+
+
+class FakeLatestBlockPool:
+    # answers the latest block query with `row`, counting the queries; `during_query` runs inside the fetch
+    def __init__(self):
+        self.row: dict[str, Any] = {"height": 1}
+        self.queries = 0
+        self.during_query: Optional[Callable[[], Awaitable[None]]] = None
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    async def execute(self, query: str, params: Any = None):
+        self.queries += 1
+        self.result = dict(self.row)
+        if self.during_query is not None:
+            await self.during_query()
+
+    async def fetchone(self):
+        return self.result
+
+
+async def ignore_message(msg: Any):
+    pass
+
+
+def make_database(redis_settings: dict[str, Any]) -> Database:
+    db = Database(server="", user="", password="", database="", schema="", message_callback=ignore_message,
+                  **redis_settings)
+    db.redis = Redis(host=redis_settings["redis_server"], port=redis_settings["redis_port"],
+                     db=redis_settings["redis_db"], decode_responses=True, username=redis_settings["redis_user"],
+                     password=redis_settings["redis_password"])
+    return db
+
+
+async def wait_listening(db: Database):
+    db._start_latest_block_listener()
+    async with asyncio.timeout(5):
+        while not db._latest_block_listening:
+            await asyncio.sleep(0.01)
+
+
+async def with_databases(redis_settings: dict[str, Any], test: Callable[[Database, Database, FakeLatestBlockPool], Awaitable[None]]):
+    # reader is a web process, writer stands in for the explorer process announcing blocks
+    reader = make_database(redis_settings)
+    writer = make_database(redis_settings)
+    pool = FakeLatestBlockPool()
+    reader.pool = pool # type: ignore
+    try:
+        await wait_listening(reader)
+        await test(reader, writer, pool)
+    finally:
+        if reader._latest_block_listener is not None:
+            reader._latest_block_listener.cancel()
+        await reader.redis.aclose()
+        await writer.redis.aclose()
+
+
+def test_cached_until_announced(redis_settings: dict[str, Any]):
+    async def test(reader: Database, writer: Database, pool: FakeLatestBlockPool):
+        assert await reader.get_latest_height() == 1
+        assert await reader.get_latest_height() == 1
+        assert pool.queries == 1
+
+        pool.row = {"height": 2}
+        new_block = asyncio.create_task(reader.wait_for_new_block())
+        await writer._publish_latest_block(2)
+        async with asyncio.timeout(5):
+            await new_block
+        assert await reader.get_latest_height() == 2
+        assert pool.queries == 2
+
+    asyncio.run(with_databases(redis_settings, test))
+
+
+def test_expires_without_announcements(redis_settings: dict[str, Any]):
+    async def test(reader: Database, writer: Database, pool: FakeLatestBlockPool):
+        reader.latest_block_max_age = 0.1
+        assert await reader.get_latest_height() == 1
+        pool.row = {"height": 2}
+        assert await reader.get_latest_height() == 1
+        await asyncio.sleep(0.2)
+        assert await reader.get_latest_height() == 2
+        assert pool.queries == 2
+
+    asyncio.run(with_databases(redis_settings, test))
+
+
+def test_not_cached_when_announced_during_fetch(redis_settings: dict[str, Any]):
+    async def test(reader: Database, writer: Database, pool: FakeLatestBlockPool):
+        async def announce():
+            # the row being fetched is already outdated when the fetch returns
+            pool.during_query = None
+            pool.row = {"height": 2}
+            new_block = asyncio.create_task(reader.wait_for_new_block())
+            await writer._publish_latest_block(2)
+            async with asyncio.timeout(5):
+                await new_block
+
+        pool.during_query = announce
+        assert await reader.get_latest_height() == 1
+        assert await reader.get_latest_height() == 2
+        assert await reader.get_latest_height() == 2
+        assert pool.queries == 2
+
+    asyncio.run(with_databases(redis_settings, test))
+
+
+def test_not_cached_without_listener(redis_settings: dict[str, Any]):
+    async def test(reader: Database, writer: Database, pool: FakeLatestBlockPool):
+        # while not subscribed announcements could be missed, so every call goes to the database
+        reader._latest_block_listening = False
+        assert await reader.get_latest_height() == 1
+        assert await reader.get_latest_height() == 1
+        assert pool.queries == 2
+
+    asyncio.run(with_databases(redis_settings, test))
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from jinja2 import DictLoader
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+import webui.template
+from middleware.htmx import HtmxData
+from webui.template import htmx_template
+
+page = "{% for i in range(rows) %}<p>{{ i }}</p>\n{% endfor %}"
+
+
+@htmx_template("page.jinja2", stream=True)
+async def page_route(request: Request):
+    return {"rows": int(request.query_params["rows"])}, {"Cache-Control": "public, max-age=3600"}
+
+
+def make_request(rows: int) -> Request:
+    scope = {"type": "http", "method": "GET", "path": "/page", "query_string": f"rows={rows}".encode(), "headers": []}
+    scope["htmx"] = HtmxData(scope)
+    return Request(scope)
+
+
+@pytest.fixture(autouse=True)
+def page_template(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(webui.template, "stream_env", webui.template.stream_env.overlay(loader=DictLoader({"page.jinja2": page})))
+    monkeypatch.setattr(webui.template, "stream_threshold", 1000)
+
+
+def expected(rows: int) -> str:
+    return "".join(f"<p>{i}</p>\n" for i in range(rows))
+
+
+def test_small_pages_are_sent_whole_with_their_headers():
+    response = asyncio.run(page_route(make_request(10)))
+    assert not isinstance(response, StreamingResponse)
+    assert response.headers["Cache-Control"] == "public, max-age=3600"
+    assert response.body.decode() == expected(10)
+
+
+def test_large_pages_are_streamed_and_not_stored():
+    async def test():
+        response = await page_route(make_request(1000))
+        assert isinstance(response, StreamingResponse)
+        assert response.headers["Cache-Control"] == "no-store"
+        return b"".join([chunk async for chunk in response.body_iterator]) # type: ignore[misc]
+
+    assert asyncio.run(test()).decode() == expected(1000)
@@ -0,0 +1,29 @@
+import os
+import pickle
+from io import BytesIO
+
+from aleo_types import Block, FixedSize, Option, Tuple, Vec, u8, u16
+
+
+def test_subscripted_types_keep_their_class():
+    values = [
+        Vec[u8, u16]([u8(1), u8(2)]),
+        Vec[u8, FixedSize[2]]([u8(1), u8(2)]),
+        Tuple[u8, u16]((u8(1), u16(2))),
+        Vec[Tuple[u8, u16], u8]([Tuple[u8, u16]((u8(1), u16(2)))]),
+        Option[u8](u8(1)),
+        Option[u8](None),
+    ]
+    for value in values:
+        loaded = pickle.loads(pickle.dumps(value))
+        assert type(loaded) is type(value)
+        assert loaded.dump() == value.dump()
+
+
+def test_block_round_trip():
+    with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "node", "testnet", "block.genesis"), "rb") as f:
+        data = f.read()
+    block = Block.load(BytesIO(data))
+    loaded = pickle.loads(pickle.dumps(block))
+    assert type(loaded.transactions) is type(block.transactions)
+    assert loaded.dump() == data
@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+from redis.asyncio import Redis
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db import Database
+
+
+async def ignore_message(msg: Any):
+    pass
+
+
+def make_database(monkeypatch: pytest.MonkeyPatch, redis_settings: Optional[dict[str, Any]] = None) -> Database:
+    # never connected, get_program is replaced by each test. Without redis_settings the shared cache is unreachable
+    if redis_settings is None:
+        redis_settings = {"redis_server": "", "redis_port": 0, "redis_db": 0, "redis_user": None, "redis_password": None}
+    db = Database(server="", user="", password="", database="", schema="", message_callback=ignore_message,
+                  **redis_settings)
+    if redis_settings["redis_server"]:
+        db.redis = Redis(host=redis_settings["redis_server"], port=redis_settings["redis_port"],
+                         db=redis_settings["redis_db"], decode_responses=True, username=redis_settings["redis_user"],
+                         password=redis_settings["redis_password"])
+    monkeypatch.setattr(db, "_start_latest_block_listener", lambda: None)
+    monkeypatch.setattr("db.program.Program", SimpleNamespace(load=lambda data: data.read()))
+    db._latest_block_listening = True
+    db._check_program_cache(100)
+    return db
+
+
+def test_program_is_cached(monkeypatch: pytest.MonkeyPatch):
+    db = make_database(monkeypatch)
+    fetches = 0
+
+    async def get_program(program_id: str) -> Optional[bytes]:
+        nonlocal fetches
+        fetches += 1
+        return b"v1"
+
+    monkeypatch.setattr(db, "get_program", get_program)
+
+    async def test():
+        assert await db.get_parsed_program("test.aleo") == b"v1"
+        assert await db.get_parsed_program("test.aleo") == b"v1"
+        assert fetches == 1
+
+    asyncio.run(test())
+
+
+def test_revert_during_fetch_is_not_cached(monkeypatch: pytest.MonkeyPatch):
+    db = make_database(monkeypatch)
+    versions = [b"before revert", b"after revert"]
+
+    async def get_program(program_id: str) -> Optional[bytes]:
+        version = versions.pop(0)
+        if version == b"before revert":
+            # the revert is announced while the old row is on its way
+            db._check_program_cache(90)
+        return version
+
+    monkeypatch.setattr(db, "get_program", get_program)
+
+    async def test():
+        assert await db.get_parsed_program("test.aleo") == b"before revert"
+        assert await db.get_parsed_program("test.aleo") == b"after revert"
+
+    asyncio.run(test())
+
+
+def test_program_is_shared_between_processes(monkeypatch: pytest.MonkeyPatch, redis_settings: dict[str, Any]):
+    workers = [make_database(monkeypatch, redis_settings) for _ in range(2)]
+    fetches = 0
+
+    async def get_program(program_id: str) -> Optional[bytes]:
+        nonlocal fetches
+        fetches += 1
+        return b"v1"
+
+    for db in workers:
+        monkeypatch.setattr(db, "get_program", get_program)
+
+    async def test():
+        await workers[0].redis.flushdb()
+        try:
+            assert await workers[0].get_parsed_program("test.aleo") == b"v1"
+            assert await workers[1].get_parsed_program("test.aleo") == b"v1"
+            assert fetches == 1
+        finally:
+            for db in workers:
+                await db.redis.aclose()
+
+    asyncio.run(test())
+
+
+def test_revert_drops_shared_programs(monkeypatch: pytest.MonkeyPatch, redis_settings: dict[str, Any]):
+    reader = make_database(monkeypatch, redis_settings)
+    other_reader = make_database(monkeypatch, redis_settings)
+    # stands in for the explorer process, announcing the revert
+    writer = make_database(monkeypatch, redis_settings)
+    versions = [b"before revert", b"after revert"]
+
+    async def get_program(program_id: str) -> Optional[bytes]:
+        return versions[0]
+
+    for db in (reader, other_reader):
+        monkeypatch.setattr(db, "get_program", get_program)
+
+    async def test():
+        await writer.redis.flushdb()
+        try:
+            await writer._publish_latest_block(100)
+            assert await reader.get_parsed_program("test.aleo") == b"before revert"
+            versions.pop(0)
+            await writer._publish_latest_block(90)
+            assert await other_reader.get_parsed_program("test.aleo") == b"after revert"
+        finally:
+            for db in (reader, other_reader, writer):
+                await db.redis.aclose()
+
+    asyncio.run(test())
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from typing import Any, AsyncContextManager, Callable
+
+import psycopg
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+
+
+def unbounded_sorts(plan: dict[str, Any], sorting: bool = False) -> list[str]:
+    # table scans feeding a sort without a LIMIT in between, i.e. every match gets sorted
+    if plan["Node Type"] == "Limit":
+        sorting = False
+    elif plan["Node Type"] in ("Sort", "Incremental Sort"):
+        sorting = True
+    if sorting and "Relation Name" in plan:
+        return [plan["Relation Name"]]
+    return [x for child in plan.get("Plans", []) for x in unbounded_sorts(child, sorting)]
+
+
+def test_search_queries_stop_at_limit(fresh_database: Callable[[], AsyncContextManager[Any]],
+                                      monkeypatch: Any):
+    queries: list[tuple[Any, Any]] = []
+    execute = psycopg.AsyncCursor.execute
+
+    async def record(self: Any, query: Any, params: Any = None, **kwargs: Any):
+        queries.append((query, params))
+        return await execute(self, query, params, **kwargs)
+
+    async def test():
+        async with fresh_database() as db:
+            monkeypatch.setattr(psycopg.AsyncCursor, "execute", record)
+            for query in ["ab1qqqq", "at1qqqq", "au1qqqq", "aleo1qqqq", "solution1qqqq", "credits"]:
+                await db.search(query)
+            monkeypatch.undo()
+
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    # the tables are empty, make the planner pick index scans where it can
+                    await cur.execute("SET enable_seqscan = off")
+                    await cur.execute("SET enable_bitmapscan = off")
+                    for query, params in queries:
+                        await cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+                        plan = (await cur.fetchone())["QUERY PLAN"]
+                        if isinstance(plan, str):
+                            plan = json.loads(plan)
+                        assert unbounded_sorts(plan[0]["Plan"]) == [], query
+
+    asyncio.run(test())
+
+
+def test_search_program_and_name_order(fresh_database: Callable[[], AsyncContextManager[Any]]):
+    names = ["abc.ans", "abc", "abcd", "abc_d", "ab", "abb", "abcdefgh", "xabc"]
+
+    async def test():
+        async with fresh_database() as db:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    for i, name in enumerate(names):
+                        await cur.execute(
+                            "INSERT INTO ans_name (name_hash, name, parent, full_name) VALUES (%s, %s, '0field', %s)",
+                            (f"{i}field", name, name)
+                        )
+            assert await db.search_ans_name("abc", 10) == ["abc", "abcd", "abc_d", "abc.ans", "abcdefgh"]
+            # the first matches in byte order, then shortest first
+            assert await db.search_ans_name("abc", 3) == ["abc", "abc_d", "abc.ans"]
+            assert await db.search_ans_name("abc_", 10) == ["abc_d"]
+
+    asyncio.run(test())
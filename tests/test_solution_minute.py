@@ -0,0 +1,80 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any, AsyncContextManager, Callable
+
+import pytest
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db.address import DatabaseAddress
+from db.insert import DatabaseInsert
+from test_validator_uptime import insert_block
+
+provers = [f"aleo1prover{i}" for i in range(8)]
+
+
+async def minutes(cur: Any) -> dict[tuple[str, int], tuple[int, int, int, int]]:
+    await cur.execute("SELECT address, minute, solution_count, target_sum, proof_target_sum, reward FROM solution_minute")
+    return {
+        (row["address"], row["minute"]): (row["solution_count"], row["target_sum"], row["proof_target_sum"], row["reward"])
+        for row in await cur.fetchall()
+    }
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_solution_minute_matches_rebuild_and_scan(fresh_database: Callable[[], AsyncContextManager[Any]],
+                                                  monkeypatch: pytest.MonkeyPatch, seed: int):
+    rng = random.Random(seed)
+    # the period starts on a minute boundary like the real one, and ends inside a minute
+    period = (1700000040, 1700001030)
+    monkeypatch.setattr(DatabaseAddress, "incentive_period", period)
+
+    async def test():
+        async with fresh_database() as db:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    timestamp = period[0] - 200
+                    for height in range(120):
+                        timestamp += rng.choice([0, 1, 7, 20, 40])
+                        if height == 30:
+                            timestamp = period[0]
+                        block_id = await insert_block(cur, height, timestamp)
+                        await cur.execute(
+                            "UPDATE block SET proof_target = %s WHERE id = %s", (rng.randint(1, 1000), block_id)
+                        )
+                        await cur.execute(
+                            "INSERT INTO puzzle_solution (block_id) VALUES (%s) RETURNING id", (block_id,)
+                        )
+                        puzzle_solution_id = (await cur.fetchone())["id"]
+                        solutions: list[tuple[Any, int, int]] = []
+                        for _ in range(rng.randint(1 if height == 30 else 0, 6)):
+                            address = rng.choice(provers)
+                            target, reward = rng.randint(1, 10 ** 12), rng.randint(1, 10 ** 6)
+                            await cur.execute(
+                                "INSERT INTO solution (puzzle_solution_id, address, counter, target, reward, epoch_hash) "
+                                "VALUES (%s, %s, 0, %s, %s, '')",
+                                (puzzle_solution_id, address, target, reward)
+                            )
+                            solutions.append((SimpleNamespace(partial_solution=SimpleNamespace(address=address)), target, reward))
+                        block = SimpleNamespace(height=height, header=SimpleNamespace(metadata=SimpleNamespace(timestamp=timestamp)))
+                        await DatabaseInsert._save_solution_minute(cur, block, solutions) # type: ignore[arg-type]
+
+                    incremental = await minutes(cur)
+                    await DatabaseAddress._rebuild_solution_minute(cur, 0)
+                    assert incremental == await minutes(cur)
+
+                    await cur.execute(
+                        "SELECT s.address, sum(s.reward) as reward FROM solution s "
+                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
+                        "JOIN block b ON ps.block_id = b.id "
+                        "WHERE b.timestamp > %s AND b.timestamp < %s "
+                        "GROUP BY s.address",
+                        period
+                    )
+                    expected = {row["address"]: row["reward"] for row in await cur.fetchall()}
+
+            assert {row["address"]: row["reward"] for row in await db.get_incentive_addresses(0, 50)} == expected
+            assert await db.get_incentive_address_count() == len(expected)
+            assert await db.get_incentive_total_reward() == sum(expected.values())
+
+    asyncio.run(test())
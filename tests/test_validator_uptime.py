@@ -0,0 +1,88 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any, AsyncContextManager, Callable
+
+import pytest
+
+import explorer # type: ignore # db has to be imported through explorer, like main.py does
+from db.validator import DatabaseValidator
+
+validators = [f"aleo1validator{i}" for i in range(12)]
+
+
+async def insert_block(cur: Any, height: int, timestamp: int) -> int:
+    await cur.execute(
+        "INSERT INTO block (height, block_hash, previous_hash, previous_state_root, transactions_root, finalize_root, "
+        "ratifications_root, solutions_root, subdag_root, round, cumulative_weight, cumulative_proof_target, "
+        "coinbase_target, proof_target, last_coinbase_target, last_coinbase_timestamp, timestamp, block_reward, "
+        "coinbase_reward, total_supply, confirm_timestamp) "
+        "VALUES (%s, %s, %s, '', '', '', '', '', '', %s, 0, 0, 0, 0, 0, 0, %s, 0, 0, 0, %s) RETURNING id",
+        (height, f"ab{height}", f"ab{height - 1}", height, timestamp, timestamp)
+    )
+    return (await cur.fetchone())["id"]
+
+
+async def insert_committee(cur: Any, height: int, members: list[str]):
+    await cur.execute(
+        "INSERT INTO committee_history (height, starting_round, total_stake, committee_id) "
+        "VALUES (%s, %s, 0, '') RETURNING id",
+        (height, height)
+    )
+    committee_id = (await cur.fetchone())["id"]
+    for member in members:
+        await cur.execute(
+            "INSERT INTO committee_history_member (committee_id, address, stake, is_open, commission) "
+            "VALUES (%s, %s, 10000000000, true, 0)",
+            (committee_id, member)
+        )
+
+
+async def uptime(cur: Any) -> dict[str, tuple[int, int]]:
+    await cur.execute("SELECT validator, signed, committee FROM validator_uptime")
+    return {row["validator"]: (row["signed"], row["committee"]) for row in await cur.fetchall()}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_uptime_matches_rebuild(fresh_database: Callable[[], AsyncContextManager[Any]],
+                                            monkeypatch: pytest.MonkeyPatch, seed: int):
+    # a short window so the seeded history slides through it many times
+    monkeypatch.setattr(DatabaseValidator, "uptime_window", 600)
+    rng = random.Random(seed)
+
+    async def test():
+        async with fresh_database() as db:
+            async with db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    timestamp = 1700000000
+                    committee = rng.sample(validators, 6)
+                    for height in range(400):
+                        # same second blocks and gaps longer than the window included
+                        timestamp += rng.choice([0, 1, 5, 20, 60, 200, 700])
+                        block_id = await insert_block(cur, height, timestamp)
+                        if rng.random() < 0.1:
+                            committee = rng.sample(validators, rng.randint(3, 10))
+                        if rng.random() < 0.9:
+                            await insert_committee(cur, height, committee)
+                        for validator in committee:
+                            if rng.random() < 0.8:
+                                await cur.execute(
+                                    "INSERT INTO block_validator (block_id, validator) VALUES (%s, %s)",
+                                    (block_id, validator)
+                                )
+                        block = SimpleNamespace(height=height, header=SimpleNamespace(metadata=SimpleNamespace(timestamp=timestamp)))
+                        await db._update_validator_uptime(cur, block, block_id)
+
+                        if height % 25 == 24:
+                            incremental = await uptime(cur)
+                            await DatabaseValidator._rebuild_validator_uptime(cur)
+                            assert incremental == await uptime(cur), f"mismatch at height {height}"
+                            # continue from the incrementally maintained rows
+                            await cur.execute("DELETE FROM validator_uptime")
+                            for validator, (signed, in_committee) in incremental.items():
+                                await cur.execute(
+                                    "INSERT INTO validator_uptime (validator, signed, committee) VALUES (%s, %s, %s)",
+                                    (validator, signed, in_committee)
+                                )
+
+    asyncio.run(test())
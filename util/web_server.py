@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from types import FrameType
+from typing import Any, Optional
+
+import uvicorn
+
+from util.set_proc_title import set_proc_title
+
+
+class UvicornWorker(multiprocessing.Process):
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket):
+        super().__init__()
+        self.config = config
+        self.sock = sock
+
+    def run(self, *args: Any, **kwargs: Any):
+        # uvicorn handles SIGTERM by finishing in-flight requests before exiting
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        uvicorn.Server(config=self.config).run(sockets=[self.sock])
+
+
+class UvicornServer(multiprocessing.Process):
+    # Binds the listening socket once and keeps `workers` uvicorn processes accepting on it.
+    # Dead workers are replaced, SIGHUP replaces every worker one at a time without dropping the socket.
+
+    # how long a replaced worker gets to finish its requests
+    graceful_timeout = 30
+    # how long a new worker gets to start up before the old one is stopped
+    startup_delay = 2
+
+    def __init__(self, config: uvicorn.Config, workers: int, name: str):
+        super().__init__()
+        self.config = config
+        self.workers = workers
+        self.title = name
+        self.processes: list[UvicornWorker] = []
+        self.restarting = False
+        self.exiting = False
+
+    def stop(self):
+        self.terminate()
+
+    def _spawn(self, sock: socket.socket) -> UvicornWorker:
+        process = UvicornWorker(self.config, sock)
+        process.start()
+        return process
+
+    @staticmethod
+    def _stop_worker(process: UvicornWorker, timeout: float):
+        process.terminate()
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def _handle_restart(self, signum: int, frame: Optional[FrameType]):
+        self.restarting = True
+
+    def _handle_exit(self, signum: int, frame: Optional[FrameType]):
+        self.exiting = True
+
+    def run(self, *args: Any, **kwargs: Any):
+        set_proc_title(f"aleo-explorer: {self.title} supervisor")
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        sock = self.config.bind_socket()
+        self.processes = [self._spawn(sock) for _ in range(self.workers)]
+        while not self.exiting:
+            if self.restarting:
+                self.restarting = False
+                print(f"{self.title}: restarting {len(self.processes)} workers")
+                for i, old in enumerate(self.processes):
+                    self.processes[i] = self._spawn(sock)
+                    time.sleep(self.startup_delay)
+                    self._stop_worker(old, self.graceful_timeout)
+            for i, process in enumerate(self.processes):
+                if not process.is_alive():
+                    print(f"{self.title}: worker {process.pid} exited with {process.exitcode}, restarting")
+                    process.join()
+                    self.processes[i] = self._spawn(sock)
+            time.sleep(0.5)
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(self.graceful_timeout)
+            if process.is_alive():
+                process.kill()
+        sock.close()
+
+
+def get_worker_count(env_name: str) -> int:
+    workers = int(os.environ.get(env_name, "1"))
+    if workers < 1:
+        raise ValueError(f"{env_name} must be at least 1")
+    return workers
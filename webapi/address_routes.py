@@ -3,8 +3,7 @@ from typing import Any, cast, Optional
 
 from starlette.requests import Request
 
-from aleo_types import LiteralPlaintext, Literal, Address, PlaintextValue, Value, Int, StructPlaintext, u64
-from aleo_types.cached import cached_get_key_id
+from aleo_types import LiteralPlaintext, Address, PlaintextValue, Value, Int, StructPlaintext, u64
 from db import Database
 from webapi.utils import CJSONResponse, public_cache_seconds
 from webui.classes import UIAddress
@@ -20,32 +19,20 @@ async def address_route(request: Request) -> CJSONResponse:
         Address.loads(address)
     except ValueError:
         return CJSONResponse({"error": "Invalid address format"}, status_code=400)
-    solutions = await db.get_recent_solutions_by_address(address)
-    programs = await db.get_recent_programs_by_address(address)
-    transitions = await db.get_address_recent_transitions(address)
-    address_key = LiteralPlaintext(
-        literal=Literal(
-            type_=Literal.Type.Address,
-            primitive=Address.loads(address),
-        )
-    )
-    address_key_bytes = address_key.dump()
-    account_key_id = cached_get_key_id("credits.aleo", "account", address_key_bytes)
-    bonded_key_id = cached_get_key_id("credits.aleo", "bonded", address_key_bytes)
-    unbonding_key_id = cached_get_key_id("credits.aleo", "unbonding", address_key_bytes)
-    committee_key_id = cached_get_key_id("credits.aleo", "committee", address_key_bytes)
-    delegated_key_id = cached_get_key_id("credits.aleo", "delegated", address_key_bytes)
-    withdraw_key_id = cached_get_key_id("credits.aleo", "withdraw", address_key_bytes)
-    public_balance_bytes = await db.get_mapping_value("credits.aleo", "account", account_key_id)
-    bond_state_bytes = await db.get_mapping_value("credits.aleo", "bonded", bonded_key_id)
-    unbond_state_bytes = await db.get_mapping_value("credits.aleo", "unbonding", unbonding_key_id)
-    committee_state_bytes = await db.get_mapping_value("credits.aleo", "committee", committee_key_id)
-    delegated_bytes = await db.get_mapping_value("credits.aleo", "delegated", delegated_key_id)
-    stake_reward = await db.get_address_stake_reward(address)
-    transfer_in = await db.get_address_transfer_in(address)
-    transfer_out = await db.get_address_transfer_out(address)
-    fee = await db.get_address_total_fee(address)
-    program_name = await db.get_program_name_from_address(address)
+    profile = await db.get_address_profile(address)
+    solutions = profile["solutions"]
+    programs = profile["programs"]
+    transitions = profile["transitions"]
+    public_balance_bytes = profile["account"]
+    bond_state_bytes = profile["bonded"]
+    unbond_state_bytes = profile["unbonding"]
+    committee_state_bytes = profile["committee"]
+    delegated_bytes = profile["delegated"]
+    stake_reward = profile["address_stake_reward"]
+    transfer_in = profile["address_transfer_in"]
+    transfer_out = profile["address_transfer_out"]
+    fee = profile["address_fee"]
+    program_name = profile["program_name"]
 
     if (len(solutions) == 0
         and len(programs) == 0
@@ -63,16 +50,11 @@ async def address_route(request: Request) -> CJSONResponse:
     ):
         return CJSONResponse({"error": "Address not found"}, status_code=404)
 
-    if len(solutions) > 0:
-        solution_count = await db.get_solution_count_by_address(address)
-        total_rewards = await db.get_puzzle_reward_by_address(address)
-        speed, interval = await db.get_address_speed(address)
-    else:
-        solution_count = 0
-        total_rewards = 0
-        speed = 0
-        interval = 0
-    program_count = await db.get_program_count_by_address(address)
+    solution_count = profile["solution_count"]
+    total_rewards = (profile["address_puzzle_reward"] or 0) if len(solutions) > 0 else 0
+    speed = profile["speed"]
+    interval = profile["interval"]
+    program_count = profile["program_count"]
     recent_solutions: list[dict[str, Any]] = []
     for solution in solutions:
         recent_solutions.append({
@@ -87,14 +69,13 @@ async def address_route(request: Request) -> CJSONResponse:
 
     recent_programs: list[dict[str, Any]] = []
     for program in programs:
-        deploy_info = await db.get_deploy_info_by_program_id(program)
-        if deploy_info is None:
+        if program["height"] is None:
             return CJSONResponse({"error": "Program not found"}, status_code=500)
         recent_programs.append({
-            "program_id": program,
-            "height": deploy_info["height"],
-            "timestamp": deploy_info["timestamp"],
-            "transaction_id": deploy_info["transaction_id"],
+            "program_id": program["program_id"],
+            "height": program["height"],
+            "timestamp": program["timestamp"],
+            "transaction_id": program["transaction_id"],
         })
     if public_balance_bytes is None:
         public_balance = 0
@@ -114,7 +95,7 @@ async def address_route(request: Request) -> CJSONResponse:
             "validator": str(validator.literal.primitive),
             "amount": cast(Int, amount.literal.primitive),
         }
-        withdraw_bytes = await db.get_mapping_value("credits.aleo", "withdraw", withdraw_key_id)
+        withdraw_bytes = profile["withdraw"]
         if withdraw_bytes is None:
             withdrawal_address = None
         else:
@@ -135,6 +116,7 @@ async def address_route(request: Request) -> CJSONResponse:
     if committee_state_bytes is None:
         committee_state = None
         address_stakes: Optional[dict[str, int]] = None
+        address_stakes_count = None
         uptime = None
     else:
         value = cast(PlaintextValue, Value.load(BytesIO(committee_state_bytes)))
@@ -145,14 +127,10 @@ async def address_route(request: Request) -> CJSONResponse:
             "commission": cast(Int, commission.literal.primitive),
             "is_open": bool(is_open.literal.primitive),
         }
-        bonded_mapping = await db.get_bonded_mapping_unchecked()
-        bonded_mapping = sorted(bonded_mapping.items(), key=lambda x: x[1][1], reverse=True)
-        address_stakes = {}
-        for staker_addr, (validator_addr, stake_amount) in bonded_mapping:
-            if str(validator_addr) == address:
-                address_stakes[str(staker_addr)] = stake_amount
-                if len(address_stakes) >= 50:
-                    break
+        address_stakes = {
+            staker: u64(amount) for staker, amount in await db.get_validator_bonded_stakers(address, 0, 50)
+        }
+        address_stakes_count = await db.get_validator_bonded_staker_count(address)
         uptime = await db.get_validator_uptime(address)
     if delegated_bytes is None:
         delegated = None
@@ -171,15 +149,12 @@ async def address_route(request: Request) -> CJSONResponse:
 
     recent_transitions: list[dict[str, Any]] = []
     for transition_data in transitions:
-        transition = await db.get_transition(transition_data["transition_id"])
-        if transition is None:
-            return CJSONResponse({"error": "Transition not found"}, status_code=500)
         recent_transitions.append({
             "transition_id": transition_data["transition_id"],
             "height": transition_data["height"],
             "timestamp": transition_data["timestamp"],
-            "program_id": transition.program_id,
-            "function_name": transition.function_name,
+            "program_id": transition_data["program_id"],
+            "function_name": transition_data["function_name"],
         })
 
     result = {
@@ -196,6 +171,7 @@ async def address_route(request: Request) -> CJSONResponse:
         "unbond_state": unbond_state,
         "committee_state": committee_state,
         "address_stakes": address_stakes,
+        "address_stakes_count": address_stakes_count,
         "delegated": delegated,
         "withdrawal_address": withdrawal_address,
         "uptime": uptime,
@@ -208,4 +184,36 @@ async def address_route(request: Request) -> CJSONResponse:
         "latest_height": await db.get_latest_height(),
     }
     result["resolved_addresses"] = await UIAddress.resolve_recursive_detached(result, db, {})
-    return CJSONResponse(result)
\ No newline at end of file
+    return CJSONResponse(result)
+
+@public_cache_seconds(5)
+async def address_stakers_route(request: Request) -> CJSONResponse:
+    db: Database = request.app.state.db
+    address = request.path_params["address"]
+    try:
+        Address.loads(address)
+    except ValueError:
+        return CJSONResponse({"error": "Invalid address format"}, status_code=400)
+    try:
+        page = request.query_params.get("p")
+        if page is None:
+            page = 1
+        else:
+            page = int(page)
+    except:
+        return CJSONResponse({"error": "Invalid page"}, status_code=400)
+    staker_count = await db.get_validator_bonded_staker_count(address)
+    total_pages = (staker_count // 50) + 1
+    if page < 1 or page > total_pages:
+        return CJSONResponse({"error": "Invalid page"}, status_code=400)
+    start = 50 * (page - 1)
+    result = {
+        "address_stakes": {
+            staker: u64(amount) for staker, amount in await db.get_validator_bonded_stakers(address, start, start + 50)
+        },
+        "address_stakes_count": staker_count,
+        "page": page,
+        "total_pages": total_pages,
+    }
+    result["resolved_addresses"] = await UIAddress.resolve_recursive_detached(result, db, {})
+    return CJSONResponse(result)
@@ -5,34 +5,56 @@ from typing import Any, Optional
 
 import aleo_explorer_rust
 from starlette.requests import Request
+from starlette.responses import StreamingResponse
 
 from aleo_types import u64, DeployTransaction, ExecuteTransaction, FeeTransaction, RejectedDeploy, RejectedExecute, Fee, \
     FinalizeOperation, UpdateKeyValue, RemoveKeyValue, Value, Plaintext
 from aleo_types.cached import cached_get_mapping_id, cached_get_key_id
 from aleo_types.vm_block import AcceptedDeploy, AcceptedExecute
 from db import Database
-from util import arc0137
-from webapi.utils import CJSONResponse, public_cache_seconds, function_definition
+from webapi.utils import CJSONResponse, public_cache_seconds, function_definition, height_cache, BlockBroadcaster, \
+    cjson_dumps
 from webui.classes import UIAddress
 
 
 async def get_summary(db: Database):
-    network_speed = await db.get_network_speed()
-    validators = await db.get_current_validator_count()
-    participation_rate = await db.get_network_participation_rate()
-    block = await db.get_latest_block()
+    network_summary = await db.get_network_summary()
+    header = await db.get_latest_block_header()
     summary = {
-        "latest_height": block.height,
-        "latest_timestamp": block.header.metadata.timestamp,
-        "proof_target": block.header.metadata.proof_target,
-        "coinbase_target": block.header.metadata.coinbase_target,
-        "network_speed": network_speed,
-        "validators": validators,
-        "participation_rate": participation_rate,
+        "latest_height": header.metadata.height,
+        "latest_timestamp": header.metadata.timestamp,
+        "proof_target": header.metadata.proof_target,
+        "coinbase_target": header.metadata.coinbase_target,
+        "network_speed": network_summary["network_speed"],
+        "validators": network_summary["validator_count"],
+        # stored as double precision, but served as a string like the Decimal it used to be computed as
+        "participation_rate": Decimal(str(network_summary["participation_rate"])),
     }
     return summary
 
+async def _build_block_event(db: Database) -> tuple[int, bytes]:
+    summary = await get_summary(db)
+    recent_blocks = await db.get_recent_blocks_fast(1)
+    event = {
+        "summary": summary,
+        "block": recent_blocks[0] if recent_blocks else None,
+        "unconfirmed_transactions": await db.get_unconfirmed_transaction_count(),
+    }
+    return summary["latest_height"], b"event: block\ndata: " + cjson_dumps(event) + b"\n\n"
+
+block_broadcaster = BlockBroadcaster(_build_block_event)
+
+async def block_stream_route(request: Request):
+    # server-sent events: the current state on connect, then one event per new block
+    db: Database = request.app.state.db
+    return StreamingResponse(
+        block_broadcaster.subscribe(db),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @public_cache_seconds(5)
+@height_cache
 async def recent_blocks_route(request: Request):
     db: Database = request.app.state.db
     recent_blocks = await db.get_recent_blocks_fast(10)
@@ -114,6 +136,7 @@ async def block_route(request: Request):
 
 
 @public_cache_seconds(5)
+@height_cache
 async def blocks_route(request: Request):
     db: Database = request.app.state.db
     try:
@@ -137,6 +160,7 @@ async def blocks_route(request: Request):
     return CJSONResponse({"blocks": blocks, "total_blocks": total_blocks, "total_pages": total_pages})
 
 @public_cache_seconds(5)
+@height_cache
 async def validators_route(request: Request):
     db: Database = request.app.state.db
     try:
@@ -487,58 +511,11 @@ async def search_route(request: Request):
         pass
     if query.startswith("aprivatekey1zkp"):
         return CJSONResponse({"error": "You have leaked your private key"})
-    too_many = False
-    all_names = await arc0137.get_all_names(db)
-    names = list(filter(lambda name: name.startswith(query), all_names))
-    programs = await db.search_program(query)
-    if len(programs) > 50:
-        too_many = True
-        programs = programs[:50]
-    if len(names) > 50:
-        too_many = True
-        names = names[:50]
-    if len(programs) + len(names) > 0:
-        return CJSONResponse({"type": "ans_program", "programs": programs, "names": names, "too_many": too_many})
-    if query.startswith("ab1"):
-        if len(query) < 6:
-            return CJSONResponse({"error": "Query too short"}, status_code=400)
-        blocks = await db.search_block_hash(query)
-        if len(blocks) > 50:
-            too_many = True
-            blocks = blocks[:50]
-        return CJSONResponse({"type": "blocks", "blocks": blocks, "too_many": too_many})
-    if query.startswith("at1"):
-        if len(query) < 6:
-            return CJSONResponse({"error": "Query too short"}, status_code=400)
-        transactions = await db.search_transaction_id(query)
-        if len(transactions) > 50:
-            too_many = True
-            transactions = transactions[:50]
-        return CJSONResponse({"type": "transactions", "transactions": transactions, "too_many": too_many})
-    if query.startswith("au1"):
-        if len(query) < 6:
-            return CJSONResponse({"error": "Query too short"}, status_code=400)
-        transitions = await db.search_transition_id(query)
-        if len(transitions) > 50:
-            too_many = True
-            transitions = transitions[:50]
-        return CJSONResponse({"type": "transitions", "transitions": transitions, "too_many": too_many})
-    if query.startswith("aleo1"):
-        if len(query) < 8:
-            return CJSONResponse({"error": "Query too short"}, status_code=400)
-        addresses = await db.search_address(query)
-        if len(addresses) > 50:
-            too_many = True
-            addresses = addresses[:50]
-        return CJSONResponse({"type": "addresses", "addresses": addresses, "too_many": too_many})
-    if query.startswith("solution1"):
-        if len(query) < 12:
-            return CJSONResponse({"error": "Query too short"}, status_code=400)
-        solutions = await db.search_solution(query)
-        if len(solutions) > 50:
-            too_many = True
-            solutions = solutions[:50]
-        return CJSONResponse({"type": "solutions", "solutions": solutions, "too_many": too_many})
-    else:
+    try:
+        result = await db.search(query)
+    except ValueError as e:
+        return CJSONResponse({"error": str(e)}, status_code=400)
+    if result["type"] == "ans_program" and not result["programs"] and not result["names"]:
         return CJSONResponse({"error": "No results found"}, status_code=404)
+    return CJSONResponse(result)
 
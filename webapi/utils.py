@@ -3,10 +3,11 @@ import functools
 import json
 import os
 import time
+import traceback
 from decimal import Decimal
 # noinspection PyProtectedMember
 from json.encoder import encode_basestring_ascii, encode_basestring, _make_iterencode, INFINITY  # type: ignore
-from typing import Any, Callable, Coroutine
+from typing import Any, AsyncIterator, Callable, Coroutine, Optional, cast
 
 import aiohttp
 from starlette.requests import Request
@@ -78,25 +79,75 @@ class CustomEncoder(json.JSONEncoder):
         return _iterencode(o, 0)
 
     def default(self, o: Any):
-        if isinstance(o, Decimal):
-            return str(o)
-        elif isinstance(o, UIAddress):
-            return {
-                "address": o.address,
-                "name": o.name,
-                "tag": o.tag,
-                "link": o.link,
-                "logo": o.logo,
-            }
-        elif isinstance(o, JSONSerialize):
-            return o.json()
-        return super().default(o)
+        return default_json(o)
+
+
+def default_json(o: Any) -> Any:
+    if isinstance(o, Decimal):
+        return str(o)
+    elif isinstance(o, UIAddress):
+        return {
+            "address": o.address,
+            "name": o.name,
+            "tag": o.tag,
+            "link": o.link,
+            "logo": o.logo,
+        }
+    elif isinstance(o, JSONSerialize):
+        return o.json()
+    raise TypeError(f'Object of type {o.__class__.__name__} is not JSON serializable')
+
+class _NativeJSONUnsupported(Exception):
+    pass
+
+_native_json_types = (str, int, float, bool, type(None))
+
+# Converts everything CustomEncoder handles specially into plain values, so the result can go through the
+# C accelerated encoder and still produce the same output. Anything unexpected takes the CustomEncoder path.
+def _to_native_json(o: Any) -> Any:
+    tp = o.__class__
+    if tp is str or tp is int or tp is float or o is None or o is True or o is False:
+        return o
+    if tp is dict:
+        o = cast(dict[Any, Any], o)
+        res: dict[Any, Any] = {}
+        for k, v in o.items():
+            # CustomEncoder rejects aleo Int keys while the C encoder would accept them
+            if not isinstance(k, _native_json_types) or isinstance(k, Int):
+                raise _NativeJSONUnsupported
+            res[k] = _to_native_json(v)
+        return res
+    if tp is list:
+        return [_to_native_json(v) for v in cast(list[Any], o)]
+    if isinstance(o, str):
+        return o
+    if isinstance(o, Int):
+        return _to_native_json(o.json())
+    if isinstance(o, (int, float)):
+        return o
+    # checked before JSONSerialize: Vec and Tuple are encoded as plain sequences by CustomEncoder
+    if isinstance(o, (list, tuple)):
+        return [_to_native_json(v) for v in cast(list[Any], o)]
+    if isinstance(o, dict):
+        return _to_native_json(dict(cast(dict[Any, Any], o)))
+    if isinstance(o, (Decimal, UIAddress, JSONSerialize)):
+        return _to_native_json(default_json(o))
+    raise _NativeJSONUnsupported
+
+def cjson_dumps(content: Any) -> bytes:
+    if isinstance(content, Int):
+        return str(content.json()).encode("utf-8")
+    try:
+        native = _to_native_json(content)
+    except (_NativeJSONUnsupported, RecursionError):
+        return json.dumps(content, cls=CustomEncoder).encode("utf-8")
+    return json.dumps(native).encode("utf-8")
 
 class CJSONResponse(Response):
     media_type = "application/json"
 
     def render(self, content: Any):
-        return json.dumps(content, cls=CustomEncoder).encode("utf-8")
+        return cjson_dumps(content)
 
 async def get_remote_height(session: aiohttp.ClientSession, rpc_root: str) -> str:
     try:
@@ -180,4 +231,146 @@ def public_cache_seconds(seconds: int):
             response.headers["Cache-Control"] = f"public, max-age={seconds}"
             return response
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+class HeightCache:
+    # Route results of this process keyed on path, query and latest height.
+    # Entries are dropped as soon as the height moves, concurrent misses share one computation.
+
+    max_entries = 1000
+
+    def __init__(self):
+        self.height: Optional[int] = None
+        self.entries: dict[str, tuple[int, bytes, list[tuple[bytes, bytes]]]] = {}
+        # keyed on height as well, a computation for an older height must not answer requests for the new one.
+        # None means the computation was cancelled and the waiters should retry
+        self.pending: dict[tuple[int, str], asyncio.Future[Optional[tuple[int, bytes, list[tuple[bytes, bytes]]]]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def stats(self) -> dict[str, Any]:
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            "height": self.height,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / requests if requests else 0,
+        }
+
+    async def get(self, key: str, height: int, func: Callable[[], Coroutine[Any, Any, Response]]) -> Response:
+        if height != self.height:
+            self.height = height
+            self.entries.clear()
+        while True:
+            if (entry := self.entries.get(key)) is not None and height == self.height:
+                self.hits += 1
+                break
+            if (future := self.pending.get((height, key))) is not None:
+                entry = await asyncio.shield(future)
+                if entry is None:
+                    continue
+                self.coalesced += 1
+                break
+            self.misses += 1
+            future = asyncio.get_running_loop().create_future()
+            self.pending[(height, key)] = future
+            try:
+                response = await func()
+                entry = response.status_code, bytes(response.body), list(response.raw_headers)
+                future.set_result(entry)
+            except asyncio.CancelledError:
+                # only this request is gone, let one of the waiters take over
+                future.set_result(None)
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # other waiters get the exception, don't warn about it going unretrieved here
+                future.exception()
+                raise
+            finally:
+                del self.pending[(height, key)]
+            # only cache successful results computed for the current height
+            if response.status_code == 200 and height == self.height and len(self.entries) < self.max_entries:
+                self.entries[key] = entry
+            return response
+        status_code, body, raw_headers = entry
+        response = Response(content=body, status_code=status_code)
+        response.raw_headers = list(raw_headers)
+        return response
+
+
+height_cache_instance = HeightCache()
+
+
+def height_cache(func: Callable[[Request], Coroutine[Any, Any, Response]]):
+    # opt-in server side cache for routes whose result only changes with new blocks
+    @functools.wraps(func)
+    async def wrapper(request: Request):
+        db: Database = request.app.state.db
+        height = await db.get_latest_height()
+        if height is None:
+            return await func(request)
+        key = f"{request.url.path}?{request.url.query}"
+        return await height_cache_instance.get(key, height, lambda: func(request))
+    return wrapper
+
+
+class BlockBroadcaster:
+    # One waiter per process builds the new block event once, every connected client only waits on an event
+    # and sends the shared pre-encoded message.
+
+    # also re-check on this interval in case a notification was missed
+    poll_interval = 10
+
+    def __init__(self, build: Callable[[Database], Coroutine[Any, Any, tuple[int, bytes]]]):
+        self.build = build
+        self.height: Optional[int] = None
+        self.message = b""
+        self.clients = 0
+        self._updated = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._ready = asyncio.Event()
+
+    async def _run(self, db: Database):
+        while True:
+            try:
+                height, message = await self.build(db)
+                if height != self.height:
+                    self.height, self.message = height, message
+                    self._ready.set()
+                    self._updated.set()
+                    self._updated = asyncio.Event()
+            except Exception:
+                traceback.print_exc()
+            try:
+                await asyncio.wait_for(db.wait_for_new_block(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def subscribe(self, db: Database, keepalive: int = 15) -> AsyncIterator[bytes]:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(db))
+        self.clients += 1
+        try:
+            # the first block can take a while to build, keep the connection alive meanwhile
+            while not self._ready.is_set():
+                try:
+                    await asyncio.wait_for(self._ready.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+            # height of the message this client was last sent, it can move on while the client is sending
+            height: Optional[int] = None
+            while True:
+                if self.height != height:
+                    height, message = self.height, self.message
+                    yield message
+                    continue
+                try:
+                    await asyncio.wait_for(self._updated.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.clients -= 1
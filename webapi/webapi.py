@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import multiprocessing
 import os
 from typing import Any
 
@@ -17,27 +16,16 @@ from middleware.asgi_logger import AccessLoggerMiddleware
 from middleware.auth import AuthMiddleware
 from middleware.server_timing import ServerTimingMiddleware
 from util.set_proc_title import set_proc_title
-from .address_routes import address_route
+from util.web_server import UvicornServer, get_worker_count
+from .address_routes import address_route, address_stakers_route
 from .chain_routes import blocks_route, get_summary, recent_blocks_route, index_update_route, block_route, search_route, \
     transaction_route, \
-    validators_route, transition_route
+    validators_route, transition_route, block_stream_route, block_broadcaster
 from .error_routes import bad_request, not_found, internal_error
-from .utils import public_cache_seconds, out_of_sync_check, CJSONResponse
+from .utils import public_cache_seconds, out_of_sync_check, CJSONResponse, height_cache, height_cache_instance
 
 load_dotenv()
 
-class UvicornServer(multiprocessing.Process):
-
-    def __init__(self, config: uvicorn.Config):
-        super().__init__()
-        self.server = uvicorn.Server(config=config)
-        self.config = config
-
-    def stop(self):
-        self.terminate()
-
-    def run(self, *args: Any, **kwargs: Any):
-        self.server.run()
 
 async def index_route(request: Request):
     return CJSONResponse({"hello": "world"})
@@ -49,17 +37,23 @@ async def sync_info_route(request: Request):
     return CJSONResponse(sync_info)
 
 @public_cache_seconds(5)
+@height_cache
 async def summary_route(request: Request):
     db: Database = request.app.state.db
     return CJSONResponse(await get_summary(db))
 
+async def cache_stats_route(request: Request):
+    return CJSONResponse({**height_cache_instance.stats(), "stream_clients": block_broadcaster.clients})
+
 routes = [
     Route("/", index_route),
     Route("/sync", sync_info_route),
     Route("/summary", summary_route),
+    Route("/cache_stats", cache_stats_route),
 
     Route("/block/recent", recent_blocks_route),
     Route("/block/index_update", index_update_route),
+    Route("/block/stream", block_stream_route),
 
     Route("/blocks", blocks_route),
     Route("/block/{height}", block_route),
@@ -69,6 +63,7 @@ routes = [
     Route("/search", search_route),
 
     Route("/address/{address}", address_route),
+    Route("/address/{address}/stakers", address_stakers_route),
 ]
 
 exc_handlers = {
@@ -86,6 +81,7 @@ async def startup():
                   redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
                   redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
                   redis_password=os.environ.get("REDIS_PASS"),
+                  block_store_path=os.environ.get("BLOCK_STORE_PATH"),
                   message_callback=noop)
     await db.connect()
     # noinspection PyUnresolvedReferences
@@ -113,11 +109,11 @@ async def run():
     host = os.environ.get("HOST", "127.0.0.1")
     port = int(os.environ.get("WEBAPI_PORT", 8002))
     config = uvicorn.Config(
-        "webapi:app", reload=True, log_level="info", host=host, port=port,
+        "webapi:app", log_level="info", host=host, port=port,
         forwarded_allow_ips=["127.0.0.1", "::1", "10.0.4.1", "10.0.5.1"]
     )
     logging.getLogger("uvicorn.access").handlers = []
-    server = UvicornServer(config=config)
+    server = UvicornServer(config=config, workers=get_worker_count("WEBAPI_WORKERS"), name="webapi")
     # noinspection PyUnresolvedReferences
     # app.state.lns = LightNodeState()
 
@@ -40,7 +40,7 @@ except ImportError:
 DictList = list[dict[str, Any]]
 
 @profile
-@htmx_template("block.jinja2")
+@htmx_template("block.jinja2", stream=True)
 async def block_route(request: Request):
     db: Database = request.app.state.db
     height = request.query_params.get("h")
@@ -162,9 +162,7 @@ async def block_route(request: Request):
             raise HTTPException(status_code=550, detail="Unsupported transaction type")
     atxs: list[str] = list(map(str, block.aborted_transaction_ids))
     validators, all_validators_raw = await db.get_validator_by_height(height)
-    all_validators: list[UIAddress] = []
-    for v in all_validators_raw:
-        all_validators.append(await UIAddress(v["address"]).resolve(db))
+    all_validators = await UIAddress.resolve_many([UIAddress(v["address"]) for v in all_validators_raw], db)
 
     sync_info = await out_of_sync_check(request.app.state.session, db)
     ctx = {
@@ -187,7 +185,7 @@ async def block_route(request: Request):
     return ctx, {'Cache-Control': 'public, max-age=3600'}
 
 
-@htmx_template("transaction.jinja2")
+@htmx_template("transaction.jinja2", stream=True)
 async def transaction_route(request: Request):
     db: Database = request.app.state.db
     tx_id = request.query_params.get("id")
@@ -702,6 +700,17 @@ async def transition_route(request: Request):
     return ctx, {'Cache-Control': 'public, max-age=15'}
 
 
+# search result type -> (name, single result redirect)
+search_result_types = {
+    "blocks": ("block", "/block?bh="),
+    "transactions": ("transaction", "/transaction?id="),
+    "transitions": ("transition", "/transition?id="),
+    "addresses": ("address", "/address?a="),
+    "solutions": ("solution", ""),
+    "programs": ("program", "/program?id="),
+}
+
+
 @htmx_template("search_result.jinja2")
 async def search_route(request: Request):
     db: Database = request.app.state.db
@@ -722,126 +731,44 @@ async def search_route(request: Request):
         pass
     if query.startswith("aprivatekey1zkp"):
         raise HTTPException(status_code=400, detail=">>> YOU HAVE LEAKED YOUR PRIVATE KEY <<< Please throw it away and generate a new one.")
-    elif query.startswith("ab1"):
-        # block hash
-        blocks = await db.search_block_hash(query)
-        if not blocks:
-            raise HTTPException(status_code=404, detail="Block not found")
-        if len(blocks) == 1:
-            return RedirectResponse(f"/block?bh={blocks[0]}{remaining_query}", status_code=302)
-        too_many = False
-        if len(blocks) > 50:
-            blocks = blocks[:50]
-            too_many = True
-        ctx = {
-            "query": query,
-            "type": "block",
-            "blocks": blocks,
-            "too_many": too_many,
-        }
-        return ctx, {'Cache-Control': 'public, max-age=15'}
-    elif query.startswith("at1"):
-        # transaction id
-        transactions = await db.search_transaction_id(query)
-        if not transactions:
-            raise HTTPException(status_code=404, detail="Transaction not found")
-        if len(transactions) == 1:
-            return RedirectResponse(f"/transaction?id={transactions[0]}{remaining_query}", status_code=302)
-        too_many = False
-        if len(transactions) > 50:
-            transactions = transactions[:50]
-            too_many = True
-        ctx = {
-            "query": query,
-            "type": "transaction",
-            "transactions": transactions,
-            "too_many": too_many,
-        }
-        return ctx, {'Cache-Control': 'public, max-age=15'}
-    elif query.startswith("au1"):
-        # transition id
-        transitions = await db.search_transition_id(query)
-        if not transitions:
-            raise HTTPException(status_code=404, detail="Transition not found")
-        if len(transitions) == 1:
-            return RedirectResponse(f"/transition?id={transitions[0]}{remaining_query}", status_code=302)
-        too_many = False
-        if len(transitions) > 50:
-            transitions = transitions[:50]
-            too_many = True
-        ctx = {
-            "query": query,
-            "type": "transition",
-            "transitions": transitions,
-            "too_many": too_many,
-        }
-        return ctx, {'Cache-Control': 'public, max-age=15'}
-    elif query.startswith("aleo1"):
-        # address
-        addresses = await db.search_address(query)
-        if not addresses:
-            try: # try to convert to a valid address
-                Address.loads(query)
-                return RedirectResponse(f"/address?a={query}{remaining_query}", status_code=302)
-            except:
-                raise HTTPException(status_code=400, detail="Invalid address format")
-        if len(addresses) == 1:
-            return RedirectResponse(f"/address?a={addresses[0]}{remaining_query}", status_code=302)
-        too_many = False
-        if len(addresses) > 50:
-            addresses = addresses[:50]
-            too_many = True
-        ctx = {
-            "query": query,
-            "type": "address",
-            "addresses": addresses,
-            "too_many": too_many,
-        }
-        return ctx, {'Cache-Control': 'public, max-age=15'}
-    elif query.startswith("solution1"):
-        # solution id
-        solutions = await db.search_solution(query)
-        if not solutions:
-            raise HTTPException(status_code=404, detail="Solution not found")
-        if len(solutions) == 1:
-            height = await db.get_solution_block_height(solutions[0])
-            return RedirectResponse(f"/block?h={height}{remaining_query}", status_code=302)
-        too_many = False
-        if len(solutions) > 50:
-            solutions = solutions[:50]
-            too_many = True
-        ctx = {
-            "query": query,
-            "type": "solution",
-            "solutions": solutions,
-            "too_many": too_many,
-        }
-        return ctx, {'Cache-Control': 'public, max-age=15'}
-    elif query.endswith(".ans"):
+    if query.endswith(".ans"):
         address = await util.arc0137.get_address_from_domain(db, query)
         if address is None:
             raise HTTPException(status_code=404, detail="ANS domain not found")
         if address == "":
             raise HTTPException(status_code=404, detail="ANS domain is private")
         return RedirectResponse(f"/address?a={address}{remaining_query}", status_code=302)
+    try:
+        result = await db.search(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result["type"] == "ans_program":
+        # ANS names are only resolved by exact domain here
+        type_, results = "programs", result["programs"]
+        if not results:
+            raise HTTPException(status_code=404, detail="Unknown object type or searching is not supported")
     else:
-        # have to do this to support program name prefix search
-        programs = await db.search_program(query)
-        if programs:
-            if len(programs) == 1:
-                return RedirectResponse(f"/program?id={programs[0]}{remaining_query}", status_code=302)
-            too_many = False
-            if len(programs) > 50:
-                programs = programs[:50]
-                too_many = True
-            ctx = {
-                "query": query,
-                "type": "program",
-                "programs": programs,
-                "too_many": too_many,
-            }
-            return ctx, {'Cache-Control': 'public, max-age=15'}
-    raise HTTPException(status_code=404, detail="Unknown object type or searching is not supported")
+        type_, results = result["type"], result[result["type"]]
+    if not results:
+        if type_ == "addresses":
+            try: # try to convert to a valid address
+                Address.loads(query)
+                return RedirectResponse(f"/address?a={query}{remaining_query}", status_code=302)
+            except:
+                raise HTTPException(status_code=400, detail="Invalid address format")
+        raise HTTPException(status_code=404, detail=f"{search_result_types[type_][0].capitalize()} not found")
+    if len(results) == 1:
+        if type_ == "solutions":
+            height = await db.get_solution_block_height(results[0])
+            return RedirectResponse(f"/block?h={height}{remaining_query}", status_code=302)
+        return RedirectResponse(f"{search_result_types[type_][1]}{results[0]}{remaining_query}", status_code=302)
+    ctx = {
+        "query": query,
+        "type": search_result_types[type_][0],
+        type_: results,
+        "too_many": result["too_many"],
+    }
+    return ctx, {'Cache-Control': 'public, max-age=15'}
 
 
 @htmx_template("blocks.jinja2")
@@ -898,9 +825,10 @@ async def validators_route(request: Request):
     validators_data = await db.get_validators_range_at_height(latest_height, start, start + 50)
     validators: list[dict[str, Any]] = []
     total_stake = 0
-    for validator in validators_data:
+    validator_addresses = await UIAddress.resolve_many([UIAddress(v["address"]) for v in validators_data], db)
+    for validator, validator_address in zip(validators_data, validator_addresses):
         validators.append({
-            "address": await UIAddress(validator["address"]).resolve(db),
+            "address": validator_address,
             "stake": validator["stake"],
             "uptime": validator["uptime"] * 100,
             "commission": validator["commission"],
@@ -1,3 +1,4 @@
+import time
 from typing import Self, Optional, Any, cast
 
 from db import Database
@@ -6,6 +7,11 @@ from util import arc0137
 
 class UIAddress:
 
+    # address -> (expiry, partial json), shared by every request of this process
+    _label_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+    label_cache_ttl = 30
+    label_cache_size = 100000
+
     def __init__(self, address: str, name: Optional[str] = None, tag: Optional[str] = None,
                  link: Optional[str] = None, logo: Optional[str] = None):
         self.address = address
@@ -15,12 +21,52 @@ class UIAddress:
         self.logo = logo
 
     async def resolve(self, db: Database) -> Self:
-        if self.name is None:
-            self.name = await arc0137.get_primary_name_from_address(db, self.address)
-        self.tag = await db.get_address_tag(self.address)
-        self.link, self.logo = await db.get_validator_link_and_logo(self.address)
+        await UIAddress.resolve_many([self], db)
         return self
 
+    @staticmethod
+    async def _get_labels(addresses: set[str], db: Database) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        labels: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for address in addresses:
+            cached = UIAddress._label_cache.get(address)
+            if cached is not None and cached[0] > now:
+                labels[address] = cached[1]
+            else:
+                missing.append(address)
+        if not missing:
+            return labels
+        names = await arc0137.get_primary_names_from_addresses(db, missing)
+        address_labels = await db.get_address_labels(missing)
+        if len(UIAddress._label_cache) + len(missing) > UIAddress.label_cache_size:
+            UIAddress._label_cache = {k: v for k, v in UIAddress._label_cache.items() if v[0] > now}
+            if len(UIAddress._label_cache) + len(missing) > UIAddress.label_cache_size:
+                UIAddress._label_cache.clear()
+        for address in missing:
+            tag, link, logo = address_labels.get(address, (None, None, None))
+            label = {
+                "name": names[address],
+                "tag": tag,
+                "link": link,
+                "logo": logo,
+            }
+            UIAddress._label_cache[address] = now + UIAddress.label_cache_ttl, label
+            labels[address] = label
+        return labels
+
+    @staticmethod
+    async def resolve_many(ui_addresses: list["UIAddress"], db: Database) -> list["UIAddress"]:
+        labels = await UIAddress._get_labels({x.address for x in ui_addresses}, db)
+        for ui_address in ui_addresses:
+            label = labels[ui_address.address]
+            if ui_address.name is None:
+                ui_address.name = label["name"]
+            ui_address.tag = label["tag"]
+            ui_address.link = label["link"]
+            ui_address.logo = label["logo"]
+        return ui_addresses
+
     def to_partial_json(self) -> dict[str, Any]:
         return {
             "name": self.name,
@@ -44,19 +90,32 @@ class UIAddress:
             if not isinstance(s, str):
                 return False
             return s.startswith("aleo1") and len(s) == 63
-        if isinstance(data, dict):
-            data = cast(dict[Any, Any], data)
-            for k, v in data.items():
-                if is_address_str(k) and k not in partial:
-                    partial[k] = (await UIAddress(k).resolve(db)).to_partial_json()
-                partial = await UIAddress.resolve_recursive_detached(v, db, partial)
-        elif isinstance(data, list):
-            data = cast(list[Any], data)
-            for v in data:
-                partial = await UIAddress.resolve_recursive_detached(v, db, partial)
-        elif isinstance(data, UIAddress):
-            if data.address not in partial:
-                partial[data.address] = (await data.resolve(db)).to_partial_json()
-        elif is_address_str(data) and data not in partial:
-            partial[data] = (await UIAddress(data).resolve(db)).to_partial_json()
-        return partial
\ No newline at end of file
+
+        # collect everything first so all addresses are resolved together
+        addresses: set[str] = set()
+        ui_addresses: list[UIAddress] = []
+        def collect(data: Any):
+            if isinstance(data, dict):
+                data = cast(dict[Any, Any], data)
+                for k, v in data.items():
+                    if is_address_str(k):
+                        addresses.add(k)
+                    collect(v)
+            elif isinstance(data, list):
+                data = cast(list[Any], data)
+                for v in data:
+                    collect(v)
+            elif isinstance(data, UIAddress):
+                if data.address not in partial:
+                    ui_addresses.append(data)
+            elif is_address_str(data):
+                addresses.add(data)
+        collect(data)
+
+        await UIAddress.resolve_many(ui_addresses, db)
+        for ui_address in ui_addresses:
+            partial.setdefault(ui_address.address, ui_address.to_partial_json())
+        labels = await UIAddress._get_labels(addresses - partial.keys(), db)
+        for address, label in labels.items():
+            partial[address] = dict(label)
+        return partial
@@ -1,4 +1,3 @@
-from io import BytesIO
 from typing import Any, Optional
 
 import aleo_explorer_rust
@@ -50,7 +49,7 @@ async def programs_route(request: Request):
     return ctx, {'Cache-Control': 'public, max-age=15'}
 
 
-@htmx_template("program.jinja2")
+@htmx_template("program.jinja2", stream=True)
 async def program_route(request: Request):
     db: Database = request.app.state.db
     program_id = request.query_params.get("id")
@@ -70,10 +69,10 @@ async def program_route(request: Request):
         deployment: Deployment = transaction.deployment
         program: Program = deployment.program
     else:
-        program_bytes = await db.get_program(program_id)
-        if not program_bytes:
+        parsed_program = await db.get_parsed_program(program_id)
+        if parsed_program is None:
             raise HTTPException(status_code=404, detail="Program not found")
-        program = Program.load(BytesIO(program_bytes))
+        program = parsed_program
         transaction = None
     functions: list[str] = []
     for f in program.functions.keys():
@@ -166,7 +165,7 @@ async def upload_source_route(request: Request):
     program_id = request.query_params.get("id")
     if program_id is None:
         raise HTTPException(status_code=400, detail="Missing program id")
-    program = await db.get_program(program_id)
+    program = await db.get_parsed_program(program_id)
     if program is None:
         raise HTTPException(status_code=404, detail="Program not found")
     if request.method == "POST":
@@ -180,7 +179,6 @@ async def upload_source_route(request: Request):
         has_leo_source = True
     else:
         has_leo_source = False
-        program = Program.load(BytesIO(program))
         for i in program.imports:
             imports.append(str(i.program_id.name))
             if i.program_id != "credits.aleo":
@@ -5,9 +5,8 @@ from typing import Any, cast, Optional
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 
-from aleo_types import PlaintextValue, LiteralPlaintext, Literal, \
+from aleo_types import PlaintextValue, LiteralPlaintext, \
     Address, Value, StructPlaintext, Int, u64
-from aleo_types.cached import cached_get_key_id
 from db import Database
 from .classes import UIAddress
 from .template import htmx_template
@@ -17,9 +16,13 @@ from .utils import out_of_sync_check
 @htmx_template("calc.jinja2")
 async def calc_route(request: Request):
     db: Database = request.app.state.db
-    proof_target = (await db.get_latest_block()).header.metadata.proof_target
-    total_solutions = await db.get_total_solution_count()
-    avg_reward = await db.get_average_solution_reward()
+    proof_target = (await db.get_latest_block_header()).metadata.proof_target
+    network_summary = await db.get_network_summary()
+    total_solutions = network_summary["total_solution_count"]
+    if total_solutions:
+        avg_reward = network_summary["total_solution_reward"] / total_solutions
+    else:
+        avg_reward = 0
     sync_info = await out_of_sync_check(request.app.state.session, db)
     ctx = {
         "proof_target": proof_target,
@@ -79,32 +82,20 @@ async def address_route(request: Request):
         Address.loads(address)
     except:
         raise HTTPException(status_code=400, detail="Invalid address format")
-    solutions = await db.get_recent_solutions_by_address(address)
-    programs = await db.get_recent_programs_by_address(address)
-    transitions = await db.get_address_recent_transitions(address)
-    address_key = LiteralPlaintext(
-        literal=Literal(
-            type_=Literal.Type.Address,
-            primitive=Address.loads(address),
-        )
-    )
-    address_key_bytes = address_key.dump()
-    account_key_id = cached_get_key_id("credits.aleo", "account", address_key_bytes)
-    bonded_key_id = cached_get_key_id("credits.aleo", "bonded", address_key_bytes)
-    unbonding_key_id = cached_get_key_id("credits.aleo", "unbonding", address_key_bytes)
-    committee_key_id = cached_get_key_id("credits.aleo", "committee", address_key_bytes)
-    delegated_key_id = cached_get_key_id("credits.aleo", "delegated", address_key_bytes)
-    withdraw_key_id = cached_get_key_id("credits.aleo", "withdraw", address_key_bytes)
-    public_balance_bytes = await db.get_mapping_value("credits.aleo", "account", account_key_id)
-    bond_state_bytes = await db.get_mapping_value("credits.aleo", "bonded", bonded_key_id)
-    unbond_state_bytes = await db.get_mapping_value("credits.aleo", "unbonding", unbonding_key_id)
-    committee_state_bytes = await db.get_mapping_value("credits.aleo", "committee", committee_key_id)
-    delegated_bytes = await db.get_mapping_value("credits.aleo", "delegated", delegated_key_id)
-    stake_reward = await db.get_address_stake_reward(address)
-    transfer_in = await db.get_address_transfer_in(address)
-    transfer_out = await db.get_address_transfer_out(address)
-    fee = await db.get_address_total_fee(address)
-    program_name = await db.get_program_name_from_address(address)
+    profile = await db.get_address_profile(address)
+    solutions = profile["solutions"]
+    programs = profile["programs"]
+    transitions = profile["transitions"]
+    public_balance_bytes = profile["account"]
+    bond_state_bytes = profile["bonded"]
+    unbond_state_bytes = profile["unbonding"]
+    committee_state_bytes = profile["committee"]
+    delegated_bytes = profile["delegated"]
+    stake_reward = profile["address_stake_reward"]
+    transfer_in = profile["address_transfer_in"]
+    transfer_out = profile["address_transfer_out"]
+    fee = profile["address_fee"]
+    program_name = profile["program_name"]
 
     # if (len(solutions) == 0
     #     and len(programs) == 0
@@ -120,16 +111,11 @@ async def address_route(request: Request):
     #     and program_name is None
     # ):
     #     raise HTTPException(status_code=404, detail="Address not found")
-    if len(solutions) > 0:
-        solution_count = await db.get_solution_count_by_address(address)
-        total_rewards = await db.get_puzzle_reward_by_address(address)
-        speed, interval = await db.get_address_speed(address)
-    else:
-        solution_count = 0
-        total_rewards = 0
-        speed = 0
-        interval = 0
-    program_count = await db.get_program_count_by_address(address)
+    solution_count = profile["solution_count"]
+    total_rewards = (profile["address_puzzle_reward"] or 0) if len(solutions) > 0 else 0
+    speed = profile["speed"]
+    interval = profile["interval"]
+    program_count = profile["program_count"]
     interval_text = {
         0: "never",
         900: "15 minutes",
@@ -152,14 +138,13 @@ async def address_route(request: Request):
         })
     recent_programs: list[dict[str, Any]] = []
     for program in programs:
-        deploy_info = await db.get_deploy_info_by_program_id(program)
-        if deploy_info is None:
+        if program["height"] is None:
             raise HTTPException(status_code=550, detail="Deploy info not found")
         recent_programs.append({
-            "program_id": program,
-            "height": deploy_info["height"],
-            "timestamp": deploy_info["timestamp"],
-            "transaction_id": deploy_info["transaction_id"],
+            "program_id": program["program_id"],
+            "height": program["height"],
+            "timestamp": program["timestamp"],
+            "transaction_id": program["transaction_id"],
         })
     if public_balance_bytes is None:
         public_balance = 0
@@ -179,7 +164,7 @@ async def address_route(request: Request):
             "validator": str(validator.literal.primitive),
             "amount": int(cast(Int, amount.literal.primitive)),
         }
-        withdraw_bytes = await db.get_mapping_value("credits.aleo", "withdraw", withdraw_key_id)
+        withdraw_bytes = profile["withdraw"]
         if withdraw_bytes is None:
             withdrawal_address = None
         else:
@@ -200,6 +185,7 @@ async def address_route(request: Request):
     if committee_state_bytes is None:
         committee_state = None
         address_stakes: Optional[dict[str, int]] = None
+        address_stakes_count = None
         uptime = None
     else:
         value = cast(PlaintextValue, Value.load(BytesIO(committee_state_bytes)))
@@ -210,14 +196,8 @@ async def address_route(request: Request):
             "commission": int(cast(Int, commission.literal.primitive)),
             "is_open": bool(is_open.literal.primitive),
         }
-        bonded_mapping = await db.get_bonded_mapping_unchecked()
-        bonded_mapping = sorted(bonded_mapping.items(), key=lambda x: x[1][1], reverse=True)
-        address_stakes = {}
-        for staker_addr, (validator_addr, stake_amount) in bonded_mapping:
-            if str(validator_addr) == address:
-                address_stakes[str(staker_addr)] = int(stake_amount)
-                if len(address_stakes) >= 50:
-                    break
+        address_stakes = dict(await db.get_validator_bonded_stakers(address, 0, 50))
+        address_stakes_count = await db.get_validator_bonded_staker_count(address)
         uptime = await db.get_validator_uptime(address)
     if delegated_bytes is None:
         delegated = None
@@ -236,15 +216,12 @@ async def address_route(request: Request):
 
     recent_transitions: list[dict[str, Any]] = []
     for transition_data in transitions:
-        transition = await db.get_transition(transition_data["transition_id"])
-        if transition is None:
-            raise HTTPException(status_code=550, detail="Transition not found")
         recent_transitions.append({
             "transition_id": transition_data["transition_id"],
             "height": transition_data["height"],
             "timestamp": transition_data["timestamp"],
-            "program_id": transition.program_id,
-            "function_name": transition.function_name,
+            "program_id": transition_data["program_id"],
+            "function_name": transition_data["function_name"],
         })
 
     sync_info = await out_of_sync_check(request.app.state.session, db)
@@ -264,6 +241,7 @@ async def address_route(request: Request):
         "unbond_state": unbond_state,
         "committee_state": committee_state,
         "address_stakes": address_stakes,
+        "address_stakes_count": address_stakes_count,
         "delegated": delegated,
         "withdrawal_address": withdrawal_address,
         "uptime": uptime,
@@ -278,6 +256,38 @@ async def address_route(request: Request):
     return ctx, {'Cache-Control': 'public, max-age=15'}
 
 
+@htmx_template("address_stakers.jinja2")
+async def address_stakers_route(request: Request):
+    db: Database = request.app.state.db
+    address = request.query_params.get("a")
+    if address is None:
+        raise HTTPException(status_code=400, detail="Missing address")
+    try:
+        page = request.query_params.get("p")
+        if page is None:
+            page = 1
+        else:
+            page = int(page)
+    except:
+        raise HTTPException(status_code=400, detail="Invalid page")
+    staker_count = await db.get_validator_bonded_staker_count(address)
+    total_pages = (staker_count // 50) + 1
+    if page < 1 or page > total_pages:
+        raise HTTPException(status_code=400, detail="Invalid page")
+    start = 50 * (page - 1)
+    sync_info = await out_of_sync_check(request.app.state.session, db)
+    ctx = {
+        "address": address,
+        "address_trunc": address[:14] + "..." + address[-6:],
+        "address_stakes": dict(await db.get_validator_bonded_stakers(address, start, start + 50)),
+        "address_stakes_count": staker_count,
+        "page": page,
+        "total_pages": total_pages,
+        "sync_info": sync_info,
+    }
+    return ctx, {'Cache-Control': 'public, max-age=15'}
+
+
 @htmx_template("address_solution.jinja2")
 async def address_solution_route(request: Request):
     db: Database = request.app.state.db
@@ -3,11 +3,11 @@ import functools
 import os
 import traceback
 from decimal import Decimal
-from typing import Callable, Coroutine, Any
+from typing import AsyncIterator, Callable, Coroutine, Any
 
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 from starlette.templating import Jinja2Templates
 
 templates = Jinja2Templates(directory='webui/templates', trim_blocks=True, lstrip_blocks=True)
@@ -94,7 +94,47 @@ templates.env.filters["format_number"] = format_number # type: ignore
 templates.env.filters["format_large_number"] = format_large_number # type: ignore
 templates.env.filters["network_tag"] = network_tag # type: ignore
 
-def htmx_template(template: str):
+# async overlay used by streamed pages, shares loader, filters and globals with templates.env
+stream_env = templates.env.overlay(enable_async=True)
+stream_chunk_size = 16 * 1024
+# pages rendering to less than this are buffered, so they are minified and keep their Cache-Control
+stream_threshold = 256 * 1024
+
+async def _stream_chunks(chunks: AsyncIterator[str], first: str) -> AsyncIterator[bytes]:
+    # the template yields many small strings, group them so each send carries a reasonable amount
+    buffer = [first]
+    size = len(first)
+    try:
+        async for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= stream_chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer = []
+                size = 0
+    except Exception:
+        # headers are already sent, all we can do is cut the response short
+        traceback.print_exc()
+        raise
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+def _template_error(e: Exception) -> HTTPException:
+    tb = e.__traceback__
+    if tb is None:
+        return HTTPException(status_code=550, detail=f"template error: {e.__class__.__name__}: {str(e)}")
+    frame = tb.tb_frame
+    while tb.tb_next:
+        tb = tb.tb_next
+        if tb.tb_frame.f_code.co_filename.endswith(".jinja2"):
+            frame = tb.tb_frame
+    traceback.print_exc()
+    return HTTPException(status_code=550, detail=f"template error at {frame.f_code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno}: {e.__class__.__name__}: {str(e)}")
+
+def htmx_template(template: str, stream: bool = False):
+    # stream: render with an async generator and, once the page passes stream_threshold, send it as it is produced
+    # (not minified), for pages that can get very large. A render error after that can only cut the page short, so
+    # streamed pages are never stored by caches. Smaller pages are sent whole with the route's headers
     def decorator(func: Callable[[Request], Coroutine[Any, Any, tuple[dict[str, Any], dict[str, str]] | dict[str, str] | Response]]):
         @functools.wraps(func)
         async def wrapper(request: Request):
@@ -127,18 +167,30 @@ def htmx_template(template: str):
             else:
                 return result
             context["request"] = request
+            if stream:
+                buffer: list[str] = []
+                size = 0
+                complete = False
+                try:
+                    chunks = stream_env.get_template(t).generate_async(context)
+                    # render up to stream_threshold here, so errors before the response starts still become an
+                    # error page and smaller pages are sent whole
+                    async for chunk in chunks:
+                        buffer.append(chunk)
+                        size += len(chunk)
+                        if size >= stream_threshold:
+                            break
+                    else:
+                        complete = True
+                except Exception as e:
+                    raise _template_error(e) from e
+                if complete:
+                    return Response("".join(buffer), headers=headers, media_type="text/html")
+                headers = {**headers, "Cache-Control": "no-store"}
+                return StreamingResponse(_stream_chunks(chunks, "".join(buffer)), headers=headers, media_type="text/html")
             try:
                 return templates.TemplateResponse(t, context, headers=headers)
             except Exception as e:
-                tb = e.__traceback__
-                if tb is None:
-                    raise HTTPException(status_code=550, detail=f"template error: {e.__class__.__name__}: {str(e)}") from e
-                frame = tb.tb_frame
-                while tb.tb_next:
-                    tb = tb.tb_next
-                    if tb.tb_frame.f_code.co_filename.endswith(".jinja2"):
-                        frame = tb.tb_frame
-                traceback.print_exc()
-                raise HTTPException(status_code=550, detail=f"template error at {frame.f_code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno}: {e.__class__.__name__}: {str(e)}") from e
+                raise _template_error(e) from e
         return wrapper
     return decorator
\ No newline at end of file
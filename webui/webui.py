@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import multiprocessing
 import os
 
 import aiohttp
@@ -16,6 +15,7 @@ from middleware.htmx import HtmxMiddleware
 from middleware.minify import MinifyMiddleware
 from middleware.server_timing import ServerTimingMiddleware
 from util.set_proc_title import set_proc_title
+from util.web_server import UvicornServer, get_worker_count
 from .chain_routes import *
 from .error_routes import *
 from .program_routes import *
@@ -23,34 +23,18 @@ from .proving_routes import *
 from .utils import out_of_sync_check
 
 
-class UvicornServer(multiprocessing.Process):
-
-    def __init__(self, config: uvicorn.Config):
-        super().__init__()
-        self.server = uvicorn.Server(config=config)
-        self.config = config
-
-    def stop(self):
-        self.terminate()
-
-    def run(self, *args: Any, **kwargs: Any):
-        self.server.run()
-
-
 @htmx_template("index.jinja2")
 async def index_route(request: Request):
     db: Database = request.app.state.db
     recent_blocks = await db.get_recent_blocks_fast()
-    network_speed = await db.get_network_speed()
-    validators = await db.get_current_validator_count()
-    participation_rate = await db.get_network_participation_rate()
+    network_summary = await db.get_network_summary()
     sync_info = await out_of_sync_check(request.app.state.session, db)
     ctx = {
         "latest_block": await db.get_latest_block(),
         "recent_blocks": recent_blocks,
-        "network_speed": network_speed,
-        "validators": validators,
-        "participation_rate": participation_rate,
+        "network_speed": network_summary["network_speed"],
+        "validators": network_summary["validator_count"],
+        "participation_rate": network_summary["participation_rate"],
         "sync_info": sync_info,
     }
     return ctx, {'Cache-Control': 'public, max-age=10'}
@@ -148,6 +132,7 @@ routes = [
     Route("/incentive", incentive_route),
     Route("/address", address_route),
     Route("/address_solution", address_solution_route),
+    Route("/address_stakers", address_stakers_route),
     # Other
     Route("/tools", tools_route),
     Route("/faq", faq_route),
@@ -176,6 +161,7 @@ async def startup():
                   redis_server=os.environ["REDIS_HOST"], redis_port=int(os.environ["REDIS_PORT"]),
                   redis_db=int(os.environ["REDIS_DB"]), redis_user=os.environ.get("REDIS_USER"),
                   redis_password=os.environ.get("REDIS_PASS"),
+                  block_store_path=os.environ.get("BLOCK_STORE_PATH"),
                   message_callback=noop)
     await db.connect()
     # noinspection PyUnresolvedReferences
@@ -206,11 +192,11 @@ async def run():
     host = os.environ.get("HOST", "127.0.0.1")
     port = int(os.environ.get("PORT", 8000))
     config = uvicorn.Config(
-        "webui:app", reload=True, log_level="info", host=host, port=port,
+        "webui:app", log_level="info", host=host, port=port,
         forwarded_allow_ips=["127.0.0.1", "::1", "10.0.4.1", "10.0.5.1"]
     )
     logging.getLogger("uvicorn.access").handlers = []
-    server = UvicornServer(config=config)
+    server = UvicornServer(config=config, workers=get_worker_count("WEBUI_WORKERS"), name="webui")
     # noinspection PyUnresolvedReferences
     app.state.lns = LightNodeState()
 